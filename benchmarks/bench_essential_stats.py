@@ -0,0 +1,90 @@
+"""
+
+Benchmark: per-column StatFrame stats (legacy loop) vs the batched engine.
+
+    python benchmarks/bench_essential_stats.py --rows 1000000 --cols 20
+
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from mindhunter.engine import compute_essential_stats
+
+
+def legacy_essential_stats(df: pd.DataFrame) -> dict:
+    """ The pre-engine `StatFrame._compute_essential_stats` loop, kept for comparison. """
+    stats = {}
+    for col in df.select_dtypes(include=[np.number]).columns:
+        data = df[col].dropna()
+        stats[col] = {
+            'mean': data.mean(),
+            'median': data.median(),
+            'mode': data.mode().iloc[0] if not data.mode().empty else np.nan,
+            'std': data.std(),
+            'variance': data.var(),
+            'range': data.max() - data.min(),
+            'iqr': data.quantile(0.75) - data.quantile(0.25),
+            'mad': (data - data.median()).abs().median(),
+            'skewness': data.skew(),
+            'kurtosis': data.kurtosis(),
+            'count': len(data),
+            'missing_count': df[col].isna().sum(),
+            'missing_pct': df[col].isna().mean(),
+            'min': data.min(),
+            'max': data.max(),
+            'q1': data.quantile(0.25),
+            'q3': data.quantile(0.75),
+            'cv': data.std() / data.mean() if data.mean() != 0 else np.inf,
+            'sem': data.std() / np.sqrt(len(data)),
+        }
+    return stats
+
+
+def make_frame(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(cols):
+        if i % 3 == 0:
+            data[f'int_{i}'] = rng.integers(0, 1000, rows)
+        else:
+            values = rng.normal(i, 1 + i, rows)
+            values[rng.random(rows) < 0.05] = np.nan
+            data[f'float_{i}'] = values
+    return pd.DataFrame(data)
+
+
+def timed(fn, *args, repeat: int = 3) -> tuple[float, object]:
+    best, result = np.inf, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--cols', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.cols)
+    legacy_time, legacy = timed(legacy_essential_stats, df, repeat=args.repeat)
+    engine_time, engine = timed(compute_essential_stats, df, repeat=args.repeat)
+
+    expected = pd.DataFrame.from_dict(legacy).astype(float)
+    actual = pd.DataFrame.from_dict(engine).astype(float).loc[expected.index]
+    pd.testing.assert_frame_equal(actual, expected, rtol=1e-9, atol=1e-12)
+
+    print(f"frame: {args.rows:,} rows x {args.cols} columns")
+    print(f"legacy loop : {legacy_time:8.3f}s")
+    print(f"engine      : {engine_time:8.3f}s")
+    print(f"speedup     : {legacy_time / engine_time:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
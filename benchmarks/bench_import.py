@@ -0,0 +1,107 @@
+"""
+
+Benchmark: cold-start import time of mindhunter entry points, checked against
+a budget.
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --explain 10
+
+Each scenario runs in a fresh interpreter and is timed as the best of
+`--repeat` runs. Budgets are the seconds a scenario may add on top of
+`import numpy, pandas` (which every scenario pays anyway and which varies a
+lot between machines). Scenarios also fail if they load one of their
+forbidden modules. The exit code is 1 when any scenario is over budget.
+
+"""
+from typing import NamedTuple
+import argparse
+import subprocess
+import sys
+import time
+
+BASELINE = 'import numpy, pandas'
+PLOTTING = ('matplotlib', 'seaborn', 'statsmodels')
+
+
+class Scenario(NamedTuple):
+    name: str
+    code: str
+    budget: float | None
+    forbidden: tuple
+
+
+SCENARIOS = [
+    Scenario('package', 'import mindhunter', 0.05, ('scipy',) + PLOTTING),
+    Scenario('statframe', 'from mindhunter import StatFrame', 0.15, ('scipy',) + PLOTTING),
+    Scenario('headless worker', 'from mindhunter import StatFrame, AnalyticalTools', 0.15, ('scipy',) + PLOTTING),
+    Scenario('analyzers', 'from mindhunter import HypothesisAnalyzer, DistributionAnalyzer, ResamplingAnalyzer',
+             0.25, PLOTTING),
+    Scenario('plotting', 'from mindhunter import StatPlotter, StatVisualizer', None, ()),
+]
+
+
+def cold_start(code: str, repeat: int) -> float:
+    """ Best wall time of running `code` in a fresh interpreter. """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def loaded(code: str, modules: tuple) -> list[str]:
+    """ Which of `modules` are in `sys.modules` after running `code`. """
+    probe = f"{code}\nimport sys\nprint(' '.join(m for m in {modules!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', probe], check=True, capture_output=True, text=True)
+    return result.stdout.split()
+
+
+def slowest_imports(code: str, top: int) -> list[tuple[int, str]]:
+    """ `(cumulative microseconds, module)` of the `top` slowest imports, from `-X importtime`. """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            check=True, capture_output=True, text=True)
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        timings.append((int(cumulative), module.strip()))
+    return sorted(timings, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--explain', type=int, default=0, metavar='N',
+                        help='also list the N slowest imports of every scenario')
+    args = parser.parse_args()
+
+    baseline = cold_start(BASELINE, args.repeat)
+    print(f"{BASELINE:<20} {baseline:8.3f}s")
+    print(f"{'scenario':<20} {'total':>9} {'added':>9} {'budget':>9}  status")
+
+    failures = 0
+    for scenario in SCENARIOS:
+        total = cold_start(scenario.code, args.repeat)
+        added = max(total - baseline, 0.0)
+        problems = []
+        if scenario.budget is not None and added > scenario.budget:
+            problems.append('over budget')
+        leaked = loaded(scenario.code, scenario.forbidden) if scenario.forbidden else []
+        if leaked:
+            problems.append(f"loads {', '.join(leaked)}")
+        failures += bool(problems)
+
+        budget = f"{scenario.budget:8.3f}s" if scenario.budget is not None else f"{'-':>9}"
+        print(f"{scenario.name:<20} {total:8.3f}s {added:8.3f}s {budget}  {'; '.join(problems) or 'ok'}")
+        for cumulative, module in slowest_imports(scenario.code, args.explain):
+            print(f"{'':<20} {cumulative / 1e6:8.3f}s  {module}")
+
+    if failures:
+        print(f"{failures} scenario(s) over their cold-start budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
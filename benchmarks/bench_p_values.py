@@ -0,0 +1,87 @@
+"""
+
+Benchmark: scalar scipy.stats p-values and critical values (legacy) vs the
+array-native, memoized AnalyticalTools service.
+
+    python benchmarks/bench_p_values.py --calls 100000
+
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from mindhunter import StatFrame
+from mindhunter.utils.toolkit import AnalyticalTools
+
+
+def legacy_z_to_p_value(z: float) -> float:
+    """ The pre-service two-sided `AnalyticalTools.z_to_p_value`, kept for comparison. """
+    return 2 * stats.norm.sf(abs(z)).item()
+
+
+def legacy_t_to_p_value(t_stat: float, df: int) -> float:
+    return 2 * stats.t.sf(abs(t_stat), df).item()
+
+
+def legacy_wilson_score(p_hat: float, n: int, alpha: float) -> tuple[float, float]:
+    z = stats.norm.ppf(1 - alpha/2)
+    denominator = 1 + z**2/n
+    center = (p_hat + z**2/(2*n)) / denominator
+    margin = z * np.sqrt(p_hat*(1-p_hat)/n + z**2/(4*n**2)) / denominator
+    return max(0, center - margin), min(1, center + margin)
+
+
+def calls_per_second(fn, n_calls: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return n_calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=100_000)
+    parser.add_argument('--scalar-calls', type=int, default=10_000,
+                        help='calls used for the (slow) scalar loops')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    z = rng.normal(0, 2, args.calls)
+    df = rng.integers(2, 200, args.calls)
+    p_hat = rng.random(args.calls)
+    n = rng.integers(10, 10_000, args.calls)
+    tools = AnalyticalTools(StatFrame(pd.DataFrame({'x': [0.0]})))
+
+    k = min(args.scalar_calls, args.calls)
+    cases = {
+        'z_to_p_value': (
+            lambda: [legacy_z_to_p_value(v) for v in z[:k]],
+            lambda: [tools.z_to_p_value(v) for v in z[:k]],
+            lambda: tools.z_to_p_value(z),
+        ),
+        't_to_p_value': (
+            lambda: [legacy_t_to_p_value(v, d) for v, d in zip(z[:k], df[:k])],
+            lambda: [tools.t_to_p_value(v, d, 'two-sided') for v, d in zip(z[:k], df[:k])],
+            lambda: tools.t_to_p_value(z, df, 'two-sided'),
+        ),
+        'wilson_score': (
+            lambda: [legacy_wilson_score(p, m, 0.05) for p, m in zip(p_hat[:k], n[:k])],
+            lambda: [tools.wilson_score(p, m, 0.05) for p, m in zip(p_hat[:k], n[:k])],
+            lambda: tools.wilson_score(p_hat, n, 0.05),
+        ),
+    }
+
+    np.testing.assert_allclose(tools.z_to_p_value(z[:k]), [legacy_z_to_p_value(v) for v in z[:k]], rtol=1e-12)
+    np.testing.assert_allclose(tools.t_to_p_value(z[:k], df[:k], 'two-sided'),
+                               [legacy_t_to_p_value(v, d) for v, d in zip(z[:k], df[:k])], rtol=1e-10)
+
+    print(f"{'function':<14} {'legacy/s':>12} {'scalar/s':>12} {'array/s':>14}")
+    for name, (legacy, scalar, array) in cases.items():
+        print(f"{name:<14} {calls_per_second(legacy, k):>12,.0f} {calls_per_second(scalar, k):>12,.0f} "
+              f"{calls_per_second(array, args.calls):>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
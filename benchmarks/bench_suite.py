@@ -0,0 +1,225 @@
+"""
+
+Benchmark suite: time and peak memory of the StatFrame hot paths on seeded
+synthetic frames (see `frames.py`), compared against a stored baseline.
+
+    python benchmarks/bench_suite.py --scales small medium
+    python benchmarks/bench_suite.py --scales small --compare benchmarks/baseline.json
+    python benchmarks/bench_suite.py --scales small --save-baseline benchmarks/baseline.json
+
+Each case is set up fresh before every repetition (setup is not measured).
+Time is the best of `--repeat` runs; peak memory comes from one extra run
+under `tracemalloc` and counts the bytes allocated above the level reached
+after setup. With `--compare`, the run fails (exit code 1) when a case is
+slower than the baseline by more than `--time-tolerance` or allocates more
+than `--memory-tolerance` on top of it; differences under the noise floors
+are ignored. Baselines are machine-specific: regenerate them with
+`--save-baseline` on the machine that runs the comparison.
+
+"""
+from typing import Any, Callable, NamedTuple
+import argparse
+import fnmatch
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from frames import SCALES, SHAPES, make_frame
+from mindhunter import AnalyticalTools, DistributionAnalyzer, HypothesisAnalyzer, StatFrame, StatPlotter, StatVisualizer
+
+BASELINE_VERSION = 1
+# differences below these are treated as noise, whatever the ratio
+MIN_SECONDS = 0.005
+MIN_BYTES = 1024 ** 2
+
+
+class Case(NamedTuple):
+    """ `run(setup(df))` is measured; `setup` builds whatever state the case starts from. """
+    name: str
+    setup: Callable[[pd.DataFrame], Any]
+    run: Callable[[Any], Any]
+
+
+def _statframe(df: pd.DataFrame) -> StatFrame:
+    return StatFrame(df)
+
+
+def _warm(df: pd.DataFrame) -> StatFrame:
+    sf = StatFrame(df)
+    sf.get_stats()
+    return sf
+
+
+def _floats(sf: StatFrame) -> list[str]:
+    return [col for col in sf._numeric_columns() if sf._data[col].dtype == np.float64]
+
+
+def _first_float(sf: StatFrame) -> str:
+    return _floats(sf)[0]
+
+
+def _render(fig) -> None:
+    fig.savefig(io.BytesIO(), format='png', dpi=50)
+
+
+CASES = [
+    Case('construct', lambda df: df, StatFrame),
+    Case('construct_precalc', lambda df: df, lambda df: StatFrame(df, precalc_data=True)),
+    Case('get_stats_cold', _statframe, lambda sf: sf.get_stats()),
+    Case('get_stats_warm', _warm, lambda sf: sf.get_stats()),
+    Case('update', _warm, lambda sf: sf.update()),
+    Case('clean_df', _statframe, lambda sf: sf.clean_df()),
+    Case('analyze_zero_removal', _statframe, lambda sf: sf.analyze_zero_removal()),
+    Case('remove_exact_zeros', _statframe, lambda sf: sf.remove_exact_zeros()),
+    Case('remove_near_zeros', _statframe, lambda sf: sf.remove_near_zeros(tolerance=1e-10)),
+    Case('hypothesis_test', lambda df: (HypothesisAnalyzer(sf := StatFrame(df)), _first_float(sf)),
+         lambda state: state[0].hypothesis_test(state[1], 'one_sample_t', 0.0)),
+    Case('hypothesis_test_many', lambda df: HypothesisAnalyzer(StatFrame(df)),
+         lambda analyzer: analyzer.hypothesis_test_many()),
+    Case('normality_report', lambda df: DistributionAnalyzer(StatFrame(df)),
+         lambda analyzer: analyzer.normality_report()),
+    Case('fit_distributions', lambda df: (DistributionAnalyzer(sf := StatFrame(df)), _first_float(sf)),
+         lambda state: state[0].fit_distributions([state[1]], method='binned')),
+    Case('ols', _statframe, lambda sf: sf.ols(_floats(sf)[:2])),
+    Case('z_score_all', lambda df: AnalyticalTools(StatFrame(df)), lambda tools: tools.z_score_all()),
+    Case('outliers', _statframe, lambda sf: sf.outliers(rule='modified_z')),
+    Case('plot_normal_distr', lambda df: (StatPlotter(sf := StatFrame(df), render_budget=100_000, headless=True),
+                                          _first_float(sf)),
+         lambda state: _render(state[0].plot_normal_distr(state[1]))),
+    Case('plot_boxplot', lambda df: (StatVisualizer(sf := StatFrame(df), render_budget=100_000, headless=True),
+                                     _first_float(sf)),
+         lambda state: _render(state[0].create_boxplot([state[1]])[0])),
+]
+
+
+def measure(case: Case, df: pd.DataFrame, repeat: int) -> tuple[float, int]:
+    """ `(best seconds, peak bytes)` of `case` on `df`. """
+    best = np.inf
+    for _ in range(repeat):
+        state = case.setup(df)
+        start = time.perf_counter()
+        case.run(state)
+        best = min(best, time.perf_counter() - start)
+        del state
+
+    state = case.setup(df)
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        case.run(state)
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_suite(scales: list[str], shapes: list[str], patterns: list[str], repeat: int) -> pd.DataFrame:
+    cases = [case for case in CASES if any(fnmatch.fnmatch(case.name, p) for p in patterns)]
+    records = []
+    for scale in scales:
+        for shape in shapes:
+            df = make_frame(shape, scale)
+            for case in cases:
+                seconds, peak = measure(case, df, repeat)
+                records.append({'case': case.name, 'shape': shape, 'scale': scale,
+                                'rows': len(df), 'cols': df.shape[1],
+                                'seconds': seconds, 'peak_bytes': peak})
+                print(f"{scale:>6} {shape:>10} {case.name:<22} {seconds:9.4f}s {peak / 1024 ** 2:9.1f} MiB",
+                      file=sys.stderr)
+    return pd.DataFrame(records)
+
+
+def environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def save_baseline(results: pd.DataFrame, path: str) -> None:
+    """ Writes `results` to `path`, replacing earlier entries for the same cases and keeping the rest. """
+    previous = load_baseline(path) if os.path.exists(path) else results.iloc[:0]
+    key = ['case', 'shape', 'scale']
+    merged = pd.concat([previous, results]).drop_duplicates(key, keep='last')
+    entry = {'version': BASELINE_VERSION, 'environment': environment(),
+             'results': merged.to_dict(orient='records')}
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(entry, handle, indent=1)
+
+
+def load_baseline(path: str) -> pd.DataFrame:
+    with open(path, encoding='utf-8') as handle:
+        entry = json.load(handle)
+    if entry.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version in {path}: {entry.get('version')}")
+    if entry.get('environment') != environment():
+        print(f"warning: baseline was recorded on {entry.get('environment')}", file=sys.stderr)
+    return pd.DataFrame(entry['results'])
+
+
+def compare(results: pd.DataFrame, baseline: pd.DataFrame,
+            time_tolerance: float, memory_tolerance: float) -> pd.DataFrame:
+    """ `results` joined with the baseline, with time/memory ratios and a `regression` flag per case. """
+    key = ['case', 'shape', 'scale']
+    joined = results.merge(baseline[key + ['seconds', 'peak_bytes']], on=key, how='left',
+                           suffixes=('', '_baseline'))
+    joined['time_ratio'] = joined['seconds'] / joined['seconds_baseline']
+    joined['memory_ratio'] = joined['peak_bytes'] / joined['peak_bytes_baseline'].replace(0, np.nan)
+    slower = ((joined['seconds'] > joined['seconds_baseline'] * (1 + time_tolerance))
+              & (joined['seconds'] - joined['seconds_baseline'] > MIN_SECONDS))
+    heavier = ((joined['peak_bytes'] > joined['peak_bytes_baseline'] * (1 + memory_tolerance))
+               & (joined['peak_bytes'] - joined['peak_bytes_baseline'] > MIN_BYTES))
+    joined['regression'] = np.select([slower & heavier, slower, heavier], ['time+memory', 'time', 'memory'], '')
+    return joined
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['small', 'medium'])
+    parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument('--cases', nargs='+', default=['*'], help='case names or glob patterns')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE', help='compare against a stored baseline')
+    parser.add_argument('--save-baseline', metavar='BASELINE', help='store the results as the baseline')
+    parser.add_argument('--time-tolerance', type=float, default=0.25)
+    parser.add_argument('--memory-tolerance', type=float, default=0.10)
+    args = parser.parse_args()
+
+    results = run_suite(args.scales, args.shapes, args.cases, args.repeat)
+    if args.output:
+        results.to_json(args.output, orient='records', indent=1)
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_rows', None)
+    if not args.compare:
+        print(results.to_string(index=False))
+        return
+
+    report = compare(results, load_baseline(args.compare), args.time_tolerance, args.memory_tolerance)
+    print(report[['case', 'shape', 'scale', 'seconds', 'seconds_baseline', 'time_ratio',
+                  'peak_bytes', 'peak_bytes_baseline', 'memory_ratio', 'regression']].to_string(index=False))
+    missing = report['seconds_baseline'].isna().sum()
+    if missing:
+        print(f"{missing} case(s) have no baseline entry", file=sys.stderr)
+    regressions = report[report['regression'] != '']
+    if len(regressions):
+        print(f"{len(regressions)} regression(s) against {args.compare}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
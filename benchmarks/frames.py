@@ -0,0 +1,109 @@
+"""
+
+Seeded synthetic frames for the benchmark suite.
+
+Every generator returns the same frame for the same `(rows, cols, seed)`, so
+timings and peak memory are comparable across runs and machines. Each frame
+has numeric columns (mostly floats, every fourth one integer), a
+low-cardinality `segment` text column and about 1% duplicated rows, so
+`clean_df()` and the zero-removal methods always have work to do.
+
+"""
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+SCALES = {
+    'small': 10_000,
+    'medium': 100_000,
+    'large': 1_000_000,
+}
+
+
+def _columns(rng: np.random.Generator, rows: int, cols: int) -> dict[str, np.ndarray]:
+    data = {}
+    for i in range(cols):
+        if i % 4 == 3:
+            data[f'x{i}'] = rng.integers(-50, 1000, rows)
+        else:
+            data[f'x{i}'] = rng.normal(i, 1 + i % 7, rows)
+    data['segment'] = rng.choice(np.array(['north', 'south', 'east', 'west']), rows)
+    return data
+
+
+def _frame(rng: np.random.Generator, data: dict[str, np.ndarray], duplicates: float = 0.01) -> pd.DataFrame:
+    """ Copies `duplicates` of the rows over other rows before building the frame. """
+    rows = len(next(iter(data.values())))
+    n = int(rows * duplicates)
+    if n:
+        sources = rng.integers(0, rows, n)
+        targets = rng.integers(0, rows, n)
+        for values in data.values():
+            values[targets] = values[sources]
+    return pd.DataFrame(data)
+
+
+def tall_frame(rows: int, cols: int = 10, seed: int = 0) -> pd.DataFrame:
+    """ Many rows, few columns, a sprinkle of NaNs and zeros. """
+    rng = np.random.default_rng(seed)
+    data = _columns(rng, rows, cols)
+    for i in range(0, cols, 4):
+        values = data[f'x{i}']
+        values[rng.random(rows) < 0.02] = np.nan
+        values[rng.random(rows) < 0.001] = 0.0
+    return _frame(rng, data)
+
+
+def wide_frame(rows: int, cols: int = 250, seed: int = 0) -> pd.DataFrame:
+    """ Hundreds of columns; NaNs in a third of them. """
+    rng = np.random.default_rng(seed)
+    data = _columns(rng, rows, cols)
+    for i in range(0, cols, 3):
+        if i % 4 != 3:
+            data[f'x{i}'][rng.random(rows) < 0.01] = np.nan
+    return _frame(rng, data)
+
+
+def nan_heavy_frame(rows: int, cols: int = 10, seed: int = 0) -> pd.DataFrame:
+    """ 30% missing values in every float column, 90% in the first one. """
+    rng = np.random.default_rng(seed)
+    data = _columns(rng, rows, cols)
+    for i in range(cols):
+        if i % 4 != 3:
+            data[f'x{i}'][rng.random(rows) < (0.9 if i == 0 else 0.3)] = np.nan
+    return _frame(rng, data)
+
+
+def zero_heavy_frame(rows: int, cols: int = 10, seed: int = 0) -> pd.DataFrame:
+    """ 20% exact zeros and 5% near zeros (|x| < 1e-12) in every float column. """
+    rng = np.random.default_rng(seed)
+    data = _columns(rng, rows, cols)
+    for i in range(cols):
+        if i % 4 != 3:
+            draw = rng.random(rows)
+            values = data[f'x{i}']
+            values[draw < 0.2] = 0.0
+            near = (draw >= 0.2) & (draw < 0.25)
+            values[near] = rng.uniform(-1e-12, 1e-12, int(near.sum()))
+    return _frame(rng, data)
+
+
+class Shape(NamedTuple):
+    """ A frame generator and how its size follows the scale's row count. """
+    generator: Callable[..., pd.DataFrame]
+    rows: Callable[[int], int]
+    cols: int
+
+
+SHAPES = {
+    'tall': Shape(tall_frame, lambda n: n, 10),
+    'wide': Shape(wide_frame, lambda n: max(n // 50, 100), 250),
+    'nan_heavy': Shape(nan_heavy_frame, lambda n: n, 10),
+    'zero_heavy': Shape(zero_heavy_frame, lambda n: n, 10),
+}
+
+
+def make_frame(shape: str, scale: str, seed: int = 0) -> pd.DataFrame:
+    spec = SHAPES[shape]
+    return spec.generator(spec.rows(SCALES[scale]), spec.cols, seed)
@@ -3,20 +3,37 @@
 mindhunter
 Statistical Analysis Extensions for Pandas DataFrames
 
+Public classes are imported on first access (PEP 562), so `import mindhunter`
+stays cheap and the plotting stack (matplotlib, seaborn) and SciPy only load
+when something that needs them is used.
+
 """
-# core
-from .mindhunter import StatFrame
+from typing import TYPE_CHECKING
 
-# statistics
-from .statistics.distributions import DistributionAnalyzer
-from .statistics.hypothesis import HypothesisAnalyzer
+from .lazy import attach
 
-# utils
-from .utils.toolkit import AnalyticalTools
+if TYPE_CHECKING:
+    from .mindhunter import StatFrame
+    from .statistics.distributions import DistributionAnalyzer
+    from .statistics.hypothesis import HypothesisAnalyzer
+    from .statistics.resampling import ResamplingAnalyzer
+    from .utils.toolkit import AnalyticalTools
+    from .visualization.stat_plotter import StatPlotter
+    from .visualization.visualizer import StatVisualizer
 
-# visualization
-from .visualization.stat_plotter import StatPlotter
-from .visualization.visualizer import StatVisualizer
+_LAZY = {
+    # core
+    'StatFrame': '.mindhunter',
+    # statistics
+    'DistributionAnalyzer': '.statistics.distributions',
+    'HypothesisAnalyzer': '.statistics.hypothesis',
+    'ResamplingAnalyzer': '.statistics.resampling',
+    # utils
+    'AnalyticalTools': '.utils.toolkit',
+    # visualization
+    'StatPlotter': '.visualization.stat_plotter',
+    'StatVisualizer': '.visualization.visualizer',
+}
 
 __version__ = '0.1.0'
 __name__ = 'mindhunter'
@@ -24,7 +41,10 @@ __all__ = [
     'StatFrame',
     'DistributionAnalyzer',
     'HypothesisAnalyzer',
+    'ResamplingAnalyzer',
     'AnalyticalTools',
     'StatPlotter',
     'StatVisualizer',
-]
\ No newline at end of file
+]
+
+__getattr__, __dir__ = attach(__name__, _LAZY, globals())
@@ -0,0 +1,227 @@
+"""
+
+mindhunter.cache
+Lazy, per-metric statistics cache behind `StatFrame._cached_stats`.
+
+"""
+from collections.abc import Mapping
+from typing import Iterator
+
+import numpy as np
+
+from .engine import STAT_KEYS, METRIC_GROUPS, METRIC_TO_GROUP
+
+
+class ColumnStats(Mapping):
+    """ Metrics of a single column, each computed the first time it is read. """
+
+    def __init__(self, cache: 'StatsCache', column: str):
+        self._cache = cache
+        self._column = column
+
+    def __getitem__(self, metric: str):
+        return self._cache.get_metric(self._column, metric)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(STAT_KEYS)
+
+    def __len__(self) -> int:
+        return len(STAT_KEYS)
+
+    def __repr__(self) -> str:
+        computed = self._cache.computed(self._column)
+        return f"ColumnStats({self._column!r}, computed={sorted(computed)})"
+
+
+class StatsCache(Mapping):
+    """ `{column: {metric: value}}` mapping that computes values on demand.
+
+        Metrics are grouped by the intermediate they come from (see
+        `engine.METRIC_GROUPS`): reading `q1` sorts the column once and stores
+        every order statistic, `cv` and `sem` reuse the cached `std`, and so on.
+        Intermediates such as sorted copies are dropped as soon as their group
+        is stored, so the cache only ever holds scalars.
+
+        The owning StatFrame supplies the data through `_column_blocks()` and
+        calls `invalidate()` with the columns a mutation touched. When
+        `provider` is set, misses are first served from it (a callable returning
+        `{column: {metric: value}}`, such as incrementally maintained stats)
+        and only fall back to scanning the data for anything it lacks.
+
+    """
+
+    def __init__(self, sf):
+        self._sf = sf
+        self._values: dict[str, dict] = {}
+        self.provider = None
+        self._provided = False
+        # content fingerprint of the data the cached values describe, once computed
+        self.fingerprint: str = None  # type: ignore
+        self.hits = 0
+        self.misses = 0
+
+    def _columns(self) -> list:
+        return self._sf._numeric_columns()
+
+    def __getitem__(self, column: str) -> ColumnStats:
+        if column not in self._values and column not in self._columns():
+            raise KeyError(column)
+        return ColumnStats(self, column)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns())
+
+    def __len__(self) -> int:
+        return len(self._columns())
+
+    def __repr__(self) -> str:
+        return f"StatsCache(columns={len(self)}, computed={len(self._values)})"
+
+    def computed(self, column: str) -> dict:
+        """ Metrics of `column` that are already cached, without computing anything. """
+        return dict(self._values.get(column, {}))
+
+    def get_metric(self, column: str, metric: str):
+        if metric not in METRIC_TO_GROUP:
+            raise KeyError(metric)
+
+        values = self._values.get(column)
+        if values is not None and metric in values:
+            self.hits += 1
+            return values[metric]
+
+        self.misses += 1
+        if self._pull_provider() and metric in self._values.get(column, {}):
+            return self._values[column][metric]
+        self._compute_group([column], METRIC_TO_GROUP[metric])
+        return self._values[column][metric]
+
+    def _pull_provider(self) -> bool:
+        """ Stores the provider's values once per invalidation; True if it ran now. """
+        if self.provider is None or self._provided:
+            return False
+        self.store(self.provider())
+        self._provided = True
+        return True
+
+    def store(self, stats: dict[str, dict]) -> None:
+        """ Seeds the cache with already computed `{column: {metric: value}}` entries. """
+        for column, metrics in stats.items():
+            self._values.setdefault(column, {}).update(metrics)
+
+    def materialize(self, columns: list = None) -> None:  # type: ignore
+        """ Computes every missing metric for `columns` (all numeric columns by default).
+
+            Columns with nothing cached yet go through the StatFrame's execution
+            backend in one batch; partially cached columns only compute the
+            groups they lack.
+
+        """
+        if columns is None:
+            columns = self._columns()
+
+        cached = sum(len(self._values.get(col, {})) for col in columns)
+        self.hits += cached
+        self.misses += len(columns) * len(METRIC_TO_GROUP) - cached
+
+        if any(not self._values.get(col) for col in columns):
+            self._pull_provider()
+        fresh = [col for col in columns if not self._values.get(col)]
+        self.store(self._sf._batched_stats(fresh))
+
+        for group, (metrics, _, _, _) in METRIC_GROUPS.items():
+            missing = [col for col in columns
+                       if any(m not in self._values.get(col, {}) for m in metrics)]
+            if missing:
+                self._compute_group(missing, group)
+
+    def gather(self, columns: list, metrics: tuple) -> dict[str, np.ndarray]:
+        """ `{metric: array over columns}`, computing whatever is missing in one batch per group.
+
+            Unlike reading `cache[col][metric]` column by column, every missing
+            group is computed for all `columns` at once.
+
+        """
+        if any(not self._values.get(col) for col in columns):
+            self._pull_provider()
+
+        for metric in metrics:
+            if metric not in METRIC_TO_GROUP:
+                raise KeyError(metric)
+            missing = [col for col in columns if metric not in self._values.get(col, {})]
+            self.hits += len(columns) - len(missing)
+            self.misses += len(missing)
+            if missing:
+                self._compute_group(missing, METRIC_TO_GROUP[metric])
+
+        return self._known(columns, metrics)
+
+    def to_dict(self) -> dict[str, dict]:
+        self.materialize()
+        return {col: {key: self._values[col][key] for key in STAT_KEYS}
+                for col in self._columns()}
+
+    def invalidate(self, *columns: str) -> None:
+        """ Drops cached metrics for `columns`, or for every column if none are given. """
+        self._provided = False
+        self.fingerprint = None  # type: ignore
+        if not columns:
+            self._values.clear()
+            return
+        for column in columns:
+            self._values.pop(column, None)
+
+    def refresh(self) -> None:
+        """ Recomputes the metrics cached so far for the current rows.
+
+            Fully cached columns go through the batched engine together;
+            the rest only recompute the groups they had, one batch per group.
+
+        """
+        cached = {col: set(values) for col, values in self._values.items() if col in self._columns()}
+        self.invalidate()
+        full = [col for col, metrics in cached.items() if metrics.issuperset(STAT_KEYS)]
+        if full:
+            self.materialize(full)
+        for group, (metrics, _, _, _) in METRIC_GROUPS.items():
+            columns = [col for col, names in cached.items() if col not in full and names.issuperset(metrics)]
+            if columns:
+                self._compute_group(columns, group)
+
+    def rename(self, mapping: dict) -> None:
+        """ Moves cached metrics to new column names after a rename. """
+        renamed = {}
+        for column, metrics in self._values.items():
+            renamed[mapping.get(column, column)] = metrics
+        if len(renamed) != len(self._values):
+            # two columns collapsed into one name; nothing can be trusted
+            renamed = {}
+        self._values = renamed
+
+    def _compute_group(self, columns: list, group: str) -> None:
+        metrics, dependencies, needs_block, kernel = METRIC_GROUPS[group]
+
+        for dependency in dependencies:
+            missing = [col for col in columns if dependency not in self._values.get(col, {})]
+            if missing:
+                self._compute_group(missing, METRIC_TO_GROUP[dependency])
+
+        if not needs_block:
+            known = self._known(columns, dependencies)
+            self._store_group(columns, metrics, kernel(None, known))
+            return
+
+        for cols, block in self._sf._column_blocks(columns):
+            known = self._known(cols, dependencies)
+            self._store_group(cols, metrics, kernel(block, known))
+
+    def _known(self, columns: list, metrics: tuple) -> dict[str, np.ndarray]:
+        return {
+            metric: np.array([self._values[col][metric] for col in columns], dtype=np.float64)
+            for metric in metrics
+        }
+
+    def _store_group(self, columns: list, metrics: tuple, results: dict) -> None:
+        ordered = [results[metric].tolist() for metric in metrics]
+        for col, values in zip(columns, zip(*ordered)):
+            self._values.setdefault(col, {}).update(zip(metrics, values))
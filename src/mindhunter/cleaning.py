@@ -0,0 +1,129 @@
+"""
+
+mindhunter.cleaning
+Column-name normalization and the fused missing-value/duplicate pass behind `StatFrame.clean_df()`.
+
+"""
+from functools import lru_cache
+import re
+
+import numpy as np
+import pandas as pd
+
+# 64-bit mixing constants (splitmix64 finalizer) for combining per-column codes
+_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+@lru_cache(maxsize=256)
+def _pattern(chars_to_remove: tuple) -> re.Pattern:
+    if chars_to_remove:
+        return re.compile(f"[{''.join(re.escape(char) for char in chars_to_remove)}]")
+    return re.compile(r"[^\w\s]")
+
+
+@lru_cache(maxsize=256)
+def normalize_columns(columns: tuple, chars_to_remove: tuple = ()) -> tuple:
+    """ Lowercased `columns` with `chars_to_remove` (or any non-word character) and spaces replaced by '_'.
+
+        Both the compiled pattern and the result are cached, so frames that
+        share a schema are normalized once.
+
+    """
+    pattern = _pattern(chars_to_remove)
+    return tuple(pattern.sub('_', col.lower()).replace(' ', '_') for col in columns)
+
+
+def clean_masks(data: pd.DataFrame, subset: list = None,  # type: ignore
+                selected: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:  # type: ignore
+    """ `(incomplete, duplicated)` row masks over `data`, from one pass per column.
+
+        Each key column (every column, or the ones in `subset`) is factorized
+        once; its codes mark the missing values and identify the rows for
+        deduplication. Other columns only have their missing values read.
+        Duplicates are searched among the `selected` rows (all by default)
+        that have no missing value, keeping the first occurrence, so dropping
+        both masks matches `dropna()` followed by `drop_duplicates(subset)`.
+
+    """
+    keys = set(data.columns if subset is None else subset)
+    incomplete = np.zeros(len(data), dtype=bool)
+    codes = []
+    for position, col in enumerate(data.columns):
+        series = data.iloc[:, position]
+        if col in keys:
+            column_codes, uniques = pd.factorize(series)
+            incomplete |= column_codes < 0
+            codes.append((column_codes, len(uniques)))
+        else:
+            incomplete |= series.isna().to_numpy()
+
+    candidates = ~incomplete if selected is None else selected & ~incomplete
+    duplicated = np.zeros(len(data), dtype=bool)
+    if codes and candidates.any():
+        rows = None if candidates.all() else np.flatnonzero(candidates)
+        found = duplicate_rows(codes, rows)
+        if rows is None:
+            duplicated = found
+        else:
+            duplicated[rows] = found
+    return incomplete, duplicated
+
+
+def duplicate_rows(codes: list[tuple[np.ndarray, int]], rows: np.ndarray = None) -> np.ndarray:  # type: ignore
+    """ Which of `rows` (all by default) repeat an earlier one of `rows`.
+
+        `codes` holds one `(codes, cardinality)` pair per column, with
+        non-negative codes at `rows`. The columns are combined into one key
+        per row: exactly while the product of cardinalities fits in an int64,
+        and by 64-bit hashing beyond that, where every hash match is checked
+        against the codes of its first occurrence.
+
+    """
+    n_rows = len(codes[0][0])
+    combined = np.zeros(n_rows, dtype=np.int64)
+    capacity = 1
+    for column_codes, size in codes:
+        capacity *= max(size, 1)
+        if capacity >= 2 ** 63:
+            break
+        combined *= max(size, 1)
+        combined += column_codes
+    else:
+        keys = combined if rows is None else combined[rows]
+        return pd.Series(keys, copy=False).duplicated().to_numpy()
+
+    hashed = np.zeros(n_rows, dtype=np.uint64)
+    for column_codes, _ in codes:
+        hashed = _mix(hashed * _MULTIPLIER + column_codes.astype(np.uint64))
+    groups = pd.factorize(hashed if rows is None else hashed[rows])[0]
+    duplicated, first = _repeats(groups)
+
+    positions = np.flatnonzero(duplicated)
+    reference = first[groups[positions]]
+    if rows is not None:
+        positions, reference = rows[positions], rows[reference]
+    if all(np.array_equal(column_codes[positions], column_codes[reference]) for column_codes, _ in codes):
+        return duplicated
+    # a genuine 64-bit collision: fall back to comparing the codes themselves
+    frame = pd.DataFrame({i: column_codes for i, (column_codes, _) in enumerate(codes)})
+    return frame.duplicated().to_numpy() if rows is None else frame.iloc[rows].duplicated().to_numpy()
+
+
+def _repeats(groups: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """ `(repeated, first)` for group ids numbered in order of first appearance.
+
+        `repeated` flags every row after the first of its group, and
+        `first[g]` is the position where group `g` first appears.
+
+    """
+    seen = np.maximum.accumulate(np.concatenate(([-1], groups[:-1])))
+    is_first = groups > seen
+    return ~is_first, np.flatnonzero(is_first)
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    values = (values ^ (values >> np.uint64(30))) * _MIX_1
+    values = (values ^ (values >> np.uint64(27))) * _MIX_2
+    return values ^ (values >> np.uint64(31))
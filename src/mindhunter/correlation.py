@@ -0,0 +1,243 @@
+"""
+
+mindhunter.correlation
+Blocked correlation kernels behind `HypothesisAnalyzer.correlation_matrix()`.
+
+"""
+from typing import Callable, Iterator
+
+import numpy as np
+
+from .engine import DEFAULT_BLOCK_BYTES, block_width
+
+METHODS = ('pearson', 'spearman', 'kendall')
+NAN_POLICIES = ('pairwise', 'listwise')
+
+# `fill(columns, start, stop)` returns the `(columns, rows)` float64 block of rows `start:stop`.
+BlockFill = Callable[[list, int, int], np.ndarray]
+
+
+class _Prepared:
+    """ One column block, standardized and ready for the cross-product kernels. """
+
+    def __init__(self, block: np.ndarray, mean: np.ndarray, std: np.ndarray,
+                 raw: np.ndarray = None):  # type: ignore
+        usable = np.isfinite(std) & (std > 0)
+        self.raw = block if raw is None else raw
+        self.mask = ~np.isnan(block)
+        self.complete = bool(self.mask.all())
+        self.usable = usable
+        self.z = (block - mean[:, None]) / np.where(usable, std, 1.0)[:, None]
+        self.z[~self.mask] = 0.0
+        self.weights = self.mask.astype(np.float64)
+
+
+def pearson_cross(a: _Prepared, b: _Prepared) -> tuple[np.ndarray, np.ndarray]:
+    """ Pearson r and pair counts between every column of `a` and every column of `b`.
+
+        Blocks are standardized with the moments of each column's own present
+        values, so if both blocks are complete r is a single matrix product.
+        Otherwise each pair is restricted to the rows where both columns are
+        present, using the co-moment sums of the standardized values (six
+        matrix products).
+
+    """
+    if a.complete and b.complete:
+        n = np.full((a.z.shape[0], b.z.shape[0]), float(a.z.shape[1]))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r = (a.z @ b.z.T) / (n - 1)
+    else:
+        n = a.weights @ b.weights.T
+        sx = a.z @ b.weights.T
+        sy = a.weights @ b.z.T
+        sxx = (a.z * a.z) @ b.weights.T
+        syy = a.weights @ (b.z * b.z).T
+        sxy = a.z @ b.z.T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx ** 2) * (n * syy - sy ** 2))
+
+    r = np.clip(r, -1.0, 1.0)
+    r[~a.usable, :] = np.nan
+    r[:, ~b.usable] = np.nan
+    r[n < 2] = np.nan
+    return r, n
+
+
+def kendall_cross(a: _Prepared, b: _Prepared) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Kendall's tau-b, pair counts and p-values, one `scipy.stats.kendalltau` per pair.
+
+        This is O(pairs) Python-level calls, each O(rows log rows), so it is
+        by far the slowest method on wide frames.
+
+    """
+    from scipy import stats
+    shape = (a.raw.shape[0], b.raw.shape[0])
+    r, n, p = np.full(shape, np.nan), np.zeros(shape), np.full(shape, np.nan)
+    for i in range(shape[0]):
+        for j in range(shape[1]):
+            both = a.mask[i] & b.mask[j]
+            n[i, j] = both.sum()
+            if n[i, j] >= 2:
+                result = stats.kendalltau(a.raw[i, both], b.raw[j, both])
+                r[i, j], p[i, j] = result.statistic, result.pvalue
+    return r, n, p
+
+
+class _Sorted:
+    """ Each column's sort order (NaN last), with the bounds of its runs of tied values. """
+
+    def __init__(self, raw: np.ndarray):
+        self.order = np.argsort(raw, axis=1, kind='stable')
+        self.inverse = np.argsort(self.order, axis=1)
+        ordered = np.take_along_axis(raw, self.order, axis=1)
+        self.mask = ~np.isnan(ordered)
+        positions = np.arange(raw.shape[1])
+        first = np.ones(raw.shape, dtype=bool)
+        first[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        last = np.ones(raw.shape, dtype=bool)
+        last[:, :-1] = first[:, 1:]
+        self.ties = ~first.all(axis=1)
+        self.start = np.maximum.accumulate(np.where(first, positions, 0), axis=1)
+        self.stop = np.minimum.accumulate(np.where(last, positions + 1, raw.shape[1])[:, ::-1], axis=1)[:, ::-1]
+
+
+def subset_ranks(start: np.ndarray, stop: np.ndarray, removed: np.ndarray, ties: bool = True) -> np.ndarray:
+    """ Average ranks, in sorted order, of columns after dropping the `removed` rows.
+
+        `start`/`stop` bound each sorted position's run of tied values and
+        `removed` is in the same sorted order; every row of it may drop a
+        different set, so one column can be re-ranked against many partners
+        at once. A value's rank falls by the dropped values below it plus
+        half the dropped values tied with it, which a cumulative count over
+        the sorted order gives in one pass. Ranks at missing or dropped
+        positions are meaningless.
+
+    """
+    dropped = np.zeros((removed.shape[0], removed.shape[1] + 1))
+    np.cumsum(removed, axis=1, out=dropped[:, 1:])
+    if not ties:
+        return np.arange(1, removed.shape[1] + 1) - (dropped[:, :-1] + dropped[:, 1:]) / 2
+    start, stop = np.broadcast_to(start, removed.shape), np.broadcast_to(stop, removed.shape)
+    below = np.take_along_axis(dropped, start, axis=1)
+    through = np.take_along_axis(dropped, stop, axis=1)
+    return (start + stop + 1 - below - through) / 2
+
+
+def rerank_incomplete_pairs(a: _Prepared, b: _Prepared, r: np.ndarray, n: np.ndarray) -> None:
+    """ Recomputes Spearman r in place for pairs where either column has missing values.
+
+        Ranks are shared per column for speed, but a pair with missing values
+        has to be ranked over just the rows both columns have, as pandas does.
+        Each column of `a` is sorted once and re-ranked against all of its
+        partners in `b` together (and they against it) with `subset_ranks`.
+
+    """
+    incomplete_a = ~a.mask.all(axis=1)
+    incomplete_b = ~b.mask.all(axis=1)
+    sorted_a, sorted_b = _Sorted(a.raw), _Sorted(b.raw)
+    # ranks of `b` over all of its present rows, for partners of complete columns
+    ranks_b = np.take_along_axis(subset_ranks(sorted_b.start, sorted_b.stop, np.zeros(b.raw.shape, dtype=bool)),
+                                 sorted_b.inverse, axis=1)
+    for i in np.flatnonzero(a.usable):
+        columns = np.flatnonzero((incomplete_b | incomplete_a[i]) & b.usable & (n[i] >= 2))
+        if not len(columns):
+            continue
+        present, partner_present = a.mask[i], b.mask[columns]
+        order = sorted_a.order[i]
+        x = subset_ranks(sorted_a.start[i], sorted_a.stop[i],
+                         present[order] & ~partner_present[:, order], sorted_a.ties[i])
+        x = x[:, sorted_a.inverse[i]]
+        if incomplete_a[i]:
+            y = subset_ranks(sorted_b.start[columns], sorted_b.stop[columns],
+                             sorted_b.mask[columns] & ~present[sorted_b.order[columns]],
+                             bool(sorted_b.ties[columns].any()))
+            y = np.take_along_axis(y, sorted_b.inverse[columns], axis=1)
+        else:
+            y = ranks_b[columns]
+
+        both = present & partner_present
+        count = both.sum(axis=1, keepdims=True)
+        x = np.where(both, x - np.where(both, x, 0.0).sum(axis=1, keepdims=True) / count, 0.0)
+        y = np.where(both, y - np.where(both, y, 0.0).sum(axis=1, keepdims=True) / count, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rho = np.einsum('ij,ij->i', x, y) / np.sqrt(np.einsum('ij,ij->i', x, x) * np.einsum('ij,ij->i', y, y))
+        r[i, columns] = np.clip(rho, -1.0, 1.0)
+
+
+def correlation_p_values(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """ Two-sided p-values of Pearson/Spearman r with `n` pairs, from Student's t with n - 2 df. """
+    from scipy import special
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = r * np.sqrt((n - 2) / (1 - r ** 2))
+        p = 2 * special.stdtr(n - 2, -np.abs(t))
+    p = np.where(np.abs(r) == 1.0, 0.0, p)
+    return np.where(n > 2, p, np.nan)
+
+
+def correlation_blocks(fill: BlockFill, columns: list, n_rows: int, method: str = 'pearson',
+                       nan_policy: str = 'pairwise', moments: tuple = None,  # type: ignore
+                       block_bytes: int = DEFAULT_BLOCK_BYTES
+                       ) -> Iterator[tuple[slice, slice, np.ndarray, np.ndarray, np.ndarray]]:
+    """ Yields `(rows, cols, r, n, p)` for every pair of column blocks on or above the diagonal.
+
+        `rows` and `cols` are slices into `columns`. At most two blocks of
+        `block_bytes / 2` each are held at a time, so the full data never needs
+        to fit in memory. With `nan_policy='listwise'`, only rows where every
+        column is present are used; with 'pairwise', each pair uses the rows
+        where both of its columns are present. Spearman ranks each column once
+        (over the rows in use) and correlates the ranks; pairs with missing
+        values are re-ranked over their shared rows, vectorized per column.
+        For Pearson, `moments` may pass the cached `(mean, std)` of
+        `columns` to skip recomputing them.
+
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}. Expected one of {METHODS}")
+    if nan_policy not in NAN_POLICIES:
+        raise ValueError(f"Unknown nan_policy: {nan_policy}. Expected one of {NAN_POLICIES}")
+
+    width = block_width(n_rows, block_bytes // 2)
+    spans = [slice(start, min(start + width, len(columns))) for start in range(0, len(columns), width)]
+
+    rows = None
+    if nan_policy == 'listwise':
+        complete = np.ones(n_rows, dtype=bool)
+        for span in spans:
+            complete &= ~np.isnan(fill(columns[span], 0, n_rows)).any(axis=0)
+        if not complete.all():
+            rows = np.flatnonzero(complete)
+
+    reuse_moments = method == 'pearson' and moments is not None and rows is None
+
+    def prepare(span: slice) -> _Prepared:
+        block = raw = fill(columns[span], 0, n_rows)
+        if rows is not None:
+            block = raw = block[:, rows]
+        if method == 'spearman':
+            from scipy import stats
+            block = stats.rankdata(block, axis=1, nan_policy='omit')
+        if reuse_moments:
+            mean, std = moments[0][span], moments[1][span]
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                count = (~np.isnan(block)).sum(axis=1)
+                mean = np.nansum(block, axis=1) / count
+                std = np.sqrt(np.nansum((block - mean[:, None]) ** 2, axis=1) / (count - 1))
+        return _Prepared(block, mean, std, raw)
+
+    for position, row_span in enumerate(spans):
+        a = prepare(row_span)
+        for col_span in spans[position:]:
+            b = a if col_span == row_span else prepare(col_span)
+            if method == 'kendall':
+                r, n, p = kendall_cross(a, b)
+            else:
+                r, n = pearson_cross(a, b)
+                if method == 'spearman' and not (a.complete and b.complete):
+                    rerank_incomplete_pairs(a, b, r, n)
+                p = correlation_p_values(r, n)
+            if col_span == row_span:
+                diagonal = np.arange(r.shape[0])
+                r[diagonal, diagonal] = np.where(np.isnan(r[diagonal, diagonal]), np.nan, 1.0)
+                p[diagonal, diagonal] = np.where(np.isnan(r[diagonal, diagonal]), np.nan, 0.0)
+            yield row_span, col_span, r, n, p
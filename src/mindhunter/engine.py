@@ -0,0 +1,349 @@
+"""
+
+mindhunter.engine
+Column-batched kernels behind the cached statistics of a StatFrame.
+
+"""
+from typing import Iterator
+
+import pandas as pd
+import numpy as np
+
+STAT_KEYS = (
+    'mean', 'median', 'mode',
+    'std', 'variance', 'range', 'iqr', 'mad',
+    'skewness', 'kurtosis',
+    'count', 'missing_count', 'missing_pct',
+    'min', 'max', 'q1', 'q3',
+    'cv', 'sem',
+)
+
+# Working-set budget for one block of columns. Sorting and the moment pass keep
+# roughly four block-sized temporaries alive, so this is not a hard ceiling.
+DEFAULT_BLOCK_BYTES = 64 * 1024 ** 2
+
+
+def numeric_columns(df: pd.DataFrame) -> list:
+    return df.select_dtypes(include=[np.number]).columns.tolist()
+
+
+def column_values(series: pd.Series, out: np.ndarray = None) -> np.ndarray:  # type: ignore
+    """ Returns a float64 view (or copy) of a column, with NaN for missing values.
+
+        With `out`, the values are written into it instead. Arrow-backed
+        columns are read chunk by chunk (see `arrow_values`).
+    """
+    if isinstance(series.dtype, pd.ArrowDtype):
+        return arrow_values(series.array.__arrow_array__(), out)
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    if out is None:
+        return values
+    out[:] = values
+    return out
+
+
+def arrow_values(chunked, out: np.ndarray = None) -> np.ndarray:  # type: ignore
+    """ Float64 values of a numeric pyarrow `ChunkedArray`, with NaN for nulls.
+
+        Chunks without nulls are read through zero-copy NumPy views (a
+        single float64 chunk is returned as is when there is no `out`); the
+        others are cast and null-filled with Arrow compute kernels.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if out is None:
+        if chunked.num_chunks == 1 and chunked.null_count == 0 and chunked.type == pa.float64():
+            return chunked.chunk(0).to_numpy(zero_copy_only=True)
+        out = np.empty(len(chunked), dtype=np.float64)
+
+    start = 0
+    for chunk in chunked.chunks:
+        stop = start + len(chunk)
+        if pa.types.is_floating(chunk.type) or (pa.types.is_integer(chunk.type) and chunk.null_count == 0):
+            # a view of the chunk's buffer; floats' nulls come out as NaN
+            out[start:stop] = chunk.to_numpy(zero_copy_only=False)
+        else:
+            out[start:stop] = pc.fill_null(pc.cast(chunk, pa.float64()), np.nan).to_numpy()
+        start = stop
+    return out
+
+
+def block_width(n_rows: int, block_bytes: int = DEFAULT_BLOCK_BYTES) -> int:
+    """ Number of float64 columns of `n_rows` rows that fit in `block_bytes`. """
+    return max(1, block_bytes // (max(n_rows, 1) * 8))
+
+
+def column_blocks(df: pd.DataFrame, columns: list,
+                  block_bytes: int = DEFAULT_BLOCK_BYTES) -> Iterator[tuple[list, np.ndarray]]:
+    """ Yields `(columns, block)` pairs where `block` has one row per column.
+
+        Columns are laid out row-wise so every per-column reduction and sort runs
+        over contiguous memory.
+
+    """
+    width = block_width(len(df), block_bytes)
+    for start in range(0, len(columns), width):
+        cols = columns[start:start + width]
+        block = np.empty((len(cols), len(df)), dtype=np.float64)
+        for i, col in enumerate(cols):
+            column_values(df[col], out=block[i])
+        yield cols, block
+
+
+def central_moments(block: np.ndarray) -> dict[str, np.ndarray]:
+    """ Count, mean and the 2nd to 4th central power sums of every row of `block`.
+
+        NaN entries are ignored. The mean is taken first and the centered sums
+        follow in a single sweep over the block, like pandas' own `nanskew` and
+        `nankurt`, so results agree with `Series.skew()` and `Series.kurt()`.
+
+    """
+    valid = ~np.isnan(block)
+    count = valid.sum(axis=1)
+    complete = bool((count == block.shape[1]).all())
+    # without missing values (e.g. bootstrap resamples) the masking passes can be skipped
+    filled = block if complete else np.where(valid, block, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = filled.sum(axis=1) / count
+
+    adjusted = filled - mean[:, None]
+    if not complete:
+        adjusted[~valid] = 0.0
+    adjusted2 = adjusted ** 2
+
+    return {
+        'count': count,
+        'mean': mean,
+        'm2': adjusted2.sum(axis=1),
+        'm3': (adjusted2 * adjusted).sum(axis=1),
+        'm4': (adjusted2 ** 2).sum(axis=1),
+        'max_abs': np.abs(filled).max(axis=1, initial=0.0),
+    }
+
+
+def shape_stats(count: np.ndarray, m2: np.ndarray, m3: np.ndarray,
+                m4: np.ndarray, max_abs: np.ndarray) -> dict[str, np.ndarray]:
+    """ Turns central power sums into std, variance, skewness and kurtosis.
+
+        Mirrors pandas' bias corrections and its floating point tolerance for
+        constant columns, so a constant column reports 0 skewness and kurtosis.
+
+    """
+    count = count.astype(np.float64)
+    eps = np.finfo(np.float64).eps
+    m2 = np.where(np.abs(m2) < (eps * max_abs) ** 2 * count, 0.0, m2)
+    m3 = np.where(np.abs(m3) < (eps * max_abs) ** 3 * count, 0.0, m3)
+    m4 = np.where(np.abs(m4) < (eps * max_abs) ** 4 * count, 0.0, m4)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = np.where(count > 1, m2 / (count - 1), np.nan)
+        skewness = (count * (count - 1) ** 0.5 / (count - 2)) * (m3 / m2 ** 1.5)
+        adj = 3 * (count - 1) ** 2 / ((count - 2) * (count - 3))
+        numerator = count * (count + 1) * (count - 1) * m4
+        denominator = (count - 2) * (count - 3) * m2 ** 2
+        kurtosis = numerator / denominator - adj
+
+    skewness = np.where(m2 == 0, 0.0, skewness)
+    skewness = np.where(count < 3, np.nan, skewness)
+    kurtosis = np.where(denominator == 0, 0.0, kurtosis)
+    kurtosis = np.where(count < 4, np.nan, kurtosis)
+
+    return {
+        'std': np.sqrt(variance),
+        'variance': variance,
+        'skewness': skewness,
+        'kurtosis': kurtosis,
+    }
+
+
+def sorted_quantile(sorted_block: np.ndarray, count: np.ndarray, q: float) -> np.ndarray:
+    """ Linear-interpolated quantile of every row of a NaN-last sorted block.
+
+        Uses the same interpolation as `np.quantile(..., method='linear')`.
+
+    """
+    rows = np.arange(sorted_block.shape[0])
+    position = q * (count - 1)
+    lower = np.clip(np.floor(position).astype(np.int64), 0, None)
+    upper = np.minimum(lower + 1, np.clip(count - 1, 0, None))
+    gamma = position - lower
+
+    if sorted_block.shape[1] == 0:
+        return np.full(sorted_block.shape[0], np.nan)
+
+    a = sorted_block[rows, lower]
+    b = sorted_block[rows, upper]
+    diff = b - a
+    result = np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+    return np.where(count > 0, result, np.nan)
+
+
+def sorted_mode(sorted_block: np.ndarray, count: np.ndarray) -> np.ndarray:
+    """ Smallest most frequent value of every row of a NaN-last sorted block.
+
+        Equal values are adjacent once sorted, so the running length of each run
+        is all that is needed; the first position holding the longest run is the
+        smallest mode, matching `Series.mode().iloc[0]`.
+
+    """
+    n_cols, n_rows = sorted_block.shape
+    if n_rows == 0:
+        return np.full(n_cols, np.nan)
+
+    positions = np.arange(n_rows)
+    starts = np.ones(sorted_block.shape, dtype=bool)
+    starts[:, 1:] = sorted_block[:, 1:] != sorted_block[:, :-1]
+    last_start = np.maximum.accumulate(np.where(starts, positions, 0), axis=1)
+    run_length = positions - last_start
+    run_length[positions[None, :] >= count[:, None]] = -1
+
+    best = run_length.argmax(axis=1)
+    mode = sorted_block[np.arange(n_cols), best]
+    return np.where(count > 0, mode, np.nan)
+
+
+def assemble_stats(columns: list, metrics: dict[str, np.ndarray]) -> dict[str, dict]:
+    """ Splits per-metric arrays into the `{column: {metric: value}}` cache layout. """
+    ordered = [metrics[key].tolist() for key in STAT_KEYS]
+    return {
+        col: dict(zip(STAT_KEYS, values))
+        for col, values in zip(columns, zip(*ordered))
+    }
+
+
+def _valid_count(block: np.ndarray, known: dict) -> np.ndarray:
+    if 'count' in known:
+        return known['count']
+    return (~np.isnan(block)).sum(axis=1)
+
+
+def count_kernel(block: np.ndarray, known: dict) -> dict[str, np.ndarray]:
+    n_total = block.shape[1]
+    count = (~np.isnan(block)).sum(axis=1)
+    missing = n_total - count
+    with np.errstate(invalid='ignore', divide='ignore'):
+        missing_pct = missing / n_total if n_total else np.full(len(count), np.nan)
+    return {'count': count, 'missing_count': missing, 'missing_pct': missing_pct}
+
+
+def moment_kernel(block: np.ndarray, known: dict) -> dict[str, np.ndarray]:
+    moments = central_moments(block)
+    metrics = {'mean': moments['mean']}
+    metrics.update(shape_stats(moments['count'], moments['m2'], moments['m3'],
+                               moments['m4'], moments['max_abs']))
+    return metrics
+
+
+def order_kernel(block: np.ndarray, known: dict) -> dict[str, np.ndarray]:
+    """ Every order statistic from one in-place sort of `block`. """
+    count = _valid_count(block, known)
+    block.sort(axis=1)
+    metrics = {
+        'median': sorted_quantile(block, count, 0.5),
+        'q1': sorted_quantile(block, count, 0.25),
+        'q3': sorted_quantile(block, count, 0.75),
+        'min': sorted_quantile(block, count, 0.0),
+        'max': sorted_quantile(block, count, 1.0),
+        'mode': sorted_mode(block, count),
+    }
+    metrics['range'] = metrics['max'] - metrics['min']
+    metrics['iqr'] = metrics['q3'] - metrics['q1']
+    return metrics
+
+
+def mad_kernel(block: np.ndarray, known: dict) -> dict[str, np.ndarray]:
+    """ Median absolute deviation around an already known median. Reuses `block` as scratch. """
+    count = _valid_count(block, known)
+    np.subtract(block, known['median'][:, None], out=block)
+    np.abs(block, out=block)
+    block.sort(axis=1)
+    return {'mad': sorted_quantile(block, count, 0.5)}
+
+
+def cv_kernel(block: None, known: dict) -> dict[str, np.ndarray]:
+    mean, std = known['mean'], known['std']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {'cv': np.where(mean != 0, std / mean, np.inf)}
+
+
+def sem_kernel(block: None, known: dict) -> dict[str, np.ndarray]:
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {'sem': known['std'] / np.sqrt(known['count'])}
+
+
+# Metrics are computed in groups sharing one intermediate (a sort, a moment
+# pass, ...). Each entry is `(metrics, dependencies, needs_block, kernel)`:
+# dependencies are metrics that must be known before the kernel runs, and the
+# groups are listed in an order that satisfies them.
+METRIC_GROUPS = {
+    'counts': (('count', 'missing_count', 'missing_pct'), (), True, count_kernel),
+    'moments': (('mean', 'std', 'variance', 'skewness', 'kurtosis'), (), True, moment_kernel),
+    'order': (('median', 'q1', 'q3', 'min', 'max', 'mode', 'range', 'iqr'), (), True, order_kernel),
+    'mad': (('mad',), ('median',), True, mad_kernel),
+    'cv': (('cv',), ('mean', 'std'), False, cv_kernel),
+    'sem': (('sem',), ('std', 'count'), False, sem_kernel),
+}
+
+METRIC_TO_GROUP = {
+    metric: group
+    for group, (metrics, _, _, _) in METRIC_GROUPS.items()
+    for metric in metrics
+}
+
+
+def block_stats(block: np.ndarray) -> dict[str, np.ndarray]:
+    """ Computes every cached metric for each row of `block` at once.
+
+        The block is consumed: the order statistics sort it in place and the MAD
+        reuses the sorted buffer for the absolute deviations.
+
+    """
+    metrics = {}
+    for _, _, _, kernel in METRIC_GROUPS.values():
+        metrics.update(kernel(block, metrics))
+    return metrics
+
+
+def compute_metrics(block: np.ndarray, metrics: tuple) -> dict[str, np.ndarray]:
+    """ Computes `metrics`, and the metrics they depend on, for each row of `block`.
+
+        Only the groups that are needed run, in `METRIC_GROUPS` order, so the
+        block may be sorted or overwritten just like in `block_stats`.
+
+    """
+    needed = set()
+
+    def require(metric: str) -> None:
+        group = METRIC_TO_GROUP[metric]
+        if group not in needed:
+            needed.add(group)
+            for dependency in METRIC_GROUPS[group][1]:
+                require(dependency)
+
+    for metric in metrics:
+        require(metric)
+
+    known = {}
+    for group, (_, _, needs_block, kernel) in METRIC_GROUPS.items():
+        if group in needed:
+            known.update(kernel(block if needs_block else None, known))
+    return known
+
+
+def compute_essential_stats(df: pd.DataFrame, columns: list = None,  # type: ignore
+                            block_bytes: int = DEFAULT_BLOCK_BYTES) -> dict[str, dict]:
+    """ Computes the cached metrics for every numeric column of `df`.
+
+        Columns are processed in blocks: moments come from one vectorized pass,
+        every order statistic (quantiles, min, max, mode) from one sort per
+        column, and the MAD from one more sort of the absolute deviations.
+
+    """
+    if columns is None:
+        columns = numeric_columns(df)
+
+    stats = {}
+    for cols, block in column_blocks(df, columns, block_bytes):
+        stats.update(assemble_stats(cols, block_stats(block)))
+    return stats
@@ -0,0 +1,183 @@
+"""
+
+mindhunter.grouping
+Per-group cached statistics behind `StatFrame.groupby()`.
+
+"""
+import pandas as pd
+import numpy as np
+
+from .engine import STAT_KEYS, cv_kernel, sem_kernel, shape_stats
+from .instrumentation import instrument_public_methods
+
+
+class GroupIndex:
+    """ Group membership of a StatFrame's rows, computed once per set of keys.
+
+        Rows are hash-partitioned by pandas' groupby and laid out group by
+        group: `rows` holds the positions (among the selected rows) of group 0,
+        then group 1 and so on, `codes` the group of each of those rows and
+        `starts`/`sizes` where each group begins and how long it is.
+
+    """
+
+    def __init__(self, key_frame: pd.DataFrame, keys: list, dropna: bool = True):
+        grouped = key_frame.groupby(keys, sort=True, dropna=dropna, observed=True)
+        codes = grouped.ngroup().to_numpy(dtype=np.float64, na_value=np.nan)
+        member = ~np.isnan(codes)
+
+        self.index: pd.Index = grouped.size().index
+        self.rows = np.flatnonzero(member)
+        self.rows = self.rows[np.argsort(codes[member], kind='stable')]
+        self.codes = codes[self.rows].astype(np.int64)
+        self.sizes = np.bincount(self.codes, minlength=len(self.index))
+        self.starts = np.concatenate(([0], np.cumsum(self.sizes)[:-1])).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+def segment_quantile(values: np.ndarray, starts: np.ndarray, count: np.ndarray, q: float) -> np.ndarray:
+    """ Linear-interpolated quantile of every group of values sorted NaN-last within each group.
+
+        The per-group counterpart of `engine.sorted_quantile`.
+
+    """
+    position = q * (count - 1)
+    lower = np.clip(np.floor(position).astype(np.int64), 0, None)
+    upper = np.minimum(lower + 1, np.clip(count - 1, 0, None))
+    gamma = position - lower
+
+    a = values[starts + lower]
+    b = values[starts + upper]
+    diff = b - a
+    result = np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+    return np.where(count > 0, result, np.nan)
+
+
+def segment_mode(values: np.ndarray, codes: np.ndarray, starts: np.ndarray,
+                 count: np.ndarray) -> np.ndarray:
+    """ Smallest most frequent value of every group of values sorted NaN-last within each group. """
+    positions = np.arange(len(values))
+    run_start = np.ones(len(values), dtype=bool)
+    run_start[1:] = values[1:] != values[:-1]
+    run_start[starts] = True
+    run_length = positions - np.maximum.accumulate(np.where(run_start, positions, 0))
+    run_length[np.isnan(values)] = -1
+
+    longest = np.maximum.reduceat(run_length, starts)
+    first = np.minimum.reduceat(np.where(run_length == longest[codes], positions, len(values)), starts)
+    return np.where(count > 0, values[np.minimum(first, len(values) - 1)], np.nan)
+
+
+def grouped_stats(values: np.ndarray, codes: np.ndarray, starts: np.ndarray,
+                  sizes: np.ndarray) -> dict[str, np.ndarray]:
+    """ Every cached metric of one column for each group at once.
+
+        `values` must already be in group order (see `GroupIndex`). One
+        lexsort orders the values within their groups; the moments are segment
+        sums over it and the order statistics are read off at each group's
+        offsets, so the cost does not depend on the number of groups.
+
+    """
+    if len(sizes) == 0:
+        return {key: np.empty(0) for key in STAT_KEYS}
+
+    values = values[np.lexsort((values, codes))]
+    valid = ~np.isnan(values)
+    count = np.add.reduceat(valid.astype(np.int64), starts)
+
+    filled = np.where(valid, values, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.add.reduceat(filled, starts) / count
+        missing_pct = (sizes - count) / sizes
+    adjusted = np.where(valid, filled - mean[codes], 0.0)
+    adjusted2 = adjusted ** 2
+
+    metrics = {
+        'count': count,
+        'missing_count': sizes - count,
+        'missing_pct': missing_pct,
+        'mean': mean,
+    }
+    metrics.update(shape_stats(count,
+                               np.add.reduceat(adjusted2, starts),
+                               np.add.reduceat(adjusted2 * adjusted, starts),
+                               np.add.reduceat(adjusted2 ** 2, starts),
+                               np.maximum.reduceat(np.abs(filled), starts)))
+
+    for key, q in (('median', 0.5), ('q1', 0.25), ('q3', 0.75), ('min', 0.0), ('max', 1.0)):
+        metrics[key] = segment_quantile(values, starts, count, q)
+    metrics['mode'] = segment_mode(values, codes, starts, count)
+    metrics['range'] = metrics['max'] - metrics['min']
+    metrics['iqr'] = metrics['q3'] - metrics['q1']
+
+    deviation = np.abs(values - metrics['median'][codes])
+    deviation = deviation[np.lexsort((deviation, codes))]
+    metrics['mad'] = segment_quantile(deviation, starts, count, 0.5)
+
+    metrics.update(cv_kernel(None, metrics))
+    metrics.update(sem_kernel(None, metrics))
+    return metrics
+
+
+@instrument_public_methods
+class GroupedStatFrame:
+    """ Cached stats of every (group, column) pair of a StatFrame, from `StatFrame.groupby()`.
+
+        Group membership is computed once and both it and the per-group
+        metrics are kept until the StatFrame's data changes, so asking again
+        for the same keys costs nothing.
+
+    """
+
+    def __init__(self, sf, keys: list, dropna: bool = True):
+        self.da = sf
+        self.keys = keys
+        self.dropna = dropna
+        self._groups: GroupIndex = None  # type: ignore
+        self._values: dict[str, dict[str, np.ndarray]] = {}
+
+    def __repr__(self) -> str:
+        return f"GroupedStatFrame(keys={self.keys!r}, groups={len(self.groups)})"
+
+    @property
+    def groups(self) -> pd.Index:
+        return self._group_index().index
+
+    def size(self) -> pd.Series:
+        groups = self._group_index()
+        return pd.Series(groups.sizes, index=groups.index, name='size')
+
+    def _group_index(self) -> GroupIndex:
+        if self._groups is None:
+            data = self.da._source()[self.keys]
+            if self.da._row_mask is not None:
+                data = data.iloc[self.da._selected_positions()]
+            self._groups = GroupIndex(data, self.keys, self.dropna)
+        return self._groups
+
+    def _value_columns(self) -> list:
+        return [col for col in self.da._numeric_columns() if col not in self.keys]
+
+    def get_stats(self, *columns: str) -> pd.DataFrame:
+        """ Every cached metric per group, with `(column, metric)` MultiIndex columns.
+
+            Covers all numeric columns except the keys unless `columns` are given.
+
+        """
+        columns = list(columns) if columns else self._value_columns()
+        groups = self._group_index()
+
+        missing = [col for col in columns if col not in self._values]
+        for cols, block in self.da._column_blocks(missing):
+            for col, values in zip(cols, block):
+                self._values[col] = grouped_stats(values[groups.rows], groups.codes,
+                                                  groups.starts, groups.sizes)
+
+        result = pd.DataFrame(
+            {(col, key): self._values[col][key] for col in columns for key in STAT_KEYS},
+            index=groups.index,
+        )
+        result.columns = pd.MultiIndex.from_tuples(result.columns, names=['column', 'metric'])
+        return result
@@ -0,0 +1,290 @@
+"""
+
+mindhunter.instrumentation
+Per-call spans for the public API, reported to pluggable sinks; a no-op until a sink is added.
+
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+SPAN_FIELDS = (
+    'name', 'started', 'duration', 'rows', 'rows_out', 'columns',
+    'cache_hits', 'cache_misses', 'peak_bytes', 'depth', 'frame_id', 'error',
+)
+
+
+class Span:
+    """ One instrumented call.
+
+        `rows`/`columns` describe the StatFrame the call worked on when it
+        started (None if there was none yet) and `rows_out` when it ended.
+        `cache_hits`/`cache_misses` count stats cache lookups made during the
+        call. `peak_bytes` is the peak traced allocation above the starting
+        level, or None when memory isn't tracked. `depth` is 0 for calls made
+        from outside the library and grows with nesting.
+
+    """
+
+    __slots__ = SPAN_FIELDS + ('_base', '_peak')
+
+    def __init__(self, name: str, depth: int):
+        self.name = name
+        self.depth = depth
+        self.started = time.time()
+        self.duration = 0.0
+        self.rows: int = None  # type: ignore
+        self.rows_out: int = None  # type: ignore
+        self.columns: int = None  # type: ignore
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.peak_bytes: int = None  # type: ignore
+        self.frame_id: int = None  # type: ignore
+        self.error: str = None  # type: ignore
+        self._base = 0
+        self._peak = 0
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, duration={self.duration:.6f}, rows={self.rows}, depth={self.depth})"
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in SPAN_FIELDS}
+
+
+def summarize(spans: list[Span]) -> pd.DataFrame:
+    """ One row per span name: calls, total/mean/max seconds, rows, cache lookups and peak memory. """
+    columns = ['calls', 'total_s', 'mean_s', 'max_s', 'rows', 'cache_hits', 'cache_misses', 'peak_bytes', 'errors']
+    if not spans:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name='name'))
+    records = pd.DataFrame([span.to_dict() for span in spans])
+    # objects built inside the span only know their rows at the end
+    records['rows'] = records['rows'].fillna(records['rows_out'])
+    grouped = records.groupby('name', sort=False)
+    summary = pd.DataFrame({
+        'calls': grouped.size(),
+        'total_s': grouped['duration'].sum(),
+        'mean_s': grouped['duration'].mean(),
+        'max_s': grouped['duration'].max(),
+        'rows': grouped['rows'].max(),
+        'cache_hits': grouped['cache_hits'].sum(),
+        'cache_misses': grouped['cache_misses'].sum(),
+        'peak_bytes': grouped['peak_bytes'].max(),
+        'errors': grouped['error'].count(),
+    })
+    return summary.sort_values('total_s', ascending=False)
+
+
+class CollectorSink:
+    """ Keeps spans in memory, optionally only those of one StatFrame (and its analyzers and plotters). """
+
+    def __init__(self, frame=None):
+        self.frame_id = id(frame) if frame is not None else None
+        self.spans: list[Span] = []
+
+    def emit(self, span: Span) -> None:
+        if self.frame_id is None or span.frame_id == self.frame_id:
+            self.spans.append(span)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([span.to_dict() for span in self.spans], columns=list(SPAN_FIELDS))
+
+    def summary(self) -> pd.DataFrame:
+        return summarize(self.spans)
+
+
+class LoggingSink:
+    """ Logs one line per span to `logger` (a Logger or its name) at `level`. """
+
+    def __init__(self, logger: logging.Logger | str = 'mindhunter', level: int = logging.DEBUG):
+        self.logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.level = level
+
+    def emit(self, span: Span) -> None:
+        self.logger.log(self.level, "%s%s took %.6fs (rows=%s, columns=%s, cache hits=%d misses=%d, peak=%s)%s",
+                        '  ' * span.depth, span.name, span.duration, span.rows, span.columns,
+                        span.cache_hits, span.cache_misses, span.peak_bytes,
+                        f" failed with {span.error}" if span.error else '')
+
+
+class JsonLinesSink:
+    """ Appends every span as one JSON object per line to `path`. """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        line = json.dumps(span.to_dict())
+        with self._lock, open(self.path, 'a', encoding='utf-8') as handle:
+            handle.write(line + '\n')
+
+
+# active sinks; while empty, instrumented calls go straight to the wrapped function
+_sinks: list = []
+_registry_lock = threading.Lock()
+_stack: ContextVar[tuple] = ContextVar('mindhunter_spans', default=())
+
+
+def add_sink(sink) -> None:
+    """ Starts reporting spans to `sink` (any object with an `emit(span)` method). """
+    with _registry_lock:
+        _sinks.append(sink)
+
+
+def remove_sink(sink) -> None:
+    with _registry_lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def enabled() -> bool:
+    return bool(_sinks)
+
+
+@contextmanager
+def capture(sink=None, track_memory: bool = False) -> Iterator[Any]:
+    """ Reports spans to `sink` (a new `CollectorSink` by default) inside the block.
+
+        With `track_memory`, `tracemalloc` is started for the block (unless it
+        already runs) so spans get `peak_bytes`; tracing slows allocation-heavy
+        Python code down, so timings are best read with it off.
+
+    """
+    sink = CollectorSink() if sink is None else sink
+    started = track_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    add_sink(sink)
+    try:
+        yield sink
+    finally:
+        remove_sink(sink)
+        if started:
+            tracemalloc.stop()
+
+
+def instrumented(fn: Callable = None, *, name: str = None) -> Callable:  # type: ignore
+    """ Decorator reporting every call of `fn` as a span named `name` (its qualified name by default). """
+    def decorate(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return fn(*args, **kwargs)
+            return _run_span(span_name, fn, args, kwargs)
+
+        wrapper.__instrumented__ = True  # type: ignore
+        return wrapper
+
+    return decorate(fn) if fn is not None else decorate
+
+
+def not_instrumented(fn: Callable) -> Callable:
+    """ Keeps `instrument_public_methods` from wrapping `fn`. """
+    fn.__instrumented__ = True  # type: ignore
+    return fn
+
+
+def instrument_public_methods(cls: type) -> type:
+    """ Class decorator applying `instrumented` to `__init__` and every public method of `cls`.
+
+        Class and static methods are wrapped underneath their descriptor, so
+        alternative constructors such as `StatFrame.from_chunks` report spans
+        too.
+
+    """
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith('_') and attr != '__init__':
+            continue
+        if isinstance(value, (staticmethod, classmethod)):
+            if not getattr(value.__func__, '__instrumented__', False):
+                setattr(cls, attr, type(value)(instrumented(value.__func__)))
+            continue
+        if not callable(value) or isinstance(value, type):
+            continue
+        if not getattr(value, '__instrumented__', False):
+            setattr(cls, attr, instrumented(value))
+    return cls
+
+
+def _frame_of(owner) -> Any:
+    """ The StatFrame a call works on: the owner itself, or the one an analyzer or plotter wraps. """
+    if owner is None:
+        return None
+    if hasattr(owner, '_cached_stats') and hasattr(owner, '_n_rows'):
+        return owner
+    frame = getattr(owner, 'da', None)
+    return frame if hasattr(frame, '_cached_stats') else None
+
+
+def _measure(span: Span, frame, rows_field: str) -> None:
+    try:
+        setattr(span, rows_field, frame._n_rows())
+        span.columns = frame._data.shape[1]
+        span.frame_id = id(frame)
+    except AttributeError:
+        # a StatFrame still being constructed
+        pass
+
+
+def _run_span(name: str, fn: Callable, args: tuple, kwargs: dict) -> Any:
+    parents = _stack.get()
+    span = Span(name, len(parents))
+    owner = args[0] if args else None
+
+    frame = _frame_of(owner)
+    cache = getattr(frame, '_cached_stats', None)
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    if frame is not None:
+        _measure(span, frame, 'rows')
+
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if parents:
+            parents[-1]._peak = max(parents[-1]._peak, peak)
+        tracemalloc.reset_peak()
+        span._base = span._peak = current
+
+    token = _stack.set(parents + (span,))
+    start = time.perf_counter()
+    result = None
+    try:
+        result = fn(*args, **kwargs)
+        return result
+    except BaseException as e:
+        span.error = type(e).__name__
+        raise
+    finally:
+        span.duration = time.perf_counter() - start
+        _stack.reset(token)
+
+        if tracing and tracemalloc.is_tracing():
+            span._peak = max(span._peak, tracemalloc.get_traced_memory()[1])
+            span.peak_bytes = span._peak - span._base
+            if parents:
+                parents[-1]._peak = max(parents[-1]._peak, span._peak)
+
+        frame = _frame_of(owner)
+        if frame is None and isinstance(owner, type):
+            # a class method: describe the StatFrame it built, if any
+            frame = _frame_of(result)
+        if frame is not None:
+            _measure(span, frame, 'rows_out')
+            if cache is not None:
+                span.cache_hits = cache.hits - hits
+                span.cache_misses = cache.misses - misses
+
+        for sink in list(_sinks):
+            sink.emit(span)
@@ -0,0 +1,29 @@
+"""
+
+mindhunter.lazy
+PEP 562 attribute loading for the package `__init__`s.
+
+"""
+from importlib import import_module
+from typing import Callable
+
+
+def attach(package: str, attributes: dict[str, str],
+           namespace: dict) -> tuple[Callable[[str], object], Callable[[], list[str]]]:
+    """ `(__getattr__, __dir__)` for `package` that import `attributes` (name -> relative module) on first use.
+
+        Loaded attributes are stored in `namespace` (the package's globals),
+        so every later access is a plain lookup.
+
+    """
+    def __getattr__(name: str):
+        if name not in attributes:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(attributes[name], package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
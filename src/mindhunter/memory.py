@@ -0,0 +1,146 @@
+"""
+
+mindhunter.memory
+Lossless dtype compaction behind `StatFrame(compact=True)` and `StatFrame.compact()`.
+
+"""
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_CARDINALITY = 0.5
+
+_SIGNED = (np.int8, np.int16, np.int32, np.int64)
+_UNSIGNED = (np.uint8, np.uint16, np.uint32, np.uint64)
+_NULLABLE = {
+    np.int8: pd.Int8Dtype(), np.int16: pd.Int16Dtype(), np.int32: pd.Int32Dtype(), np.int64: pd.Int64Dtype(),
+    np.uint8: pd.UInt8Dtype(), np.uint16: pd.UInt16Dtype(), np.uint32: pd.UInt32Dtype(), np.uint64: pd.UInt64Dtype(),
+}
+
+
+def copy_on_write() -> bool:
+    """ Whether pandas copies shared columns when they are written to: always from pandas 3, opt-in before. """
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+
+def arrow_strings() -> pd.StringDtype | None:
+    """ Arrow-backed string dtype with NaN for missing values, or None without pyarrow. """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    return pd.StringDtype('pyarrow', na_value=np.nan)
+
+
+def smallest_integer(low, high, unsigned: bool) -> type:
+    """ Narrowest NumPy integer type of the same signedness that holds `low..high`. """
+    for candidate in (_UNSIGNED if unsigned else _SIGNED):
+        info = np.iinfo(candidate)
+        if info.min <= low and high <= info.max:
+            return candidate
+    return np.uint64 if unsigned else np.int64
+
+
+def compact_column(series: pd.Series, max_cardinality: float = DEFAULT_MAX_CARDINALITY):
+    """ A narrower, value-for-value identical array of `series`' values, or None if it can't shrink.
+
+        - integers (NumPy or nullable) go to the narrowest type of the same
+          signedness that holds their range;
+        - float64 columns of whole numbers without missing values become
+          integers, and other float64 columns become float32 if every value
+          survives the round trip exactly;
+        - text columns with at most `max_cardinality * len(series)` distinct
+          values become categoricals (categories sorted, as `astype('category')`
+          does); other columns of Python strings move to Arrow-backed strings
+          when pyarrow is installed.
+
+    """
+    dtype = series.dtype
+    if len(series) == 0:
+        return None
+
+    if pd.api.types.is_bool_dtype(dtype):
+        return None
+
+    if pd.api.types.is_integer_dtype(dtype):
+        low, high = series.min(), series.max()
+        if pd.isna(low):
+            return None
+        target = smallest_integer(low, high, pd.api.types.is_unsigned_integer_dtype(dtype))
+        if isinstance(dtype, pd.ArrowDtype):
+            import pyarrow as pa
+            target = pd.ArrowDtype(pa.from_numpy_dtype(target))
+            return series.array.astype(target) if target != dtype else None
+        if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            target = _NULLABLE[target]
+            return series.array.astype(target) if target != dtype else None
+        return series.to_numpy().astype(target) if np.dtype(target) != dtype else None
+
+    if dtype == np.float64:
+        values = series.to_numpy()
+        if not np.isnan(values).any() and np.isfinite(values).all() and (values == np.round(values)).all():
+            low, high = values.min(), values.max()
+            if np.iinfo(np.int64).min < low and high < np.iinfo(np.int64).max:
+                target = smallest_integer(low, high, unsigned=False)
+                converted = values.astype(target)
+                if (converted == values).all():
+                    return converted
+        narrow = values.astype(np.float32)
+        if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+            return narrow
+        return None
+
+    if dtype == object or pd.api.types.is_string_dtype(dtype):
+        try:
+            codes, categories = pd.factorize(series, sort=True)
+        except TypeError:
+            # values that can't be sorted against each other
+            return None
+        if len(categories) <= max_cardinality * len(series):
+            return pd.Categorical.from_codes(codes, categories=categories)
+        strings = arrow_strings()
+        if dtype == object and strings is not None and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+            return series.array.astype(strings)
+    return None
+
+
+def compact_frame(df: pd.DataFrame, copy: Literal['always', 'on_write', 'never'] = 'always',
+                  max_cardinality: float = DEFAULT_MAX_CARDINALITY) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """ `(frame, report)`: `df` with every column narrowed by `compact_column`.
+
+        Narrowed columns are new arrays either way. The others are deep copies
+        with `copy='always'` and shared with `df` otherwise; with 'never' the
+        narrowed columns replace those of `df` itself. `report` has one row
+        per column with its dtype and bytes before and after.
+
+    """
+    frame = df if copy == 'never' else df.copy(deep=False)
+    records = []
+    for position, col in enumerate(df.columns):
+        series = df.iloc[:, position]
+        before = series.memory_usage(index=False, deep=True)
+        compacted = compact_column(series, max_cardinality)
+        if compacted is not None:
+            frame.isetitem(position, compacted)
+            after = frame.iloc[:, position].memory_usage(index=False, deep=True)
+        else:
+            if copy == 'always':
+                frame.isetitem(position, series.array.copy())
+            after = before
+        records.append({
+            'column': col,
+            'dtype_before': str(series.dtype),
+            'dtype_after': str(frame.iloc[:, position].dtype),
+            'bytes_before': before,
+            'bytes_after': after,
+            'bytes_saved': before - after,
+        })
+
+    if copy == 'always':
+        frame.index = df.index.copy()
+    report = pd.DataFrame(records, columns=['column', 'dtype_before', 'dtype_after',
+                                            'bytes_before', 'bytes_after', 'bytes_saved'])
+    return frame, report.set_index('column')
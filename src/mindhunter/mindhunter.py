@@ -1,116 +1,761 @@
 import pandas as pd
 import numpy as np
-import re
+import os
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Literal
 
+from .cache import StatsCache
+from .cleaning import clean_masks, normalize_columns
+from .engine import DEFAULT_BLOCK_BYTES, block_width, column_values, numeric_columns
+from .grouping import GroupedStatFrame
+from .instrumentation import CollectorSink, capture, instrument_public_methods, instrumented, not_instrumented
+from .memory import DEFAULT_MAX_CARDINALITY, compact_frame, copy_on_write
+from .outliers import DEFAULT_THRESHOLDS, RULE_METRICS, RULES, OutlierMasks, fences
+from .parallel import ExecutionBackend
+from .persistence import StatsStore, column_fingerprint, fingerprint
+from .regression import OLSFit, complete_rows, least_squares
+from .streaming import RollingStats, StreamingStats, stream_stats
+from .zeros import DEFAULT_TOLERANCES, ZeroProfile
+
+COPY_MODES = ('always', 'on_write', 'never')
+
+@instrument_public_methods
 class StatFrame:
-    def __init__(self, df: pd.DataFrame, precalc_data: bool = True):
-        self._df = df.copy()
-        self._cached_stats = {}
-        self.df_stats = self.df.describe()
+    def __init__(self, df: pd.DataFrame, precalc_data: bool = False,
+                 backend: Literal['serial', 'threads', 'processes'] = 'serial',
+                 n_workers: int = None, partition_rows: int = None,  # type: ignore
+                 copy: Literal['always', 'on_write', 'never'] = 'always',
+                 stats_cache: str | os.PathLike | StatsStore = None,  # type: ignore
+                 compact: bool = False):
+        """ Wraps `df` in a StatFrame.
+
+            `copy` controls who owns the data:
+                - 'always': work on a private deep copy of `df` (the default).
+                - 'on_write': share `df`'s buffers through a shallow copy; pandas'
+                  copy-on-write (the default from pandas 3.0) only copies a column
+                  when one side writes to it, so `df` itself is never modified.
+                  On older pandas without `mode.copy_on_write` enabled, sharing is
+                  unsafe and this falls back to 'always'.
+                - 'never': work on `df` itself; in-place changes such as the
+                  column rename in `clean_df()` are visible to the caller.
+
+            Row removals (`clean_df`, `remove_exact_zeros`, `remove_near_zeros`)
+            never copy the frame: they only update a boolean row selection that
+            cached stats are computed through. The filtered frame is built once,
+            the next time `df` is read or `materialize()` is called.
+
+            `stats_cache` is a directory (or a `StatsStore`) shared by every
+            process working on the same data. Stats saved there for identical
+            contents (see `persistence.fingerprint`) are loaded instead of
+            recomputed, and fully computed stats are saved back.
+
+            With `compact=True`, columns are stored in the narrowest dtype that
+            holds their values exactly (see `compact()`), and narrowed columns
+            are never copied a second time. `memory_report` lists the bytes
+            saved per column.
+
+        """
+        if copy not in COPY_MODES:
+            raise ValueError(f"Unknown copy mode: {copy}. Expected one of {COPY_MODES}")
+        if copy == 'on_write' and not copy_on_write():
+            copy = 'always'
+        self.memory_report: pd.DataFrame = None  # type: ignore
+        if compact:
+            self._data, self.memory_report = compact_frame(df, copy=copy)
+        else:
+            match copy:
+                case 'always':
+                    self._data = df.copy()
+                case 'on_write':
+                    self._data = df.copy(deep=False)
+                case 'never':
+                    self._data = df
+        self._copy_mode = copy
+        self._row_mask: np.ndarray = None  # type: ignore
+        self._positions: np.ndarray = None  # type: ignore
+        self._reset_mask: np.ndarray = None  # type: ignore
+        self._rolling: RollingStats = None  # type: ignore
+        self._seed_stats: StreamingStats = None  # type: ignore
+        self._backend = ExecutionBackend(backend, n_workers=n_workers, partition_rows=partition_rows)
+        self._cached_stats = StatsCache(self)
+        self._groupings: dict[tuple, GroupedStatFrame] = {}
+        self._zero_profiles: dict[tuple, ZeroProfile] = {}
+        self._outlier_masks: dict[tuple, OutlierMasks] = {}
+        self._ols_fits: dict[tuple, OLSFit] = {}
+        self._column_fingerprints: dict[str, str] = {}
+        # distribution fits keyed by column fingerprint, so they outlive changes that leave a column as it was
+        self._fits: dict[tuple, dict] = {}
+        self._df_stats = None
+        self._saved_state: tuple = None  # type: ignore
+        self._store = StatsStore(stats_cache) if isinstance(stats_cache, (str, os.PathLike)) else stats_cache
         self.df_columns = self.df.columns.to_list()
+        if self._store is not None:
+            self._load_stats()
         if precalc_data == True:
             self._compute_essential_stats()
     
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], sketch_error: float = 0.01,
+                    mode_capacity: int = 1024) -> 'StatFrame':
+        """ Builds a StatFrame's cached stats from DataFrame chunks in one streaming pass.
+
+            Only one chunk is held in memory at a time, and the returned StatFrame
+            keeps the schema (an empty `df`) plus the fully populated stats cache.
+            Counts, missing values, min/max, mean, std, variance, skewness and
+            kurtosis are exact; median, q1, q3, IQR and MAD come from a quantile
+            sketch with normalized rank error around `sketch_error`, and the mode
+            is exact while a column has at most `mode_capacity` distinct values.
+
+        """
+        stream, schema = stream_stats(chunks, sketch_error=sketch_error,
+                                      mode_capacity=mode_capacity)
+        sf = cls(schema)
+        sf._cached_stats.store(stream.results())
+        sf._seed_stats = stream
+        return sf
+
+    @classmethod
+    def stream_csv(cls, path, chunksize: int = 1_000_000, sketch_error: float = 0.01,
+                   mode_capacity: int = 1024, **read_csv_kwargs) -> 'StatFrame':
+        """ `from_chunks` over `pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs)`. """
+        with pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs) as reader:
+            return cls.from_chunks(reader, sketch_error=sketch_error, mode_capacity=mode_capacity)
+
+    @classmethod
+    def stream_parquet(cls, path, columns: list[str] = None, sketch_error: float = 0.01,  # type: ignore
+                       mode_capacity: int = 1024) -> 'StatFrame':
+        """ `from_chunks` over the row groups of a Parquet file. Requires `pyarrow`. """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("stream_parquet requires pyarrow: pip install mindhunter[arrow]") from e
+
+        parquet_file = pq.ParquetFile(path)
+        chunks = (parquet_file.read_row_group(i, columns=columns).to_pandas()
+                  for i in range(parquet_file.num_row_groups))
+        return cls.from_chunks(chunks, sketch_error=sketch_error, mode_capacity=mode_capacity)
+
+    @classmethod
+    def from_arrow(cls, data, columns: list[str] = None, filter=None, **kwargs) -> 'StatFrame':  # type: ignore
+        """ Wraps an Arrow table in a StatFrame without copying its buffers. Requires `pyarrow`.
+
+            `data` is a `pyarrow.Table` or `RecordBatch`, or anything exporting
+            the Arrow C stream interface (a Polars DataFrame, for example).
+            Only `columns` are kept, and only rows matching `filter` (a
+            `pyarrow.compute.Expression` or boolean mask) when given. Columns
+            become `pd.ArrowDtype` columns backed by the original buffers, and
+            `copy` defaults to 'on_write' so `__init__` doesn't copy them
+            either; stats read them through zero-copy NumPy views where a chunk
+            has no nulls and Arrow compute kernels otherwise.
+            Other `kwargs` go to `StatFrame()`.
+
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("from_arrow requires pyarrow: pip install mindhunter[arrow]") from e
+
+        table = data if isinstance(data, pa.Table) else pa.table(data)
+        if columns is not None:
+            table = table.select(columns)
+        if filter is not None:
+            table = table.filter(filter)
+        kwargs.setdefault('copy', 'on_write')
+        return cls(table.to_pandas(types_mapper=pd.ArrowDtype), **kwargs)
+
+    @classmethod
+    def read_parquet(cls, path, columns: list[str] = None, filters=None, **kwargs) -> 'StatFrame':  # type: ignore
+        """ `from_arrow` over a Parquet file or dataset, reading only what is needed. Requires `pyarrow`.
+
+            `columns` are projected and `filters` (DNF tuples such as
+            `[('year', '>=', 2020)]` or a `pyarrow.compute.Expression`) are
+            pushed down to the reader, which skips row groups whose statistics
+            rule them out. For files larger than memory, see `stream_parquet`.
+
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("read_parquet requires pyarrow: pip install mindhunter[arrow]") from e
+
+        return cls.from_arrow(pq.read_table(path, columns=columns, filters=filters), **kwargs)
+
     @property
     def df(self) -> pd.DataFrame:
         return self._df
 
-    def update(self):
-        self._compute_essential_stats()
+    @property
+    def _df(self) -> pd.DataFrame:
+        self.materialize()
+        return self._data
+
+    @_df.setter
+    def _df(self, df: pd.DataFrame) -> None:
+        self._end_rolling()
+        self._data = df
+        self._clear_row_mask()
+        self._clear_views()
+
+    def materialize(self) -> None:
+        """ Builds `df` from the rows still selected after removals (and appended batches). """
+        if self._rolling is not None:
+            self._data = self._rolling.frame()
+        if self._row_mask is None:
+            return
+        data = self._data[self._row_mask]
+        if self._reset_mask is not None:
+            # rows are numbered as they were right after the last removal that reset the index
+            labels = np.cumsum(self._reset_mask)[self._row_mask] - 1
+            if len(labels) == 0 or labels[-1] == len(labels) - 1:
+                data = data.reset_index(drop=True)
+            else:
+                data = data.set_axis(pd.Index(labels), axis=0)
+        self._data = data
+        self._clear_row_mask()
+
+    def _clear_row_mask(self) -> None:
+        self._row_mask = None  # type: ignore
+        self._positions = None  # type: ignore
+        self._reset_mask = None  # type: ignore
+
+    def _source(self) -> pd.DataFrame:
+        """ The underlying frame, without applying pending row removals. """
+        if self._rolling is not None:
+            self._data = self._rolling.frame()
+        return self._data
+
+    def _n_rows(self) -> int:
+        if self._row_mask is not None:
+            return len(self._selected_positions())
+        if self._rolling is not None:
+            return len(self._rolling)
+        return len(self._data)
+
+    def _selected_positions(self) -> np.ndarray:
+        if self._positions is None:
+            self._positions = np.flatnonzero(self._row_mask)
+        return self._positions
+
+    def _drop_rows(self, remove: np.ndarray, reset_index: bool) -> int:
+        """ Deselects the rows flagged in `remove` (a mask over the underlying rows).
+
+            Returns how many of the currently selected rows were removed. With
+            `reset_index`, the rows are renumbered from 0 even when none were.
+        """
+        self._end_rolling()
+        keep = ~remove if self._row_mask is None else self._row_mask & ~remove
+        removed = self._n_rows() - int(keep.sum())
+        if removed:
+            self._row_mask = keep
+            self._positions = None  # type: ignore
+            self._clear_views()
+        if reset_index:
+            if self._row_mask is not None:
+                self._reset_mask = self._row_mask
+            elif not self._data.index.equals(pd.RangeIndex(len(self._data))):
+                self._data = self._data.reset_index(drop=True)
+        return removed
+
+    def append(self, rows: pd.DataFrame) -> dict:
+        """ Appends `rows` and updates the cached stats incrementally.
+
+            Each batch is summarized once, so the cost of an append scales with
+            the batch instead of the history. Counts, missing values, min/max
+            and the moment-based metrics stay exact; median, q1, q3, IQR and
+            MAD come from mergeable quantile sketches from the first append on,
+            until a full `update()`. Rows are only concatenated into `df` when
+            it is read. See `sliding_window()` to bound the history. `rows`
+            must have the same columns as `df`.
+
+        """
+        missing = self._data.columns.difference(rows.columns)
+        extra = rows.columns.difference(self._data.columns)
+        if len(missing) or len(extra):
+            raise ValueError(f"Appended rows must have the same columns as df: "
+                             f"missing {list(missing)}, unexpected {list(extra)}")
+        if self._rolling is None:
+            self.materialize()
+            self._start_rolling()
+        expired = self._rolling.append(rows)
+        self._cached_stats.invalidate()
+        self._clear_views()
+        self._df_stats = None
+
+        return {
+            'method': 'append',
+            'rows_added': len(rows),
+            'rows_expired': expired,
+            'new_length': len(self._rolling)
+        }
+
+    def sliding_window(self, max_rows: int = None, max_age=None,  # type: ignore
+                       time_column: str = None) -> dict:  # type: ignore
+        """ Bounds the rows kept by `append()` to the last `max_rows` and/or to the rows
+            whose `time_column` lies within `max_age` of the newest one.
+
+            Expired rows are retracted from the cached stats without rescanning
+            the window. Rows must be appended in `time_column` order.
+
+        """
+        if max_rows is None and max_age is None:
+            raise ValueError("sliding_window needs max_rows and/or max_age")
+
+        original_length = len(self._df)
+        self._end_rolling()
+        self.materialize()
+        self._start_rolling(max_rows=max_rows, max_age=max_age, time_column=time_column)
+        self._cached_stats.invalidate()
+        self._clear_views()
+        self._df_stats = None
+
+        return {
+            'method': 'sliding_window',
+            'rows_expired': original_length - len(self._rolling),
+            'new_length': len(self._rolling)
+        }
+
+    def _start_rolling(self, **window) -> None:
+        rolling = RollingStats(numeric_columns(self._data),
+                               ignore_index=isinstance(self._data.index, pd.RangeIndex),
+                               **window)
+        seed_stats = self._seed_stats if not rolling.windowed else None
+        rolling.seed(self._data, seed_stats)
+        self._rolling = rolling
+        self._cached_stats.provider = rolling.results
+
+    def _end_rolling(self) -> None:
+        """ Folds appended rows into `df` and goes back to computing stats from the data. """
+        if self._rolling is None:
+            return
+        self._data = self._rolling.frame()
+        self._rolling = None  # type: ignore
+        self._seed_stats = None  # type: ignore
+        self._cached_stats.provider = None
+
+    @property
+    def df_stats(self) -> pd.DataFrame:
+        """ `describe()` of the numeric columns, assembled from the cached stats. """
+        if self._df_stats is None:
+            columns = self._numeric_columns()
+            if not columns:
+                self._df_stats = self._df.describe()
+            else:
+                metrics = ('count', 'mean', 'std', 'min', 'q1', 'median', 'q3', 'max')
+                known = self._cached_stats.gather(columns, metrics)
+                self._df_stats = pd.DataFrame([known[metric] for metric in metrics], columns=columns,
+                                              index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+        return self._df_stats
+
+    def compact(self, max_cardinality: float = DEFAULT_MAX_CARDINALITY) -> pd.DataFrame:
+        """ Stores every column in the narrowest dtype that holds its values exactly.
+
+            Integers shrink to the smallest width of the same signedness,
+            float64 columns of whole numbers become integers and other float64
+            columns become float32 when no value changes. Text columns with at
+            most `max_cardinality * rows` distinct values become categoricals,
+            and other string columns move to Arrow-backed strings when pyarrow
+            is installed. Values are unchanged, so the cached stats (always
+            computed in float64) stay valid.
+
+            Returns the per-column report of dtypes and bytes saved, also kept
+            in `memory_report`.
+        """
+        self._end_rolling()
+        self._data, self.memory_report = compact_frame(self._data, copy='never', max_cardinality=max_cardinality)
+        # dtypes are part of the stats fingerprint
+        self._cached_stats.fingerprint = None  # type: ignore
+        return self.memory_report
+
+    def save_stats(self) -> bool:
+        """ Writes the cached stats to the `stats_cache` store; False if there is nothing to save to.
+
+            Stats that come from appended batches or streamed chunks are
+            approximate and are never saved.
+
+        """
+        if self._store is None or self._rolling is not None or self._seed_stats is not None:
+            return False
+        stats = {col: self._cached_stats.computed(col) for col in self._numeric_columns()}
+        stats = {col: values for col, values in stats.items() if values}
+        state = (self._stats_key(), sum(len(values) for values in stats.values()))
+        if state != self._saved_state:
+            self._store.save(state[0], stats)
+            self._saved_state = state
+        return True
+
+    def _load_stats(self) -> bool:
+        stats = self._store.load(self._stats_key())
+        if stats is None:
+            return False
+        self._cached_stats.store(stats)
+        self._saved_state = (self._stats_key(), sum(len(values) for values in stats.values()))
+        return True
+
+    def _stats_key(self) -> str:
+        if self._cached_stats.fingerprint is None:
+            self._cached_stats.fingerprint = fingerprint(self)
+        return self._cached_stats.fingerprint
+
+    def update(self, *columns: str) -> None:
+        """ Recomputes cached stats for `columns`, or for every column if none are given.
+
+            Call it after modifying `df` directly; StatFrame's own mutating methods
+            keep the cache in sync by themselves.
+
+        """
+        self._invalidate(*columns)
+        self._cached_stats.materialize(list(columns) if columns else None)
+        self.save_stats()
     
-    def clean_df(self, *chars_to_remove) -> None:
-        if chars_to_remove:
-            escaped_chars = ''.join(re.escape(char) for char in chars_to_remove)
-            pattern = f"[{escaped_chars}]"
+    def clean_df(self, *chars_to_remove, subset: list[str] = None) -> dict:  # type: ignore
+        """ Normalizes column names, then drops rows with missing values and duplicate rows.
+
+            Column names are lowercased, with `chars_to_remove` (any non-word
+            character by default) and spaces replaced by '_'. Duplicates are
+            judged on the `subset` columns (old or new names; every column by
+            default) among the rows left after dropping missing values, keeping
+            the first occurrence. Both masks come from one pass per column
+            (see `cleaning.clean_masks`), and the metrics already cached are
+            recomputed for the surviving rows in one batch.
+
+        """
+        self._end_rolling()
+        normalized_columns = list(normalize_columns(tuple(self._data.columns), chars_to_remove))
+        renames = dict(zip(self._data.columns, normalized_columns))
+        if subset is not None:
+            subset = [renames.get(col, col) for col in subset]
+            for col in subset:
+                if col not in normalized_columns:
+                    raise ValueError(f"Column '{col}' not found")
+
+        self._cached_stats.rename(renames)
+        if self._copy_mode == 'on_write':
+            self._data = self._data.set_axis(normalized_columns, axis=1)
         else:
-            pattern = r"[^\w\s]"
+            self._data.columns = normalized_columns
+        self._clear_views()
+        self._df_stats = None
+
+        selected = self._row_mask
+        incomplete, duplicated = clean_masks(self._data, subset, selected)
+        if selected is not None:
+            incomplete &= selected
+        rows_with_nan = int(incomplete.sum())
+        rows_removed = self._drop_rows(incomplete | duplicated, reset_index=False)
+        if rows_removed:
+            self._cached_stats.refresh()
+            self._df_stats = None
+            self.save_stats()
+
+        return {
+            'method': 'clean_df',
+            'columns_renamed': sum(old != new for old, new in renames.items()),
+            'rows_with_nan': rows_with_nan,
+            'duplicate_rows': rows_removed - rows_with_nan,
+            'rows_removed': rows_removed,
+            'new_length': self._n_rows()
+        }
+
+    def zero_profile(self, columns: list[str] = None,  # type: ignore
+                     tolerances: Iterable[float] = DEFAULT_TOLERANCES) -> ZeroProfile:
+        """ Exact-zero and near-zero counts of `columns` (all numeric columns by default).
+
+            One scan over the columns, through the execution backend, counts
+            zeros at every tolerance and records which rows hold them. The
+            profile is kept until the data changes, so `analyze_zero_removal()`,
+            `locate_zero_rows()` and the removal methods that follow reuse it
+            instead of scanning again; asking for new tolerances rescans once.
+
+        """
+        columns = self._numeric_columns() if columns is None else list(columns)
+        numeric = set(self._numeric_columns())
+        for col in columns:
+            if col not in numeric:
+                raise ValueError(f"Column '{col}' is not a numeric column")
+
+        key = tuple(columns)
+        profile = self._zero_profiles.get(key)
+        tolerances = {0.0, *(float(tol) for tol in tolerances)}
+        if profile is None or not tolerances.issubset(profile.tolerances):
+            if profile is not None:
+                tolerances |= set(profile.tolerances)
+            tolerances = tuple(sorted(tolerances))
+            if len(tolerances) > np.iinfo(np.uint8).max:
+                raise ValueError(f"At most {np.iinfo(np.uint8).max} tolerances can be profiled at once")
+            n_rows = self._n_rows()
+            counts, row_level = self._backend.zero_profile(columns, n_rows, self._fill_block, tolerances)
+            profile = self._zero_profiles[key] = ZeroProfile(columns, tolerances, counts, row_level)
+        return profile
+
+    def _zero_rows(self, columns: list, tolerance: float) -> np.ndarray:
+        """ Mask over the underlying rows of the selected rows with a zero within `tolerance` in `columns`. """
+        return self._underlying_mask(self.zero_profile(columns, tolerances=(tolerance,)).row_mask(tolerance))
+
+    def _underlying_mask(self, selected: np.ndarray) -> np.ndarray:
+        """ Expands a mask over the selected rows to one over the underlying rows. """
+        if self._row_mask is None:
+            return selected
+        mask = np.zeros(len(self._source()), dtype=bool)
+        mask[self._selected_positions()] = selected
+        return mask
 
-        normalized_columns = [
-            re.sub(pattern, '_', col.lower()).replace(' ', '_')
-            for col in self._df.columns
-        ]
-        
-        self._df.columns = normalized_columns
-        self._df.dropna(inplace=True)
-        self._df.drop_duplicates(inplace=True)
-    
     def locate_zero_rows(self, columns: list[str] = None,  # type: ignore
                     return_indices: bool = False) -> pd.DataFrame | list:
 
-        if columns is None:
-            check_columns = self._df.select_dtypes(include=[np.number]).columns.tolist()
+        # build the filtered frame first, so the profile reads it directly instead of through the row selection
+        data = self._df
+        if columns is None or set(columns).issubset(self._numeric_columns()):
+            zero_mask = self.zero_profile(columns).row_mask()
         else:
-            check_columns = columns
-        
-        zero_mask = (self._df[check_columns] == 0).any(axis=1)
-        zero_rows = self._df[zero_mask]
+            zero_mask = (data[columns] == 0).any(axis=1).to_numpy()
+        zero_rows = data[zero_mask]
         
         if return_indices:
             return zero_rows.index.tolist()
         return zero_rows
     
     def analyze_zero_removal(self) -> pd.DataFrame:
-        numeric_cols = self._df.select_dtypes(include=[np.number]).columns
+        profile = self.zero_profile()
+        n_rows = profile.n_rows
+        zero_counts = profile.counts[0.0]
         
         analysis = []
-        for col in numeric_cols:
-            zero_count = (self._df[col] == 0).sum()
-            zero_pct = (zero_count / len(self._df)) * 100
+        for col, zero_count in zero_counts.items():
+            zero_pct = (zero_count / n_rows) * 100
             
             analysis.append({
                 'column': col,
-                'zero_count': zero_count,
+                'zero_count': int(zero_count),
                 'zero_percentage': f"{zero_pct:.1f}%",
-                'total_rows': len(self._df)
+                'total_rows': n_rows
             })
         
         return pd.DataFrame(analysis)
     
     def remove_exact_zeros(self, update_cache: bool = True) -> dict:
-        numeric_cols = self._df.select_dtypes(include=[np.number]).columns
+        zero_mask = self._zero_rows(self._numeric_columns(), 0.0)
         
-        zero_mask = (self._df[numeric_cols] == 0.0).any(axis=1)
-        
-        original_length = len(self._df)
-        self._df = self._df[~zero_mask].reset_index(drop=True)
+        rows_removed = self._drop_rows(zero_mask, reset_index=True)
         
-        if update_cache:
-            self._cached_stats = {}
-            self._compute_essential_stats()
+        if update_cache and rows_removed:
+            self._invalidate()
         
         return {
             'method': 'exact_zeros',
-            'rows_removed': original_length - len(self._df),
-            'new_length': len(self._df)
+            'rows_removed': rows_removed,
+            'new_length': self._n_rows()
         }
 
     def remove_near_zeros(self, tolerance: float = 1e-10, 
                         columns: list[str] = None, update_cache: bool = True) -> dict: # type: ignore
         if columns is None:
-            columns = self._df.select_dtypes(include=[np.number]).columns.tolist()
+            columns = self._numeric_columns()
         
-        near_zero_mask = (abs(self._df[columns]) <= tolerance).any(axis=1)
+        near_zero_mask = self._zero_rows(columns, tolerance)
         
-        original_length = len(self._df)
-        self._df = self._df[~near_zero_mask].reset_index(drop=True)
+        rows_removed = self._drop_rows(near_zero_mask, reset_index=True)
         
-        if update_cache:
-            self._cached_stats = {}
-            self._compute_essential_stats()
+        if update_cache and rows_removed:
+            self._invalidate()
         
         return {
             'method': 'near_zeros',
             'tolerance_used': tolerance,
-            'rows_removed': original_length - len(self._df),
+            'rows_removed': rows_removed,
             'columns_checked': columns
         }  
     
+    def outliers(self, columns: list[str] = None, rule: str = 'iqr',  # type: ignore
+                 threshold: float = None) -> OutlierMasks:  # type: ignore
+        """ Rows of each of `columns` (all numeric columns by default) outside `rule`'s fences.
+
+            `rule` is 'zscore' (`|x - mean| > threshold * std`, threshold 3 by
+            default), 'iqr' (beyond `threshold` IQRs from the quartiles, 1.5 by
+            default) or 'modified_z' (`0.6745 * |x - median| / mad > threshold`,
+            3.5 by default). The fences come from the cached stats and the scan
+            runs in chunks of rows through the execution backend, keeping one
+            bit per row and column instead of a float copy of the data. The
+            result is kept until the data changes.
+
+        """
+        if rule not in RULES:
+            raise ValueError(f"Unknown rule: {rule}. Expected one of {RULES}")
+        threshold = DEFAULT_THRESHOLDS[rule] if threshold is None else float(threshold)
+        if not threshold >= 0:
+            raise ValueError(f"threshold must be non-negative, got {threshold}")
+        columns = self._numeric_columns() if columns is None else list(columns)
+        numeric = set(self._numeric_columns())
+        for col in columns:
+            if col not in numeric:
+                raise ValueError(f"Column '{col}' is not a numeric column")
+
+        key = (tuple(columns), rule, threshold)
+        masks = self._outlier_masks.get(key)
+        if masks is None:
+            low, high = fences(rule, self._cached_stats.gather(columns, RULE_METRICS[rule]), threshold)
+            n_rows = self._n_rows()
+            bits, counts = self._backend.outliers(columns, n_rows, self._fill_block, low, high)
+            masks = self._outlier_masks[key] = OutlierMasks(columns, rule, threshold, low, high,
+                                                            bits, counts, n_rows)
+        return masks
+
+    def remove_outliers(self, columns: list[str] = None, rule: str = 'iqr',  # type: ignore
+                        threshold: float = None, update_cache: bool = True) -> dict:  # type: ignore
+        """ Drops the rows that `outliers()` flags in any of `columns`. """
+        masks = self.outliers(columns, rule, threshold)
+        rows_removed = self._drop_rows(self._underlying_mask(masks.mask()), reset_index=True)
+
+        if update_cache and rows_removed:
+            self._invalidate()
+
+        return {
+            'method': 'outliers',
+            'rule': masks.rule,
+            'threshold': masks.threshold,
+            'rows_removed': rows_removed,
+            'new_length': self._n_rows()
+        }
+
+    def ols(self, predictors: str | list[str], responses: list[str] = None,  # type: ignore
+            intercept: bool = True, solver: Literal['auto', 'qr', 'cholesky'] = 'auto',
+            block_bytes: int = DEFAULT_BLOCK_BYTES) -> OLSFit:
+        """ Least-squares fits of each of `responses` on the same `predictors`, all at once.
+
+            `responses` default to every other numeric column. Rows with a
+            missing value in any predictor or response are left out of every
+            fit (statsmodels' `missing='drop'`). The design matrix is factored
+            once (see `regression.least_squares`) and responses are read in
+            blocks of about `block_bytes`, so thousands of them cost little
+            more than reading them once. Responses not yet known to be
+            complete from the cached `missing_count` are assumed to be, and
+            the fit is redone without their gaps only if one wasn't. The
+            result is kept until the data changes; `OLSFit.summary()` gives
+            coefficients, standard errors, p-values and R² as one frame.
+
+        """
+        predictors = [predictors] if isinstance(predictors, str) else list(predictors)
+        numeric = self._numeric_columns()
+        if responses is None:
+            responses = [col for col in numeric if col not in predictors]
+        responses = list(responses)
+        available = set(numeric)
+        for col in predictors + responses:
+            if col not in available:
+                raise ValueError(f"Column '{col}' is not a numeric column")
+        if set(predictors) & set(responses):
+            raise ValueError("A column can't be both a predictor and a response")
+
+        key = (tuple(predictors), tuple(responses), intercept, solver)
+        fit = self._ols_fits.get(key)
+        if fit is None:
+            n_rows = self._n_rows()
+            x_center = self._cached_stats.gather(predictors, ('mean',))['mean']
+            gaps = [col for col in responses if self._cached_stats.computed(col).get('missing_count', 0) > 0]
+
+            def solve(gaps: list) -> OLSFit:
+                keep = complete_rows(self._fill_block, predictors + gaps, n_rows, block_bytes)
+                return least_squares(self._fill_block, predictors, responses, n_rows, intercept=intercept,
+                                     solver=solver, keep=keep, x_center=x_center, block_bytes=block_bytes)
+
+            fit = solve(gaps)
+            missed = [col for col, rss in zip(responses, fit.rss) if np.isnan(rss)]
+            if missed:
+                fit = solve(gaps + missed)
+            self._ols_fits[key] = fit
+        return fit
+
     def describe_columns(self, *columns: str) -> pd.DataFrame:
         return self._df[list(columns)].describe() if columns else self._df.describe()
 
     def get_stats(self) -> pd.DataFrame:
-        return pd.DataFrame.from_dict(self._cached_stats)
+        stats = self._cached_stats.to_dict()
+        self.save_stats()
+        return pd.DataFrame.from_dict(stats)
+
+    @not_instrumented
+    @contextmanager
+    def profile(self, track_memory: bool = True) -> Iterator[CollectorSink]:
+        """ Records every call on this StatFrame (and its analyzers and plotters) inside the block.
+
+            Yields a `CollectorSink`; `summary()` gives one row per method with
+            calls, total/mean/max seconds, rows, stats cache hits and misses and
+            peak bytes allocated, and `to_frame()` every span in call order.
+            `track_memory=False` skips `tracemalloc` for lower overhead.
+
+        """
+        with capture(CollectorSink(self), track_memory=track_memory) as sink:
+            yield sink
+
+    def groupby(self, keys: str | list[str], dropna: bool = True) -> GroupedStatFrame:
+        """ Per-group view of the cached stats; see `GroupedStatFrame.get_stats()`.
+
+            All groups are computed together from one partition of the rows
+            instead of one StatFrame per group. The view, its group membership
+            and its stats are reused for the same `keys` until the data changes.
+
+        """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        for key in keys:
+            if key not in self._source().columns:
+                raise ValueError(f"Column '{key}' not found")
+
+        cache_key = (tuple(keys), dropna)
+        if cache_key not in self._groupings:
+            self._groupings[cache_key] = GroupedStatFrame(self, keys, dropna)
+        return self._groupings[cache_key]
+
+    def _clear_views(self) -> None:
+        """ Forgets the group memberships, zero profiles, outlier masks, OLS fits and column fingerprints of the current rows. """
+        self._groupings.clear()
+        self._zero_profiles.clear()
+        self._outlier_masks.clear()
+        self._ols_fits.clear()
+        self._column_fingerprints.clear()
+
+    def _column_fingerprint(self, column: str) -> str:
+        """ `persistence.column_fingerprint` of a column's current values, kept until the data changes. """
+        if column not in self._column_fingerprints:
+            values = self._fill_block([column], 0, self._n_rows())[0]
+            self._column_fingerprints[column] = column_fingerprint(values)
+        return self._column_fingerprints[column]
+
+    def _invalidate(self, *columns: str) -> None:
+        """ Drops cached stats of the columns a mutation touched (all columns if none given). """
+        self._end_rolling()
+        self._cached_stats.invalidate(*columns)
+        self._clear_views()
+        self._df_stats = None
+
+    def _numeric_columns(self) -> list:
+        if self._rolling is not None:
+            return list(self._rolling.columns)
+        return numeric_columns(self._data)
+
+    def _column_blocks(self, columns: list):
+        n_rows = self._n_rows()
+        width = block_width(n_rows)
+        for start in range(0, len(columns), width):
+            cols = columns[start:start + width]
+            yield cols, self._fill_block(cols, 0, n_rows)
+
+    def _fill_block(self, columns: list, start: int, stop: int) -> np.ndarray:
+        """ `(columns, rows)` float64 block of selected rows `start:stop`.
+
+            Reads straight from the underlying frame through the pending row
+            selection, so stats never need the filtered frame to be built.
+        """
+        data = self._source()
+        positions = self._selected_positions()[start:stop] if self._row_mask is not None else None
+        block = np.empty((len(columns), stop - start), dtype=np.float64)
+        for i, col in enumerate(columns):
+            series = data[col]
+            column_values(series.iloc[start:stop] if positions is None else series.iloc[positions], out=block[i])
+        return block
+
+    def _batched_stats(self, columns: list) -> dict[str, dict]:
+        return self._backend.essential_stats(columns, self._n_rows(), self._fill_block)
     
+    @instrumented
     def _compute_essential_stats(self):
 
             """ Compute and cache essential statistical measures.
@@ -147,52 +792,15 @@ class StatFrame:
                 Key Ratios (for standardised measurements):
                     - cv (coefficient of variation)
                     - sem (standard error of mean)
+
+                Every numeric column is processed in column blocks by the batched
+                engine in `mindhunter.engine`, so each column is sorted once
+                instead of being rescanned for every metric. Values are normally
+                computed lazily on first read; this warms the whole cache at once.
             
             """
-            numeric_cols = self._df.select_dtypes(include=[np.number]).columns
-
-            for col in numeric_cols:
-                data = self._df[col].dropna()
-                
-                self._cached_stats[col] = {
-                    'mean': data.mean(),
-                    'median': data.median(),
-                    'mode': data.mode().iloc[0] if not data.mode().empty else np.nan,
-                    
-                    'std': data.std(),
-                    'variance': data.var(),
-                    'range': data.max() - data.min(),
-                    'iqr': data.quantile(0.75) - data.quantile(0.25),
-                    'mad': (data - data.median()).abs().median(),
-                    
-                    'skewness': data.skew(),
-                    'kurtosis': data.kurtosis(),
-                    
-                    'count': len(data),
-                    'missing_count': self._df[col].isna().sum(),
-                    'missing_pct': self._df[col].isna().mean(),
-                    
-                    'min': data.min(),
-                    'max': data.max(),
-                    'q1': data.quantile(0.25),
-                    'q3': data.quantile(0.75),
-                    
-                    'cv': data.std() / data.mean() if data.mean() != 0 else np.inf,
-                    'sem': data.std() / np.sqrt(len(data))
-                }
+            self._cached_stats.materialize()
+            self.save_stats()
 
     def _compute_column_stats(self, column_name: str) -> None:
-        data = self._df[column_name].dropna()
-
-        self._df[column_name] = {
-            'mean': data.mean(),
-            'std': data.std(),
-            'median': data.median(),
-            'count': len(data),
-            'missing_pct': self._df[column_name].isna().mean(),
-            'min': data.min(),
-            'max': data.max(),
-            'cv': data.std() / data.mean() if data.mean() != 0 else np.inf,
-            'sem': data.std() / np.sqrt(len(data)),
-            'skewness': data.skew()
-        }
\ No newline at end of file
+        self._cached_stats.materialize([column_name])
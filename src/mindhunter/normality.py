@@ -0,0 +1,162 @@
+"""
+
+mindhunter.normality
+Normality tests behind `DistributionAnalyzer.normality_report()`.
+
+"""
+import zlib
+
+import numpy as np
+
+NORMALITY_TESTS = ('shapiro', 'dagostino', 'anderson', 'jarque_bera', 'ks')
+# closed-form tests on the cached moments; they never read the data
+MOMENT_TESTS = ('dagostino', 'jarque_bera')
+# largest sample each data-based test runs on; longer columns are subsampled
+SAMPLE_LIMITS = {'shapiro': 5000, 'anderson': 100_000, 'ks': 100_000}
+MIN_SAMPLES = {'shapiro': 3, 'dagostino': 8, 'anderson': 3, 'jarque_bera': 3, 'ks': 3}
+
+
+def biased_moments(n: np.ndarray, skewness: np.ndarray, kurtosis: np.ndarray,
+                   std: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """ `(g1, g2)`, the plain moment skewness and excess kurtosis, from the bias-corrected cached ones.
+
+        Both are NaN for columns without spread, whose cached skewness and
+        kurtosis are 0 rather than undefined, so the moment tests can't pass
+        them as normal.
+
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        g1 = skewness * (n - 2) / np.sqrt(n * (n - 1))
+        g2 = (kurtosis * (n - 2) * (n - 3) / (n - 1) - 6) / (n + 1)
+    flat = ~(std > 0)
+    return np.where(flat, np.nan, g1), np.where(flat, np.nan, g2)
+
+
+def dagostino_k2(n: np.ndarray, g1: np.ndarray, g2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """ D'Agostino-Pearson K² and its p-value, as `scipy.stats.normaltest`, from the moments. """
+    from scipy import special
+
+    n = np.where(n < MIN_SAMPLES['dagostino'], np.nan, n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # skewness test
+        y = g1 * np.sqrt((n + 1) * (n + 3) / (6.0 * (n - 2)))
+        beta2 = 3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3) / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9))
+        w2 = -1 + np.sqrt(2 * (beta2 - 1))
+        delta = 1 / np.sqrt(0.5 * np.log(w2))
+        alpha = np.sqrt(2.0 / (w2 - 1))
+        y = np.where(y == 0, 1.0, y)
+        z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+        # kurtosis test
+        b2 = g2 + 3
+        expected = 3.0 * (n - 1) / (n + 1)
+        variance = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5))
+        x = (b2 - expected) / np.sqrt(variance)
+        sqrt_beta1 = (6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9))
+                      * np.sqrt(6.0 * (n + 3) * (n + 5) / (n * (n - 2) * (n - 3))))
+        a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / sqrt_beta1 ** 2))
+        denom = 1 + x * np.sqrt(2 / (a - 4.0))
+        term2 = np.sign(denom) * np.where(denom == 0.0, np.nan, np.cbrt((1 - 2.0 / a) / np.abs(denom)))
+        z_kurt = (1 - 2 / (9.0 * a) - term2) / np.sqrt(2 / (9.0 * a))
+
+        statistic = z_skew ** 2 + z_kurt ** 2
+    return statistic, special.chdtrc(2, statistic)
+
+
+def jarque_bera(n: np.ndarray, g1: np.ndarray, g2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """ Jarque-Bera statistic and its chi-squared (2 df) p-value, from the moments. """
+    from scipy import special
+
+    n = np.where(n < MIN_SAMPLES['jarque_bera'], np.nan, n)
+    statistic = n / 6 * (g1 ** 2 + g2 ** 2 / 4)
+    return statistic, special.chdtrc(2, statistic)
+
+
+def anderson_p_value(statistic: float, n: int) -> float:
+    """ p-value of the Anderson-Darling normality statistic with estimated mean and std.
+
+        Uses the small-sample adjustment and piecewise fit of D'Agostino and
+        Stephens (1986), table 4.9. The upper branch is a parabola in the
+        statistic, so it is held at its minimum past the vertex instead of
+        growing back towards 1.
+
+    """
+    adjusted = statistic * (1 + 0.75 / n + 2.25 / n ** 2)
+    if adjusted >= 0.6:
+        adjusted = min(adjusted, 5.709 / (2 * 0.0186))
+        return float(np.exp(1.2937 - 5.709 * adjusted + 0.0186 * adjusted ** 2))
+    if adjusted > 0.34:
+        return float(np.exp(0.9177 - 4.279 * adjusted - 1.38 * adjusted ** 2))
+    if adjusted > 0.2:
+        return float(1 - np.exp(-8.318 + 42.796 * adjusted - 59.938 * adjusted ** 2))
+    return float(1 - np.exp(-13.436 + 101.14 * adjusted - 223.73 * adjusted ** 2))
+
+
+def sample(values: np.ndarray, size: int, seed: int, column) -> np.ndarray:
+    """ `size` of `values` drawn without replacement, the same for a given seed and column name.
+
+        The generator is keyed on the column name rather than its position,
+        so a column's sample doesn't depend on which other columns are tested
+        or on how they are split across workers.
+
+    """
+    rng = np.random.default_rng([seed, zlib.crc32(str(column).encode())])
+    return values[rng.choice(len(values), size=size, replace=False)]
+
+
+def normality_kernel(block: np.ndarray, context: tuple) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """ `{test: (statistic, p_value, sample_size)}` of the data-based tests over a `(columns, rows)` block.
+
+        `context` is `(columns, mean, std, tests, limits, seed)`: `mean` and
+        `std` are the cached moments of each column, used whenever a test runs
+        on the whole column, and `limits` the largest sample per test. Columns
+        longer than a test's limit are tested on a seeded subsample (one
+        draw per column, whose prefixes serve the smaller limits), with the
+        moments re-estimated from it.
+
+    """
+    from scipy import special, stats
+
+    columns, mean, std, tests, limits, seed = context
+    results = {test: (np.full(len(columns), np.nan), np.full(len(columns), np.nan),
+                      np.zeros(len(columns), dtype=np.int64)) for test in tests}
+
+    for i, row in enumerate(block):
+        values = row[~np.isnan(row)]
+        n = len(values)
+        sizes = {test: min(n, limits[test]) if limits[test] is not None else n for test in tests}
+        drawn = sample(values, max(sizes.values()), seed, columns[i]) if any(s < n for s in sizes.values()) else values
+
+        sorted_samples: dict[int, tuple[np.ndarray, float, float]] = {}
+        for test in tests:
+            size = sizes[test]
+            results[test][2][i] = size
+            if size < MIN_SAMPLES[test]:
+                continue
+            subset = values if size == n else drawn[:size]
+            if subset.min() == subset.max():
+                # no spread: the statistics are undefined (and Shapiro-Wilk warns)
+                continue
+            if test == 'shapiro':
+                statistic, p_value = stats.shapiro(subset)
+                results[test][0][i], results[test][1][i] = statistic, p_value
+                continue
+
+            if size not in sorted_samples:
+                center, spread = (mean[i], std[i]) if size == n else (subset.mean(), subset.std(ddof=1))
+                sorted_samples[size] = (np.sort(subset), center, spread)
+            ordered, center, spread = sorted_samples[size]
+            if not (np.isfinite(spread) and spread > 0):
+                continue
+            z = (ordered - center) / spread
+
+            if test == 'anderson':
+                weights = 2 * np.arange(1, size + 1) - 1.0
+                statistic = -size - np.sum(weights / size * (special.log_ndtr(z) + special.log_ndtr(-z[::-1])))
+                results[test][0][i], results[test][1][i] = statistic, anderson_p_value(statistic, size)
+            elif test == 'ks':
+                cdf = special.ndtr(z)
+                statistic = max(np.max(np.arange(1, size + 1) / size - cdf), np.max(cdf - np.arange(size) / size))
+                results[test][0][i] = statistic
+                results[test][1][i] = np.clip(stats.kstwo.sf(statistic, size), 0.0, 1.0)
+    return results
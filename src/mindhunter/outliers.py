@@ -0,0 +1,119 @@
+"""
+
+mindhunter.outliers
+Chunked outlier scans behind `StatFrame.outliers()`, with fences taken from the cached stats.
+
+"""
+import numpy as np
+import pandas as pd
+
+RULES = ('zscore', 'iqr', 'modified_z')
+DEFAULT_THRESHOLDS = {'zscore': 3.0, 'iqr': 1.5, 'modified_z': 3.5}
+# cached metrics each rule's fences are built from
+RULE_METRICS = {'zscore': ('mean', 'std'), 'iqr': ('q1', 'q3'), 'modified_z': ('median', 'mad')}
+# rows scanned per chunk; a multiple of 8 so every chunk starts on a byte of the packed masks
+CHUNK_ROWS = 1 << 20
+# 0.75 quantile of the standard normal, scaling the MAD into the modified z-score (Iglewicz & Hoaglin)
+_MAD_SCALE = 0.6745
+
+
+def fences(rule: str, stats: dict[str, np.ndarray], threshold: float) -> tuple[np.ndarray, np.ndarray]:
+    """ `(low, high)` per column: values strictly outside them are outliers under `rule`.
+
+        - 'zscore': `|x - mean| > threshold * std`;
+        - 'iqr': below `q1 - threshold * iqr` or above `q3 + threshold * iqr`;
+        - 'modified_z': `0.6745 * |x - median| / mad > threshold`.
+
+        Columns without values get NaN fences and never have outliers. With
+        a zero spread (std or mad), every value off the center is one.
+
+    """
+    match rule:
+        case 'zscore':
+            spread = threshold * stats['std']
+            return stats['mean'] - spread, stats['mean'] + spread
+        case 'iqr':
+            spread = threshold * (stats['q3'] - stats['q1'])
+            return stats['q1'] - spread, stats['q3'] + spread
+        case 'modified_z':
+            spread = threshold * stats['mad'] / _MAD_SCALE
+            return stats['median'] - spread, stats['median'] + spread
+        case _:
+            raise ValueError(f"Unknown rule: {rule}. Expected one of {RULES}")
+
+
+def outlier_kernel(block: np.ndarray, context: tuple[np.ndarray, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """ `(bits, counts)` of a `(columns, rows)` block against the `(low, high)` fences in `context`.
+
+        `bits` packs one bit per row (little bit order) for every column and
+        `counts` holds how many rows of each column are outside its fences.
+        NaNs are never outliers.
+
+    """
+    low, high = context
+    flagged = np.less(block, low[:, None])
+    flagged |= np.greater(block, high[:, None])
+    return np.packbits(flagged, axis=1, bitorder='little'), np.count_nonzero(flagged, axis=1)
+
+
+def positions(packed: np.ndarray) -> np.ndarray:
+    """ Positions of the set bits of a little-bit-order packed mask, touching only its nonzero bytes. """
+    nonzero = np.flatnonzero(packed)
+    bits = np.unpackbits(packed[nonzero, None], axis=1, bitorder='little')
+    rows, offsets = np.nonzero(bits)
+    return nonzero[rows].astype(np.int64) * 8 + offsets
+
+
+class OutlierMasks:
+    """ Which rows of each column fall outside one rule's fences, kept as packed bits.
+
+        `bits[i]` holds one bit per selected row of `columns[i]`, so the
+        masks of a column take an eighth of a byte per row. `mask()`,
+        `indices()` and `packed()` answer for one column or, with no column,
+        for rows flagged in any of them. Positions refer to rows of the
+        StatFrame's `df`.
+
+    """
+
+    def __init__(self, columns: list, rule: str, threshold: float, low: np.ndarray, high: np.ndarray,
+                 bits: np.ndarray, counts: np.ndarray, n_rows: int):
+        self.columns = list(columns)
+        self.rule = rule
+        self.threshold = threshold
+        self.bits = bits
+        self.n_rows = n_rows
+        self.fences = pd.DataFrame({'low': low, 'high': high}, index=pd.Index(self.columns, name='column'))
+        self.counts = pd.Series(counts, index=self.fences.index, name='outliers')
+
+    def __repr__(self) -> str:
+        return (f"OutlierMasks(rule={self.rule!r}, threshold={self.threshold}, "
+                f"columns={len(self.columns)}, rows={self.n_rows})")
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    def packed(self, column: str = None) -> np.ndarray:  # type: ignore
+        """ Packed bits of `column`, or of rows flagged in any column. """
+        if column is None:
+            return np.bitwise_or.reduce(self.bits, axis=0) if self.columns else np.zeros(0, dtype=np.uint8)
+        if column not in self.fences.index:
+            raise ValueError(f"Column '{column}' was not scanned")
+        return self.bits[self.columns.index(column)]
+
+    def mask(self, column: str = None) -> np.ndarray:  # type: ignore
+        """ Boolean row mask of `column`, or of rows flagged in any column. """
+        if not self.columns:
+            return np.zeros(self.n_rows, dtype=bool)
+        return np.unpackbits(self.packed(column), count=self.n_rows, bitorder='little').view(bool)
+
+    def indices(self, column: str = None) -> np.ndarray:  # type: ignore
+        """ Row positions flagged in `column`, or in any column, in ascending order. """
+        return positions(self.packed(column))
+
+    def summary(self) -> pd.DataFrame:
+        """ Fences, outlier counts and their share of the rows, per column. """
+        summary = self.fences.copy()
+        summary['outliers'] = self.counts
+        summary['outlier_pct'] = self.counts / self.n_rows * 100 if self.n_rows else 0.0
+        return summary
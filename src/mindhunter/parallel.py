@@ -0,0 +1,345 @@
+"""
+
+mindhunter.parallel
+Execution backends that shard StatFrame work by column block and row partition.
+
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_all_start_methods, get_context, shared_memory
+from multiprocessing.context import BaseContext
+from typing import Any, Callable, Literal
+import os
+import weakref
+
+import numpy as np
+
+from .engine import DEFAULT_BLOCK_BYTES, assemble_stats, block_stats
+from .normality import normality_kernel
+from .outliers import CHUNK_ROWS, outlier_kernel
+from .streaming import StreamingStats
+from .zeros import zero_profile_kernel
+
+BACKENDS = ('serial', 'threads', 'processes')
+
+# `fill(columns, start, stop)` returns the `(columns, rows)` float64 block for a task.
+BlockFill = Callable[[list, int, int], np.ndarray]
+
+
+def process_context() -> BaseContext:
+    """ Start method for worker processes; fork() from a threaded parent can deadlock, so avoid it. """
+    return get_context('forkserver' if 'forkserver' in get_all_start_methods() else 'spawn')
+
+
+class ExecutionBackend:
+    """ Runs block-wise work serially, on a thread pool or on a process pool.
+
+        Work is cut into tasks of one column block (sized by `block_bytes`) and,
+        if `partition_rows` is set, one row partition each. The task layout only
+        depends on the data shape and these two settings, never on `n_workers`,
+        and partial results are always merged in task order; every backend and
+        worker count therefore produces bit-for-bit identical results.
+
+        Without row partitions every column is reduced in one piece and the
+        stats are exact. With row partitions, moments and counts still merge
+        exactly while quantile-based metrics merge through `QuantileSketch`es
+        with rank error `sketch_error`.
+
+        Threads suit most workloads since NumPy releases the GIL while sorting
+        and reducing. With processes, each task's block is written once into a
+        `multiprocessing.shared_memory` segment that the worker maps directly,
+        instead of pickling a copy over the pipe.
+
+    """
+
+    def __init__(self, kind: Literal['serial', 'threads', 'processes'] = 'serial',
+                 n_workers: int = None, partition_rows: int = None,  # type: ignore
+                 block_bytes: int = DEFAULT_BLOCK_BYTES, sketch_error: float = 0.01):
+        if kind not in BACKENDS:
+            raise ValueError(f"Unknown backend: {kind}. Expected one of {BACKENDS}")
+        if partition_rows is not None and partition_rows < 1:
+            raise ValueError("partition_rows must be a positive integer")
+
+        self.kind = kind
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.partition_rows = partition_rows
+        self.block_bytes = block_bytes
+        self.sketch_error = sketch_error
+        self._executor: Executor = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return (f"ExecutionBackend(kind={self.kind!r}, n_workers={self.n_workers}, "
+                f"partition_rows={self.partition_rows})")
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None  # type: ignore
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.kind == 'threads':
+                self._executor = ThreadPoolExecutor(self.n_workers)
+            else:
+                self._executor = ProcessPoolExecutor(self.n_workers, mp_context=process_context())
+            weakref.finalize(self, self._executor.shutdown)
+        return self._executor
+
+    def tasks(self, columns: list, n_rows: int, rows: int = None) -> list[tuple[list, int, int]]:  # type: ignore
+        """ `(columns, start, stop)` for every column block and row partition (of `rows` rows if given). """
+        rows = rows or self.partition_rows or max(n_rows, 1)
+        width = max(1, self.block_bytes // (min(rows, max(n_rows, 1)) * 8))
+        return [
+            (columns[c:c + width], start, min(start + rows, n_rows))
+            for c in range(0, len(columns), width)
+            for start in range(0, max(n_rows, 1), rows)
+        ]
+
+    def map(self, fn: Callable[[np.ndarray, Any], Any], columns: list, n_rows: int,
+            fill: BlockFill, context: Callable[[list], Any] = None,  # type: ignore
+            writeback: bool = False, rows: int = None) -> list[tuple[tuple[list, int, int], Any]]:  # type: ignore
+        """ Applies `fn(block, context(cols))` to every task's block, in task order.
+
+            `fn` must be a module-level function so process workers can import
+            it. With `writeback=True`, `fn` works in place and the (modified)
+            block is returned instead of `fn`'s result. `rows` overrides the
+            row partitioning for this call.
+
+        """
+        tasks = self.tasks(columns, n_rows, rows)
+
+        def task_context(cols: list) -> Any:
+            return context(cols) if context is not None else None
+
+        if self.kind == 'serial':
+            return [(task, _run_local(fn, fill, task, task_context(task[0]), writeback))
+                    for task in tasks]
+
+        if self.kind == 'threads':
+            futures = [self._pool().submit(_run_local, fn, fill, task, task_context(task[0]), writeback)
+                       for task in tasks]
+            return [(task, future.result()) for task, future in zip(tasks, futures)]
+
+        results = []
+        wave = 2 * self.n_workers
+        for start in range(0, len(tasks), wave):
+            results.extend(self._run_shared(fn, fill, tasks[start:start + wave], task_context, writeback))
+        return results
+
+    def _run_shared(self, fn, fill: BlockFill, tasks: list, task_context, writeback: bool) -> list:
+        segments, futures = [], []
+        try:
+            for cols, start, stop in tasks:
+                shape = (len(cols), stop - start)
+                shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+                segments.append(shm)
+                np.ndarray(shape, dtype=np.float64, buffer=shm.buf)[:] = fill(cols, start, stop)
+                futures.append(self._pool().submit(_run_shared_task, fn, shm.name, shape,
+                                                   task_context(cols), writeback))
+
+            results = []
+            for task, shm, future in zip(tasks, segments, futures):
+                result = future.result()
+                if writeback:
+                    shape = (len(task[0]), task[2] - task[1])
+                    result = np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+                results.append((task, result))
+            return results
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+
+    def map_shared(self, fn: Callable[[np.ndarray, Any], Any], data: np.ndarray,
+                   payloads: list) -> list:
+        """ `[fn(data, payload) for payload in payloads]`, fanned out over the backend.
+
+            `data` is shared read-only: process workers map it from a single
+            `multiprocessing.shared_memory` segment instead of receiving a
+            pickled copy with every payload. Results come back in payload order.
+
+        """
+        if self.kind == 'serial':
+            return [fn(data, payload) for payload in payloads]
+
+        if self.kind == 'threads':
+            futures = [self._pool().submit(fn, data, payload) for payload in payloads]
+            return [future.result() for future in futures]
+
+        shm = shared_memory.SharedMemory(create=True, size=max(1, data.nbytes))
+        try:
+            np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)[:] = data
+            futures = [self._pool().submit(_run_on_shared, fn, shm.name, data.shape, data.dtype.str, payload)
+                       for payload in payloads]
+            return [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def essential_stats(self, columns: list, n_rows: int, fill: BlockFill) -> dict[str, dict]:
+        """ Every cached metric for `columns`, merged across row partitions. """
+        if not columns:
+            return {}
+        if self.partition_rows is None or self.partition_rows >= n_rows:
+            stats = {}
+            for (cols, _, _), metrics in self.map(_block_stats_task, columns, n_rows, fill):
+                stats.update(assemble_stats(cols, metrics))
+            return stats
+
+        merged: dict[tuple, StreamingStats] = {}
+        partials = self.map(_partial_stats_task, columns, n_rows, fill,
+                            context=lambda cols: (cols, self.sketch_error))
+        for (cols, _, _), partial in partials:
+            key = tuple(cols)
+            merged[key] = merged[key].merge(partial) if key in merged else partial
+
+        stats = {}
+        for partial in merged.values():
+            stats.update(partial.results())
+        return stats
+
+    def zero_profile(self, columns: list, n_rows: int, fill: BlockFill,
+                     tolerances: tuple = (0.0,)) -> tuple[np.ndarray, np.ndarray]:
+        """ `(counts, row_level)` of `zeros.zero_profile_kernel` for `columns`, merged across blocks.
+
+            `counts[i, j]` is the number of rows with `|value| <= tolerances[j]`
+            in `columns[i]`, and `row_level` the position of the smallest
+            tolerance any value of each row is within.
+
+        """
+        counts = np.zeros((len(columns), len(tolerances)), dtype=np.int64)
+        row_level = np.full(n_rows, len(tolerances), dtype=np.uint8)
+        if not columns:
+            return counts, row_level
+        position = {col: i for i, col in enumerate(columns)}
+        for (cols, start, stop), (partial, level) in self.map(_zero_profile_task, columns, n_rows, fill,
+                                                              context=lambda cols: tuple(tolerances)):
+            counts[[position[c] for c in cols]] += partial
+            np.minimum(row_level[start:stop], level, out=row_level[start:stop])
+        return counts, row_level
+
+    def z_scores(self, columns: list, n_rows: int, fill: BlockFill,
+                 mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+        """ `(x - mean) / std` for each of `columns`, as a `(rows, columns)` array. """
+        out = np.empty((n_rows, len(columns)), dtype=np.float64)
+        position = {col: i for i, col in enumerate(columns)}
+        moments = {col: (m, s) for col, m, s in zip(columns, mean, std)}
+
+        def context(cols: list) -> tuple[np.ndarray, np.ndarray]:
+            return (np.array([moments[c][0] for c in cols]), np.array([moments[c][1] for c in cols]))
+
+        for (cols, start, stop), block in self.map(_z_score_task, columns, n_rows, fill,
+                                                   context=context, writeback=True):
+            out[start:stop, [position[c] for c in cols]] = block.T
+        return out
+
+    def outliers(self, columns: list, n_rows: int, fill: BlockFill, low: np.ndarray, high: np.ndarray,
+                 chunk_rows: int = CHUNK_ROWS) -> tuple[np.ndarray, np.ndarray]:
+        """ `(bits, counts)` of `outliers.outlier_kernel` for `columns`, assembled across chunks.
+
+            Rows are always scanned in chunks (of `partition_rows` if set,
+            `chunk_rows` otherwise, rounded down to a multiple of 8), so only
+            one block per worker and the packed `(columns, ceil(rows / 8))`
+            result are ever held, whatever the number of rows.
+
+        """
+        bits = np.zeros((len(columns), (n_rows + 7) // 8), dtype=np.uint8)
+        counts = np.zeros(len(columns), dtype=np.int64)
+        if not columns or not n_rows:
+            return bits, counts
+        position = {col: i for i, col in enumerate(columns)}
+        bounds = {col: (lo, hi) for col, lo, hi in zip(columns, low, high)}
+
+        def context(cols: list) -> tuple[np.ndarray, np.ndarray]:
+            return (np.array([bounds[c][0] for c in cols]), np.array([bounds[c][1] for c in cols]))
+
+        rows = max(8, (self.partition_rows or chunk_rows) // 8 * 8)
+        for (cols, start, _), (packed, partial) in self.map(_outlier_task, columns, n_rows, fill,
+                                                            context=context, rows=rows):
+            index = [position[c] for c in cols]
+            bits[index, start // 8:start // 8 + packed.shape[1]] = packed
+            counts[index] += partial
+        return bits, counts
+
+    def normality(self, columns: list, n_rows: int, fill: BlockFill, mean: np.ndarray, std: np.ndarray,
+                  tests: tuple, limits: dict, seed: int) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """ `{test: (statistic, p_value, sample_size)}` of `normality.normality_kernel` for `columns`.
+
+            Every task holds whole columns (the tests sort or sample them), so
+            the work is only split by column block.
+
+        """
+        results = {test: (np.full(len(columns), np.nan), np.full(len(columns), np.nan),
+                          np.zeros(len(columns), dtype=np.int64)) for test in tests}
+        if not columns or not tests:
+            return results
+        position = {col: i for i, col in enumerate(columns)}
+
+        def context(cols: list) -> tuple:
+            index = [position[c] for c in cols]
+            return (list(cols), mean[index], std[index], tests, limits, seed)
+
+        for (cols, _, _), partial in self.map(_normality_task, columns, n_rows, fill,
+                                              context=context, rows=max(n_rows, 1)):
+            index = [position[c] for c in cols]
+            for test, arrays in partial.items():
+                for target, values in zip(results[test], arrays):
+                    target[index] = values
+        return results
+
+
+def _run_local(fn, fill: BlockFill, task: tuple, context: Any, writeback: bool) -> Any:
+    cols, start, stop = task
+    block = fill(cols, start, stop)
+    result = fn(block, context)
+    return block if writeback else result
+
+
+def _run_shared_task(fn, name: str, shape: tuple, context: Any, writeback: bool) -> Any:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        result = fn(block, context)
+        del block
+        return None if writeback else result
+    finally:
+        shm.close()
+
+
+def _run_on_shared(fn, name: str, shape: tuple, dtype: str, payload: Any) -> Any:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        data.flags.writeable = False
+        result = fn(data, payload)
+        del data
+        return result
+    finally:
+        shm.close()
+
+
+def _block_stats_task(block: np.ndarray, context: Any) -> dict[str, np.ndarray]:
+    return block_stats(block)
+
+
+def _partial_stats_task(block: np.ndarray, context: tuple) -> StreamingStats:
+    columns, sketch_error = context
+    return StreamingStats(list(columns), sketch_error=sketch_error).update_block(block)
+
+
+def _zero_profile_task(block: np.ndarray, tolerances: tuple) -> tuple[np.ndarray, np.ndarray]:
+    return zero_profile_kernel(block, tolerances)
+
+
+def _z_score_task(block: np.ndarray, context: tuple) -> None:
+    mean, std = context
+    np.subtract(block, mean[:, None], out=block)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        np.divide(block, std[:, None], out=block)
+
+
+def _outlier_task(block: np.ndarray, context: tuple) -> tuple[np.ndarray, np.ndarray]:
+    return outlier_kernel(block, context)
+
+
+def _normality_task(block: np.ndarray, context: tuple) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    return normality_kernel(block, context)
@@ -0,0 +1,110 @@
+"""
+
+mindhunter.persistence
+On-disk stats cache shared by StatFrames built on the same data.
+
+"""
+from pathlib import Path
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+
+
+def fingerprint(sf) -> str:
+    """ Content hash of what a StatFrame's stats depend on.
+
+        Covers every column name and dtype, the number of rows and the
+        float64 values of each numeric column (through pending row removals),
+        hashed straight from their buffers with BLAKE2b.
+
+    """
+    data = sf._source()
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in data.dtypes.items()]).encode())
+    n_rows = sf._n_rows()
+    digest.update(str(n_rows).encode())
+    for col in sf._numeric_columns():
+        digest.update(np.ascontiguousarray(sf._fill_block([col], 0, n_rows)[0]).view(np.uint8))
+    return digest.hexdigest()
+
+
+def column_fingerprint(values: np.ndarray) -> str:
+    """ Content hash of one column's float64 values (BLAKE2b), whatever its name or position. """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(len(values)).encode())
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).view(np.uint8))
+    return digest.hexdigest()
+
+
+class StatsStore:
+    """ Directory of `{fingerprint}.json` stats files with size-bounded LRU eviction.
+
+        Files are written to a temporary name and moved into place with
+        `os.replace`, so concurrent readers only ever see complete files and
+        concurrent writers of the same key simply race to an identical
+        result. Reading an entry refreshes its modification time, and once
+        the directory grows past `max_bytes` the least recently used entries
+        are deleted.
+
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def __repr__(self) -> str:
+        return f"StatsStore({str(self.directory)!r}, max_bytes={self.max_bytes})"
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> dict[str, dict] | None:
+        """ The stored `{column: {metric: value}}` for `key`, or None on a miss. """
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as handle:
+                entry = json.load(handle)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if entry.get('version') != FORMAT_VERSION or entry.get('fingerprint') != key:
+            return None
+        return entry['columns']
+
+    def save(self, key: str, stats: dict[str, dict]) -> None:
+        entry = {'version': FORMAT_VERSION, 'fingerprint': key, 'columns': stats}
+        handle = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.directory,
+                                             prefix='.tmp-', suffix='.json', delete=False)
+        try:
+            with handle:
+                json.dump(entry, handle)
+            os.replace(handle.name, self._path(key))
+        except BaseException:
+            Path(handle.name).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """ Deletes least recently used entries until the store fits in `max_bytes`. """
+        entries = []
+        for item in os.scandir(self.directory):
+            if item.name.endswith('.json') and not item.name.startswith('.tmp-'):
+                try:
+                    info = item.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((info.st_mtime, info.st_size, item.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            Path(path).unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,239 @@
+"""
+
+mindhunter.regression
+Batched least squares behind `StatFrame.ols()`: many responses against one design matrix.
+
+"""
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from .engine import DEFAULT_BLOCK_BYTES, block_width
+
+SOLVERS = ('auto', 'qr', 'cholesky')
+# rows of the design matrix read (and multiplied) at a time
+CHUNK_ROWS = 1 << 16
+INTERCEPT = 'const'
+
+# `fill(columns, start, stop)` returns the `(columns, rows)` float64 block of rows `start:stop`.
+BlockFill = Callable[[list, int, int], np.ndarray]
+
+
+def complete_rows(fill: BlockFill, columns: list, n_rows: int,
+                  block_bytes: int = DEFAULT_BLOCK_BYTES) -> np.ndarray | None:
+    """ Mask of the rows where every one of `columns` is present, or None when they all are. """
+    keep = np.ones(n_rows, dtype=bool)
+    width = block_width(n_rows, block_bytes)
+    for start in range(0, len(columns), width):
+        keep &= ~np.isnan(fill(columns[start:start + width], 0, n_rows)).any(axis=0)
+    return None if keep.all() else keep
+
+
+def least_squares(fill: BlockFill, predictors: list, responses: list, n_rows: int, intercept: bool = True,
+                  solver: str = 'auto', keep: np.ndarray = None,  # type: ignore
+                  x_center: np.ndarray = None,  # type: ignore
+                  block_bytes: int = DEFAULT_BLOCK_BYTES, chunk_rows: int = None) -> 'OLSFit':  # type: ignore
+    """ Fits every response on the same design with a single factorization.
+
+        The design is `predictors` (plus a column of ones with `intercept`)
+        over the rows in `keep` (every row by default). Each block of
+        responses is read once, and its products with the design are
+        accumulated over chunks of `chunk_rows` rows (`CHUNK_ROWS` by default):
+
+        - 'qr' factors the design once (`X = QR`, holding X and Q) and
+          accumulates `Q'Y`;
+        - 'cholesky' accumulates `X'X` and `X'Y` chunk by chunk, so the design
+          is never held whole, and factors `X'X = R'R`;
+        - 'auto' picks 'qr' when X and Q fit in `block_bytes`.
+
+        Both reduce to `Z = R^-T X'Y`, which gives the coefficients by back
+        substitution and the residual sums of squares as `|y|² - |z|²`. With
+        an intercept, predictors are first shifted by `x_center` (such as
+        their cached means) and each response by its mean over the first
+        chunk, which keeps `X'X` well conditioned and `|y|² - |z|²` clear of
+        cancellation without changing the fit. Responses with missing values
+        among the rows in `keep` come out with NaN sums of squares.
+
+    """
+    from scipy import linalg
+
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver: {solver}. Expected one of {SOLVERS}")
+    n_obs = n_rows if keep is None else int(keep.sum())
+    n_params = len(predictors) + intercept
+    if n_obs <= n_params:
+        raise ValueError(f"Need more than {n_params} complete rows, got {n_obs}")
+    if solver == 'auto':
+        solver = 'qr' if 2 * n_obs * n_params * 8 <= block_bytes else 'cholesky'
+    if not intercept or x_center is None:
+        x_center = np.zeros(len(predictors))
+    y_center = np.zeros(len(responses))
+
+    chunk_rows = chunk_rows or CHUNK_ROWS
+    chunks = [(start, min(start + chunk_rows, n_rows)) for start in range(0, n_rows, chunk_rows)]
+
+    def design(start: int, stop: int) -> np.ndarray:
+        block = fill(predictors, start, stop) - x_center[:, None]
+        if keep is not None:
+            block = block[:, keep[start:stop]]
+        if intercept:
+            block = np.vstack([np.ones(block.shape[1]), block])
+        return block.T
+
+    gram = None
+    if solver == 'qr':
+        basis, r = np.linalg.qr(np.vstack([design(start, stop) for start, stop in chunks]))
+        # rows of Q that each chunk's kept rows map to
+        offsets = np.cumsum([0] + [stop - start if keep is None else int(keep[start:stop].sum())
+                                   for start, stop in chunks])
+    else:
+        gram = np.zeros((n_params, n_params))
+
+    z = np.zeros((n_params, len(responses)))
+    sums = np.zeros(len(responses))
+    squares = np.zeros(len(responses))
+    width = block_width(n_rows, block_bytes)
+    for first in range(0, len(responses), width):
+        span = slice(first, first + width)
+        values = fill(responses[span], 0, n_rows)
+        for i, (start, stop) in enumerate(chunks):
+            part = values[:, start:stop] if keep is None else values[:, start:stop][:, keep[start:stop]]
+            if intercept and i == 0:
+                y_center[span] = part.mean(axis=1) if part.shape[1] else 0.0
+            part = part - y_center[span, None]
+            if solver == 'qr':
+                rows = basis[offsets[i]:offsets[i + 1]]
+            else:
+                rows = design(start, stop)
+                if first == 0:
+                    gram += rows.T @ rows
+            z[:, span] += rows.T @ part.T
+            sums[span] += part.sum(axis=1)
+            squares[span] += np.einsum('ij,ij->i', part, part)
+
+    if solver == 'cholesky':
+        try:
+            r = np.linalg.cholesky(gram).T
+        except np.linalg.LinAlgError:
+            raise ValueError("The predictors are collinear") from None
+        z = linalg.solve_triangular(r, z, trans='T', check_finite=False)
+    diagonal = np.abs(np.diag(r))
+    if not len(diagonal) or diagonal.min() <= diagonal.max() * max(n_obs, n_params) * np.finfo(np.float64).eps:
+        raise ValueError("The predictors are collinear")
+
+    coef = linalg.solve_triangular(r, z, check_finite=False)
+    inverse = linalg.solve_triangular(r, np.eye(n_params))
+    cov_unscaled = inverse @ inverse.T
+    rss = np.maximum(squares - np.einsum('ij,ij->j', z, z), 0.0)
+    tss = squares - sums ** 2 / n_obs if intercept else squares
+
+    if intercept:
+        # back from the shifted design: the intercept absorbs both shifts
+        coef[0] += y_center - x_center @ coef[1:]
+        shift = np.eye(n_params)
+        shift[0, 1:] = -x_center
+        cov_unscaled = shift @ cov_unscaled @ shift.T
+
+    terms = ([INTERCEPT] if intercept else []) + list(predictors)
+    return OLSFit(responses, terms, coef, cov_unscaled, rss, tss, n_obs, intercept, solver)
+
+
+class OLSFit:
+    """ Ordinary least-squares fits of many responses on one shared design.
+
+        `coef` holds one column of coefficients per response and
+        `cov_unscaled` is `(X'X)^-1`, shared by every response, so standard
+        errors are `sqrt(diag(cov_unscaled) * sigma²)` with each response's
+        own residual variance. R² is centered with an intercept and
+        uncentered without one, as in statsmodels.
+
+    """
+
+    def __init__(self, responses: list, terms: list, coef: np.ndarray, cov_unscaled: np.ndarray,
+                 rss: np.ndarray, tss: np.ndarray, n_obs: int, intercept: bool, solver: str):
+        self.responses = list(responses)
+        self.terms = list(terms)
+        self.coef = coef
+        self.cov_unscaled = cov_unscaled
+        self.rss = rss
+        self.tss = tss
+        self.n_obs = n_obs
+        self.intercept = intercept
+        self.solver = solver
+
+    def __repr__(self) -> str:
+        return (f"OLSFit(responses={len(self.responses)}, terms={self.terms}, n_obs={self.n_obs}, "
+                f"solver={self.solver!r})")
+
+    @property
+    def df_resid(self) -> int:
+        return self.n_obs - len(self.terms)
+
+    @property
+    def sigma2(self) -> np.ndarray:
+        return self.rss / self.df_resid
+
+    @property
+    def params(self) -> pd.DataFrame:
+        return pd.DataFrame(self.coef, index=self.terms, columns=self.responses)
+
+    @property
+    def std_errors(self) -> np.ndarray:
+        return np.sqrt(np.outer(np.diag(self.cov_unscaled), self.sigma2))
+
+    @property
+    def t_values(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.coef / self.std_errors
+
+    @property
+    def p_values(self) -> np.ndarray:
+        from scipy import special
+        return 2 * special.stdtr(self.df_resid, -np.abs(self.t_values))
+
+    @property
+    def r_squared(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return 1 - self.rss / self.tss
+
+    @property
+    def adj_r_squared(self) -> np.ndarray:
+        return 1 - (self.n_obs - self.intercept) / self.df_resid * (1 - self.r_squared)
+
+    def summary(self) -> pd.DataFrame:
+        """ One row per (response, term): coefficient, standard error, t and p-value, with the response's R². """
+        n_terms, n_responses = self.coef.shape
+        return pd.DataFrame({
+            'response': np.repeat(np.asarray(self.responses, dtype=object), n_terms),
+            'term': np.tile(np.asarray(self.terms, dtype=object), n_responses),
+            'coef': self.coef.T.ravel(),
+            'std_error': self.std_errors.T.ravel(),
+            't_value': self.t_values.T.ravel(),
+            'p_value': self.p_values.T.ravel(),
+            'r_squared': np.repeat(self.r_squared, n_terms),
+            'adj_r_squared': np.repeat(self.adj_r_squared, n_terms),
+            'n_obs': self.n_obs,
+        })
+
+    def _design(self, data: pd.DataFrame | dict) -> np.ndarray:
+        columns = [np.asarray(data[term], dtype=np.float64) for term in self.terms if term != INTERCEPT]
+        rows = len(columns[0]) if columns else len(data)
+        if self.intercept:
+            columns.insert(0, np.ones(rows))
+        return np.column_stack(columns)
+
+    def predict(self, data: pd.DataFrame | dict) -> pd.DataFrame:
+        """ Fitted values of every response at the predictor values in `data`. """
+        return pd.DataFrame(self._design(data) @ self.coef, columns=self.responses)
+
+    def mean_interval(self, data: pd.DataFrame | dict, response: str,
+                      alpha: float = 0.05) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ `(fitted, lower, upper)`: `response`'s fitted mean at `data` with its `1 - alpha` confidence band. """
+        from scipy import special
+        design = self._design(data)
+        j = self.responses.index(response)
+        fitted = design @ self.coef[:, j]
+        spread = np.sqrt(np.einsum('ij,jk,ik->i', design, self.cov_unscaled, design) * self.sigma2[j])
+        margin = special.stdtrit(self.df_resid, 1 - alpha / 2) * spread
+        return fitted, fitted - margin, fitted + margin
@@ -1,4 +1,18 @@
-from .distributions import DistributionAnalyzer
-from .hypothesis import HypothesisAnalyzer
+from typing import TYPE_CHECKING
 
-__all__ = ['DistributionAnalyzer', 'HypothesisAnalyzer']
\ No newline at end of file
+from ..lazy import attach
+
+if TYPE_CHECKING:
+    from .distributions import DistributionAnalyzer
+    from .hypothesis import HypothesisAnalyzer
+    from .resampling import ResamplingAnalyzer
+
+_LAZY = {
+    'DistributionAnalyzer': '.distributions',
+    'HypothesisAnalyzer': '.hypothesis',
+    'ResamplingAnalyzer': '.resampling',
+}
+
+__all__ = ['DistributionAnalyzer', 'HypothesisAnalyzer', 'ResamplingAnalyzer']
+
+__getattr__, __dir__ = attach(__name__, _LAZY, globals())
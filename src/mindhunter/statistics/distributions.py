@@ -1,6 +1,30 @@
+"""
+
+mindhunter.statistics.distributions
+Normality reports and ranked distribution fits over StatFrame columns.
+
+"""
 from ..mindhunter import StatFrame
+from typing import Literal
+import warnings
 import numpy as np
+import pandas as pd
+from ..instrumentation import instrument_public_methods
+from ..normality import (MOMENT_TESTS, NORMALITY_TESTS, SAMPLE_LIMITS, biased_moments, dagostino_k2,
+                         jarque_bera, sample)
+
+FIT_DISTRIBUTIONS = ('norm', 'lognorm', 'gamma', 'expon', 'weibull_min', 't', 'logistic', 'uniform')
+FIT_METHODS = ('auto', 'full', 'binned', 'sample')
+RANK_CRITERIA = ('aic', 'bic', 'ks')
+# columns longer than this are fitted on a seeded sample under method='auto'
+FIT_SAMPLE_LIMIT = 50_000
+DEFAULT_FIT_BINS = 512
+# memoized fits kept per StatFrame; the oldest go first
+FIT_CACHE_SIZE = 4096
+FIT_COLUMNS = ['column', 'distribution', 'params', 'fit_method', 'sample_size', 'log_likelihood',
+               'aic', 'bic', 'ks_statistic', 'ks_p_value']
 
+@instrument_public_methods
 class DistributionAnalyzer:
     def __init__(self, sf: StatFrame) -> None:
         self.da = sf
@@ -14,4 +38,317 @@ class DistributionAnalyzer:
         print(f"Mean close to median?: {abs(mean_val - median_val) < 0.1 * std_val}")
         
         within_1std = np.sum(np.abs(data - mean_val) <= std_val) / len(data)
-        print(f"Percentage within 1 std: {within_1std*100:.1f}% (should be ~68%)")
\ No newline at end of file
+        print(f"Percentage within 1 std: {within_1std*100:.1f}% (should be ~68%)")
+
+    def normality_report(self,
+                         columns: list[str] = None,  # type: ignore
+                         tests: tuple[str, ...] = NORMALITY_TESTS,
+                         alpha: float = 0.05,
+                         max_samples: int | dict[str, int] = None,  # type: ignore
+                         seed: int = 0) -> pd.DataFrame:
+        """ Runs Shapiro-Wilk, D'Agostino K², Anderson-Darling, Jarque-Bera and KS tests on many columns.
+
+            D'Agostino K² and Jarque-Bera are computed for every column at once
+            from the cached count, skewness and kurtosis; the other tests read
+            each column once through the StatFrame's execution backend, using
+            the cached mean and std. Columns longer than a test's practical
+            limit (`normality.SAMPLE_LIMITS`, or `max_samples` as one limit or
+            a `{test: limit}` dict) are tested on a sample drawn with `seed`,
+            so the report is reproducible. KS and Anderson-Darling compare
+            against a normal with the estimated mean and std; the Anderson-
+            Darling p-value is the D'Agostino-Stephens approximation. Tests
+            that can't run on a column (too few values, or no spread) have
+            NaN results, NA `reject_null` and the conclusion 'Not testable'.
+
+            Returns one row per (column, test).
+
+        """
+        if columns is None:
+            columns = self.da._numeric_columns()
+        available = set(self.da._numeric_columns())
+        for column in columns:
+            if column not in available:
+                raise ValueError(f"Column '{column}' not found")
+        for test in tests:
+            if test not in NORMALITY_TESTS:
+                raise ValueError(f"Unknown test: {test}. Expected one of {NORMALITY_TESTS}")
+
+        limits = dict(SAMPLE_LIMITS)
+        if isinstance(max_samples, dict):
+            limits.update(max_samples)
+        elif max_samples is not None:
+            limits = {test: max_samples for test in NORMALITY_TESTS}
+        for test, limit in limits.items():
+            if limit is not None and test not in MOMENT_TESTS and limit < 3:
+                raise ValueError(f"max_samples for {test} must be at least 3, got {limit}")
+
+        columns = list(columns)
+        known = self.da._cached_stats.gather(columns, ('count', 'mean', 'std', 'skewness', 'kurtosis'))
+        n = known['count'].astype(np.float64)
+        g1, g2 = biased_moments(n, known['skewness'], known['kurtosis'], known['std'])
+        results = {}
+        for test, kernel in (('dagostino', dagostino_k2), ('jarque_bera', jarque_bera)):
+            if test in tests:
+                statistic, p_value = kernel(n, g1, g2)
+                results[test] = (statistic, p_value, known['count'].astype(np.int64))
+
+        scanned = tuple(test for test in tests if test not in MOMENT_TESTS)
+        results.update(self.da._backend.normality(columns, self.da._n_rows(), self.da._fill_block,
+                                                  known['mean'], known['std'], scanned,
+                                                  {test: limits.get(test) for test in scanned}, seed))
+
+        frames = []
+        for test in tests:
+            statistic, p_value, sample_size = results[test]
+            frames.append(pd.DataFrame({
+                'column': np.asarray(columns, dtype=object),
+                'test': test,
+                'sample_size': sample_size,
+                'subsampled': sample_size < known['count'],
+                'statistic': statistic,
+                'p_value': p_value,
+            }))
+        result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=['column', 'test', 'sample_size', 'subsampled', 'statistic', 'p_value'])
+        order = {col: i for i, col in enumerate(columns)}
+        result = result.sort_values('column', key=lambda s: s.map(order), kind='stable', ignore_index=True)
+
+        p_value = result['p_value'].to_numpy(dtype=np.float64)
+        testable = ~np.isnan(p_value)
+        reject = p_value < alpha
+        result['alpha'] = alpha
+        result['reject_null'] = pd.array(np.where(testable, reject, None), dtype='boolean')
+        result['conclusion'] = np.where(testable, np.where(reject, 'Reject H0', 'Could not reject H0'),
+                                        'Not testable')
+        return result
+
+    def fit_distributions(self,
+                          columns: list[str] = None,  # type: ignore
+                          distributions: tuple[str, ...] = FIT_DISTRIBUTIONS,
+                          rank_by: Literal['aic', 'bic', 'ks'] = 'aic',
+                          method: Literal['auto', 'full', 'binned', 'sample'] = 'auto',
+                          bins: int = DEFAULT_FIT_BINS,
+                          max_samples: int = FIT_SAMPLE_LIMIT,
+                          seed: int = 0) -> pd.DataFrame:
+        """ Fits SciPy distributions to each column by maximum likelihood and ranks them.
+
+            `distributions` are names of continuous `scipy.stats` distributions.
+            Every (column, distribution) fit is one task on the StatFrame's
+            execution backend and starts from method-of-moments values taken
+            from the cached stats where they are known (`moment_start`).
+            `method` picks what the fit sees: 'full' every value, 'sample' a
+            seeded sample of `max_samples` values, 'binned' a `bins`-bin
+            histogram (grouped likelihood, so the cost no longer depends on
+            the rows) and 'auto' the full column up to `max_samples` values and
+            a sample beyond. Log-likelihood, AIC, BIC and the KS statistic are
+            measured on the same data the fit saw. Fits are memoized by column
+            content, so re-plotting or re-reporting a column doesn't refit it.
+
+            Returns one row per (column, distribution), best `rank_by` first
+            within each column.
+
+        """
+        from scipy import stats
+
+        if columns is None:
+            columns = self.da._numeric_columns()
+        available = set(self.da._numeric_columns())
+        for column in columns:
+            if column not in available:
+                raise ValueError(f"Column '{column}' not found")
+        for name in distributions:
+            if not isinstance(getattr(stats, name, None), stats.rv_continuous):
+                raise ValueError(f"Unknown continuous distribution: {name}")
+        if rank_by not in RANK_CRITERIA:
+            raise ValueError(f"Unknown criterion: {rank_by}. Expected one of {RANK_CRITERIA}")
+        if method not in FIT_METHODS:
+            raise ValueError(f"Unknown method: {method}. Expected one of {FIT_METHODS}")
+        if bins < 2 or max_samples < 3:
+            raise ValueError("bins must be at least 2 and max_samples at least 3")
+
+        columns = list(columns)
+        known = self.da._cached_stats.gather(columns, ('count', 'mean', 'std', 'skewness', 'kurtosis',
+                                                       'min', 'max'))
+        keys, missing = {}, {}
+        for i, column in enumerate(columns):
+            count = int(known['count'][i])
+            fit_method = method if method != 'auto' else ('sample' if count > max_samples else 'full')
+            options = (fit_method, bins if fit_method == 'binned' else None,
+                       max_samples if fit_method == 'sample' else None, seed if fit_method == 'sample' else None)
+            fingerprint = self.da._column_fingerprint(column)
+            moments = {metric: float(values[i]) for metric, values in known.items()}
+            for name in distributions:
+                key = keys[column, name] = (fingerprint, name) + options
+                if key not in self.da._fits:
+                    missing.setdefault(column, []).append((name, key, moment_start(name, moments)))
+
+        if missing:
+            for cols, block in self.da._column_blocks(list(missing)):
+                payloads = [(row, name, start, key[2:], key[0])
+                            for row, column in enumerate(cols) for name, key, start in missing[column]]
+                fits = self.da._backend.map_shared(_fit_task, block, payloads)
+                for payload, fit in zip(payloads, fits):
+                    column = cols[payload[0]]
+                    self._remember(keys[column, payload[1]], fit)
+
+        records = [{'column': column, 'distribution': name, **self.da._fits[keys[column, name]]}
+                   for column in columns for name in distributions]
+        result = pd.DataFrame.from_records(records, columns=FIT_COLUMNS)
+        criterion = 'ks_statistic' if rank_by == 'ks' else rank_by
+        result['rank'] = result.groupby('column', sort=False)[criterion].rank(method='first').astype('Int64')
+        order = {col: i for i, col in enumerate(columns)}
+        return result.sort_values(['column', 'rank'], key=lambda s: s.map(order) if s.name == 'column' else s,
+                                  kind='stable', ignore_index=True)
+
+    def best_fit(self, column: str, distributions: tuple[str, ...] = FIT_DISTRIBUTIONS,
+                 rank_by: Literal['aic', 'bic', 'ks'] = 'aic', **kwargs) -> dict:
+        """ The top-ranked row of `fit_distributions()` for one column, with its frozen SciPy distribution. """
+        from scipy import stats
+
+        fits = self.fit_distributions([column], distributions, rank_by, **kwargs)
+        best = fits.iloc[0].to_dict()
+        best['frozen'] = getattr(stats, best['distribution'])(*best['params'])
+        best['rank_by'] = rank_by
+        return best
+
+    def _remember(self, key: tuple, fit: dict) -> None:
+        fits = self.da._fits
+        if len(fits) >= FIT_CACHE_SIZE:
+            del fits[next(iter(fits))]
+        fits[key] = fit
+
+
+def moment_start(name: str, moments: dict) -> tuple | None:
+    """ Method-of-moments `(shapes..., loc, scale)` of `name` from cached stats, or None if it has none here.
+
+        `moments` holds the column's 'mean', 'std', 'skewness', 'kurtosis',
+        'min' and 'max'. Shapes that the moments pin down only for one sign
+        of the skewness (gamma, lognorm) start near-symmetric otherwise, and
+        distributions bounded below start with their support just covering
+        the minimum, so every value has a finite likelihood.
+
+    """
+    from scipy import special
+
+    mean, skewness, kurtosis = moments['mean'], moments['skewness'], moments['kurtosis']
+    low, high = moments['min'], moments['max']
+    spread = moments['std'] if moments['std'] > 0 else 1.0
+    if not np.isfinite([mean, spread, low, high]).all():
+        return None
+    skewness = skewness if np.isfinite(skewness) else 0.0
+    floor = low - 0.01 * (high - low if high > low else spread)
+
+    match name:
+        case 'norm':
+            return (mean, spread)
+        case 'logistic':
+            return (mean, spread * np.sqrt(3) / np.pi)
+        case 'uniform':
+            return (low, high - low if high > low else spread)
+        case 'expon':
+            loc = min(mean - spread, floor)
+            return (loc, mean - loc)
+        case 't':
+            df = 6 / kurtosis + 4 if np.isfinite(kurtosis) and kurtosis > 0 else 30.0
+            return (df, mean, spread * np.sqrt((df - 2) / df))
+        case 'gamma':
+            a = float(np.clip(4 / skewness ** 2, 0.05, 400.0)) if skewness > 0 else 400.0
+            loc = min(mean - np.sqrt(a) * spread, floor)
+            return (a, loc, (mean - loc) / a)
+        case 'lognorm':
+            # skewness (w + 2) * sqrt(w - 1) solved for w = exp(s ** 2)
+            g = max(skewness, 0.1)
+            root = g * np.sqrt(1 + g ** 2 / 4)
+            w = np.cbrt(1 + g ** 2 / 2 + root) + np.cbrt(1 + g ** 2 / 2 - root) - 1
+            scale = spread / np.sqrt(w * (w - 1))
+            loc = min(mean - scale * np.sqrt(w), floor)
+            return (np.sqrt(np.log(w)), loc, (mean - loc) / np.sqrt(w))
+        case 'weibull_min':
+            # shape from the coefficient of variation above a location just under the minimum (Justus)
+            c = (spread / (mean - floor)) ** -1.086
+            return (c, floor, (mean - floor) / special.gamma(1 + 1 / c))
+        case _:
+            return None
+
+
+def fit_distribution(values: np.ndarray, name: str, start: tuple | None, method: str,
+                     bins: int, max_samples: int, seed: int, key: str) -> dict:
+    """ Fit of `name` to the non-missing `values`, as one row of `fit_distributions()` (without column and name).
+
+        'sample' draws `max_samples` values with `normality.sample`, keyed on
+        the column fingerprint `key`; 'binned' maximizes the grouped
+        likelihood of a `bins`-bin histogram with Nelder-Mead over
+        `(shapes..., loc, log scale)`, starting from `start`, or from a fit
+        to a 2000-value sample when there is no usable moment start. Failed
+        fits give NaN criteria.
+
+    """
+    from scipy import optimize, stats
+
+    dist = getattr(stats, name)
+    values = values[~np.isnan(values)]
+    if method == 'sample' and len(values) > max_samples:
+        values = sample(values, max_samples, seed, key)
+    n = len(values)
+    k = dist.numargs + 2
+    failed = {'params': (np.nan,) * k, 'fit_method': method, 'sample_size': n, 'log_likelihood': np.nan,
+              'aic': np.nan, 'bic': np.nan, 'ks_statistic': np.nan, 'ks_p_value': np.nan}
+    if n < max(k + 1, 3) or values.min() == values.max():
+        return failed
+
+    with warnings.catch_warnings(), np.errstate(all='ignore'):
+        warnings.simplefilter('ignore')
+        try:
+            if method == 'binned':
+                counts, edges = np.histogram(values, bins=bins)
+                inner = edges[1:-1]
+
+                def negative_log_likelihood(theta: np.ndarray) -> float:
+                    params = (*theta[:-1], np.exp(theta[-1]))
+                    # upper-tail bins from the survival function, where the cdf rounds to 1
+                    below = np.r_[0.0, dist.cdf(inner, *params), 1.0]
+                    above = np.r_[1.0, dist.sf(inner, *params), 0.0]
+                    mass = np.where(below[1:] <= 0.5, np.diff(below), -np.diff(above))
+                    used = counts > 0
+                    if not np.all(mass[used] > 0):
+                        return np.inf
+                    return -float(np.sum(counts[used] * np.log(mass[used])))
+
+                theta = np.r_[start[:-1], np.log(start[-1])] if start is not None else None
+                if theta is None or not np.isfinite(negative_log_likelihood(theta)):
+                    start = dist.fit(values if n <= 2000 else sample(values, 2000, seed, key))
+                    theta = np.r_[start[:-1], np.log(start[-1])]
+                solution = optimize.minimize(negative_log_likelihood, theta, method='Nelder-Mead',
+                                             options={'maxiter': 400 * k, 'xatol': 1e-8, 'fatol': 1e-8})
+                params = (*solution.x[:-1], float(np.exp(solution.x[-1])))
+                log_likelihood = -negative_log_likelihood(solution.x)
+                cdf = dist.cdf(inner, *params)
+                statistic = float(np.max(np.abs(np.cumsum(counts)[:-1] / n - cdf))) if len(inner) else 0.0
+            else:
+                if start is None:
+                    params = dist.fit(values)
+                else:
+                    params = dist.fit(values, *start[:-2], loc=start[-2], scale=start[-1])
+                log_likelihood = -float(dist.nnlf(params, values))
+                cdf = dist.cdf(np.sort(values), *params)
+                statistic = float(max(np.max(np.arange(1, n + 1) / n - cdf), np.max(cdf - np.arange(n) / n)))
+        except (ValueError, RuntimeError, FloatingPointError, np.linalg.LinAlgError):
+            return failed
+
+    if not np.isfinite(log_likelihood):
+        return failed
+    return {
+        'params': tuple(float(p) for p in params),
+        'fit_method': method,
+        'sample_size': n,
+        'log_likelihood': log_likelihood,
+        'aic': 2 * k - 2 * log_likelihood,
+        'bic': k * np.log(n) - 2 * log_likelihood,
+        'ks_statistic': statistic,
+        'ks_p_value': float(np.clip(stats.kstwo.sf(statistic, n), 0.0, 1.0)),
+    }
+
+
+def _fit_task(data: np.ndarray, payload: tuple) -> dict:
+    row, name, start, (method, bins, max_samples, seed), key = payload
+    return fit_distribution(data[row], name, start, method, bins, max_samples, seed, key)
@@ -1,12 +1,14 @@
 from ..mindhunter import StatFrame
 from ..utils.toolkit import AnalyticalTools
+from ..correlation import correlation_blocks
+from ..engine import DEFAULT_BLOCK_BYTES
+from ..instrumentation import instrument_public_methods
 from typing import Literal
-from scipy import stats
-import scipy as sp
 import pandas as pd
 import numpy as np
 
 
+@instrument_public_methods
 class HypothesisAnalyzer:
     def __init__(self, sf: StatFrame):
         self.da = sf
@@ -22,7 +24,7 @@ class HypothesisAnalyzer:
         if column not in self.da._df.columns:
             raise ValueError(f"Column '{column}' not found")
 
-        data = self.da._df[column].dropna()
+        data = self.da._df[column].dropna().astype(np.float64)
         n = len(data)
         
         test_stat, p_value = self._perform_test(data, test_type, null_value, alternative)
@@ -37,12 +39,172 @@ class HypothesisAnalyzer:
             'conclusion': 'Reject H0' if p_value < alpha else 'Could not reject H0'
         }
 
+    def hypothesis_test_many(self,
+                             columns: list[str] = None,  # type: ignore
+                             test_type: Literal['one_sample_t', 'z_test'] = 'one_sample_t',
+                             null_values: float | list[float] | dict[str, float | list[float]] = 0.0,
+                             alpha: float = 0.05,
+                             alternative: Literal['two-sided', 'less', 'greater'] = 'two-sided',
+                             correction: Literal['bh', 'holm'] = None) -> pd.DataFrame:  # type: ignore
+        """ Runs one-sample t or z tests for many columns and null values at once.
+
+            `null_values` is a single value, a grid of values tested against
+            every column, or a `{column: value(s)}` dict (whose keys are the
+            default `columns`). n, mean and std come from the cached stats, so
+            no column is scanned twice, and every statistic and p-value is
+            computed as one array operation. With `correction` ('bh' for
+            Benjamini-Hochberg, 'holm' for Holm), `reject_null` is decided on
+            the adjusted p-values across all tests in the result.
+
+            Returns one row per (column, null value) test.
+
+        """
+        if columns is None:
+            columns = list(null_values) if isinstance(null_values, dict) else self.da._numeric_columns()
+        available = set(self.da._numeric_columns())
+        for column in columns:
+            if column not in available:
+                raise ValueError(f"Column '{column}' not found")
+
+        if isinstance(null_values, dict):
+            grid = [np.atleast_1d(np.asarray(null_values[col], dtype=np.float64)) for col in columns]
+        else:
+            values = np.atleast_1d(np.asarray(null_values, dtype=np.float64))
+            grid = [values] * len(columns)
+
+        sizes = [len(values) for values in grid]
+        index = np.repeat(np.arange(len(columns)), sizes)
+        mu0 = np.concatenate(grid) if grid else np.empty(0)
+
+        known = self.da._cached_stats.gather(list(columns), ('count', 'mean', 'std'))
+        n, mean, std = known['count'][index], known['mean'][index], known['std'][index]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            test_stat = (mean - mu0) / (std / np.sqrt(n))
+
+        match test_type.lower():
+            case 'one_sample_t':
+                p_value = self.tools.t_to_p_value(test_stat, n - 1, alternative)
+            case 'z_test':
+                p_value = self.tools.z_to_p_value(test_stat, alternative)
+            case _:
+                raise ValueError(f"Unsupported test: {test_type}")
+        p_value = np.asarray(p_value, dtype=np.float64)
+
+        result = pd.DataFrame({
+            'column': np.asarray(columns, dtype=object)[index],
+            'null_value': mu0,
+            'test_type': test_type,
+            'alternative': alternative,
+            'sample_size': n.astype(np.int64),
+            'mean': mean,
+            'std': std,
+            'test_statistic': test_stat,
+            'p_value': p_value,
+        })
+
+        decision = p_value
+        if correction is not None:
+            decision = self.tools.adjust_p_values(p_value, correction)
+            result['p_adjusted'] = decision
+
+        reject = decision < alpha
+        result['alpha'] = alpha
+        result['reject_null'] = reject
+        result['conclusion'] = np.where(reject, 'Reject H0', 'Could not reject H0')
+        return result
+
+    def correlation_matrix(self,
+                           columns: list[str] = None,  # type: ignore
+                           method: Literal['pearson', 'spearman', 'kendall'] = 'pearson',
+                           nan_policy: Literal['pairwise', 'listwise'] = 'pairwise',
+                           block_bytes: int = DEFAULT_BLOCK_BYTES) -> dict[str, pd.DataFrame]:
+        """ Correlation, p-value and pair-count matrices across numeric columns.
+
+            Pearson and Spearman are computed as blocked matrix products over
+            column blocks of about `block_bytes`; Pearson standardizes with the
+            cached means and stds. Kendall runs one tau-b test per pair. With
+            'pairwise' NaN handling each pair uses the rows where both columns
+            are present; 'listwise' only keeps rows without any missing value.
+
+            Returns `{'r': ..., 'p_value': ..., 'n': ...}`.
+
+        """
+        columns = self._correlation_columns(columns)
+        size = len(columns)
+        r, p, n = np.full((size, size), np.nan), np.full((size, size), np.nan), np.zeros((size, size))
+
+        for rows, cols, r_block, n_block, p_block in self._correlation_blocks(columns, method, nan_policy,
+                                                                              block_bytes):
+            for target, block in ((r, r_block), (p, p_block), (n, n_block)):
+                target[rows, cols] = block
+                target[cols, rows] = block.T
+
+        return {
+            'r': pd.DataFrame(r, index=columns, columns=columns),
+            'p_value': pd.DataFrame(p, index=columns, columns=columns),
+            'n': pd.DataFrame(n.astype(np.int64), index=columns, columns=columns),
+        }
+
+    def top_correlations(self,
+                         k: int = 10,
+                         columns: list[str] = None,  # type: ignore
+                         method: Literal['pearson', 'spearman', 'kendall'] = 'pearson',
+                         nan_policy: Literal['pairwise', 'listwise'] = 'pairwise',
+                         block_bytes: int = DEFAULT_BLOCK_BYTES) -> pd.DataFrame:
+        """ The `k` most strongly correlated column pairs, strongest first.
+
+            Works block by block like `correlation_matrix()` but only keeps the
+            running top `k`, so the full matrices are never built. Each pair
+            comes with its `_interpret_correlation()` label.
+
+        """
+        columns = self._correlation_columns(columns)
+        best = np.empty((0, 5))
+
+        for rows, cols, r_block, n_block, p_block in self._correlation_blocks(columns, method, nan_policy,
+                                                                              block_bytes):
+            i, j = np.indices(r_block.shape)
+            i, j = i + rows.start, j + cols.start
+            upper = (i < j) & ~np.isnan(r_block)
+            candidates = np.column_stack([i[upper], j[upper], r_block[upper], p_block[upper], n_block[upper]])
+            best = np.concatenate([best, candidates])
+            if len(best) > k:
+                best = best[np.argpartition(-np.abs(best[:, 2]), k - 1)[:k]]
+
+        best = best[np.argsort(-np.abs(best[:, 2]), kind='stable')]
+        names = np.asarray(columns, dtype=object)
+        return pd.DataFrame({
+            'column_a': names[best[:, 0].astype(np.int64)],
+            'column_b': names[best[:, 1].astype(np.int64)],
+            'r': best[:, 2],
+            'p_value': best[:, 3],
+            'n': best[:, 4].astype(np.int64),
+            'interpretation': [self._interpret_correlation(value) for value in best[:, 2]],
+        })
+
+    def _correlation_columns(self, columns: list[str] | None) -> list[str]:
+        available = self.da._numeric_columns()
+        if columns is None:
+            return available
+        for column in columns:
+            if column not in available:
+                raise ValueError(f"Column '{column}' not found")
+        return list(columns)
+
+    def _correlation_blocks(self, columns: list[str], method: str, nan_policy: str, block_bytes: int):
+        moments = None
+        if method == 'pearson':
+            known = self.da._cached_stats.gather(columns, ('mean', 'std'))
+            moments = (known['mean'], known['std'])
+        return correlation_blocks(self.da._fill_block, columns, self.da._n_rows(), method=method,
+                                  nan_policy=nan_policy, moments=moments, block_bytes=block_bytes)
+
     def get_binomial_mean_comparison(self, column: str, n: int, p: float) -> dict[str, float]:
 
         if column not in self.da._df.columns:
             raise ValueError(f"Column '{column}' not found")
         
-        sample_mean = self.da._df[column].mean()
+        sample_mean = self.da._cached_stats[column]['mean']
         theoretical_mean = n * p
         
         return {
@@ -56,13 +218,14 @@ class HypothesisAnalyzer:
                     test_type: str, 
                     null_value: float, 
                     alternative: str) -> tuple[float, float]:
+        from scipy import stats
 
         match test_type.lower():
             case 'one_sample_t':
                 return stats.ttest_1samp(data, null_value, alternative=alternative)
             case 'z_test':
                 z_stat = (data.mean() - null_value) / (data.std() / np.sqrt(len(data)))
-                p_val = self._z_to_p_value(z_stat, alternative) # type: ignore
+                p_val = self.tools.z_to_p_value(z_stat, alternative) # type: ignore
                 return z_stat, p_val
             case 'binomial':
                 successes = (data == 1).sum()
@@ -75,6 +238,7 @@ class HypothesisAnalyzer:
     def _proportion_test(self, successes: int, n: int, p0: float, 
                         alternative: str) -> tuple[float, float]:
         """ Calculates proportion using binomial tests. """
+        from scipy import stats
 
         if n < 30 or n * p0 < 5 or n * (1 - p0) < 5:
             p_value = stats.binom_test(successes, n, p0, alternative=alternative) # type: ignore
@@ -84,7 +248,7 @@ class HypothesisAnalyzer:
         sample_prop = successes / n
         se = np.sqrt(p0 * (1 - p0) / n)
         z_stat = (sample_prop - p0) / se
-        p_value = self._z_to_p_value(z_stat, alternative) # type: ignore
+        p_value = self.tools.z_to_p_value(z_stat, alternative) # type: ignore
         
         return z_stat, p_value
 
@@ -0,0 +1,184 @@
+"""
+
+mindhunter.statistics.resampling
+Bootstrap confidence intervals and permutation tests over batched resamples.
+
+"""
+from ..mindhunter import StatFrame
+from ..engine import DEFAULT_BLOCK_BYTES, METRIC_TO_GROUP, column_values, compute_metrics
+from ..instrumentation import instrument_public_methods
+from typing import Literal
+import numpy as np
+
+
+@instrument_public_methods
+class ResamplingAnalyzer:
+    """ Bootstrap and permutation tests for any metric of the stats cache.
+
+        Resamples are drawn as whole `(resamples, rows)` index blocks and
+        reduced with the same vectorized kernels behind `_cached_stats`, one
+        block at a time: `memory_budget` bounds the bytes of one block of
+        indices plus gathered values. Blocks run on the StatFrame's execution
+        backend (the data is shared with process workers, not copied), and
+        every block draws from its own child of `SeedSequence(seed)`, so a
+        given seed and budget give the same resamples on every backend.
+
+    """
+
+    def __init__(self, sf: StatFrame, memory_budget: int = DEFAULT_BLOCK_BYTES,
+                 seed: int = None):  # type: ignore
+        self.da = sf
+        self.memory_budget = memory_budget
+        self.seed = seed
+
+    def bootstrap_distribution(self, column: str, metric: str = 'median',
+                               n_resamples: int = 10_000) -> np.ndarray:
+        """ `metric` of `n_resamples` bootstrap resamples of a column's non-missing values. """
+        _check_metric(metric)
+        data = self._values(column)
+        if len(data) == 0:
+            raise ValueError(f"Column '{column}' has no values to resample")
+        return self._run(_bootstrap_task, data, n_resamples, metric)
+
+    def bootstrap_ci(self, column: str, metric: str = 'median', n_resamples: int = 10_000,
+                     confidence: float = 0.95,
+                     method: Literal['percentile', 'basic'] = 'percentile') -> dict:
+        """ Bootstrap confidence interval of a cached metric of `column`. """
+        distribution = self.bootstrap_distribution(column, metric, n_resamples)
+        estimate = self.da._cached_stats[column][metric]
+        tail = (1 - confidence) / 2
+        lower, upper = np.nanquantile(distribution, [tail, 1 - tail])
+
+        match method:
+            case 'percentile':
+                pass
+            case 'basic':
+                lower, upper = 2 * estimate - upper, 2 * estimate - lower
+            case _:
+                raise ValueError(f"Unknown method: {method}")
+
+        return {
+            'column': column,
+            'metric': metric,
+            'estimate': estimate,
+            'ci_lower': float(lower),
+            'ci_upper': float(upper),
+            'confidence': confidence,
+            'std_error': float(np.nanstd(distribution, ddof=1)),
+            'n_resamples': n_resamples,
+            'method': method,
+        }
+
+    def permutation_test(self, column: str, other: str = None, by: str = None,  # type: ignore
+                         groups: tuple = None, metric: str = 'mean',  # type: ignore
+                         n_resamples: int = 10_000, alpha: float = 0.05,
+                         alternative: Literal['two-sided', 'less', 'greater'] = 'two-sided') -> dict:
+        """ Permutation test for a difference in `metric` between two samples.
+
+            The samples are either `column` and `other`, or the values of
+            `column` in the two `groups` of the `by` column (its only two
+            values by default). The statistic is `metric(first) - metric(second)`.
+
+        """
+        _check_metric(metric)
+        if other is not None:
+            first, second = self._values(column), self._values(other)
+        elif by is not None:
+            first, second = self._group_values(column, by, groups)
+        else:
+            raise ValueError("permutation_test needs either `other` or `by`")
+        if len(first) == 0 or len(second) == 0:
+            raise ValueError("Both samples need at least one value")
+
+        observed = _difference(np.stack([np.r_[first, second]]), len(first), metric)[0]
+        pooled = np.concatenate([first, second])
+        permuted = self._run(_permutation_task, pooled, n_resamples, metric, len(first))
+
+        # relative tolerance so permutations that tie with the observed value count as extreme
+        tolerance = 1e-12 * max(abs(observed), 1.0)
+        match alternative:
+            case 'two-sided':
+                extreme = np.abs(permuted) >= abs(observed) - tolerance
+            case 'greater':
+                extreme = permuted >= observed - tolerance
+            case 'less':
+                extreme = permuted <= observed + tolerance
+            case _:
+                raise ValueError(f"Unknown alternative: {alternative}")
+        p_value = (extreme.sum() + 1) / (n_resamples + 1)
+
+        return {
+            'metric': metric,
+            'observed_difference': float(observed),
+            'p_value': float(p_value),
+            'alpha': alpha,
+            'reject_null': p_value < alpha,
+            'sample_sizes': (len(first), len(second)),
+            'n_resamples': n_resamples,
+            'alternative': alternative,
+            'conclusion': 'Reject H0' if p_value < alpha else 'Could not reject H0'
+        }
+
+    def _values(self, column: str) -> np.ndarray:
+        if column not in self.da._numeric_columns():
+            raise ValueError(f"Column '{column}' not found")
+        values = self.da._fill_block([column], 0, self.da._n_rows())[0]
+        return values[~np.isnan(values)]
+
+    def _group_values(self, column: str, by: str, groups: tuple) -> tuple[np.ndarray, np.ndarray]:
+        if by not in self.da._df.columns:
+            raise ValueError(f"Column '{by}' not found")
+        self._values(column)
+        keys = self.da._df[by]
+        if groups is None:
+            groups = tuple(keys.dropna().unique())
+        if len(groups) != 2:
+            raise ValueError(f"Expected exactly two groups, got {len(groups)}")
+
+        samples = []
+        for group in groups:
+            values = column_values(self.da._df.loc[(keys == group).to_numpy(), column])
+            samples.append(values[~np.isnan(values)])
+        return samples[0], samples[1]
+
+    def _run(self, task, data: np.ndarray, n_resamples: int, *args) -> np.ndarray:
+        """ Splits `n_resamples` into blocks that fit the budget and runs `task` on each. """
+        if n_resamples < 1:
+            raise ValueError("n_resamples must be a positive integer")
+        index_dtype = np.int32 if len(data) <= np.iinfo(np.int32).max else np.int64
+        row_bytes = len(data) * (8 + np.dtype(index_dtype).itemsize)
+        per_block = max(1, min(n_resamples, self.memory_budget // row_bytes))
+        sizes = [min(per_block, n_resamples - start) for start in range(0, n_resamples, per_block)]
+
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        payloads = [(seed, size, index_dtype, *args) for seed, size in zip(seeds, sizes)]
+        return np.concatenate(self.da._backend.map_shared(task, data, payloads))
+
+
+def _check_metric(metric: str) -> None:
+    if metric not in METRIC_TO_GROUP:
+        raise ValueError(f"Unknown metric: {metric}")
+
+
+def _difference(block: np.ndarray, n_first: int, metric: str) -> np.ndarray:
+    first = compute_metrics(np.ascontiguousarray(block[:, :n_first]), (metric,))[metric]
+    second = compute_metrics(np.ascontiguousarray(block[:, n_first:]), (metric,))[metric]
+    return first - second
+
+
+def _bootstrap_task(data: np.ndarray, payload: tuple) -> np.ndarray:
+    seed, size, index_dtype, metric = payload
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, len(data), size=(size, len(data)), dtype=index_dtype)
+    block = data[indices]
+    del indices
+    return compute_metrics(block, (metric,))[metric].astype(np.float64)
+
+
+def _permutation_task(data: np.ndarray, payload: tuple) -> np.ndarray:
+    seed, size, index_dtype, metric, n_first = payload
+    rng = np.random.default_rng(seed)
+    indices = rng.permuted(np.broadcast_to(np.arange(len(data), dtype=index_dtype), (size, len(data))), axis=1)
+    block = data[indices]
+    del indices
+    return _difference(block, n_first, metric).astype(np.float64)
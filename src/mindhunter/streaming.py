@@ -0,0 +1,508 @@
+"""
+
+mindhunter.streaming
+Mergeable, bounded-memory accumulators for computing StatFrame stats in one pass over chunks.
+
+"""
+from typing import Iterable
+
+import pandas as pd
+import numpy as np
+
+from .engine import (STAT_KEYS, assemble_stats, column_values, cv_kernel,
+                     numeric_columns, sem_kernel, shape_stats)
+
+# largest segment a window keeps, so a partial expiry re-summarizes at most this many rows
+SEGMENT_ROWS = 1 << 13
+
+
+class MomentAccumulator:
+    """ Exact, mergeable counts, extremes and central moments for a fixed set of columns.
+
+        Each chunk is reduced with a two-pass centered sum and folded into the
+        running totals with the pairwise update formulas of Pébay (2008), so the
+        result does not depend on how the data was split.
+
+    """
+
+    def __init__(self, n_columns: int):
+        self.total = 0
+        self.count = np.zeros(n_columns, dtype=np.int64)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.m3 = np.zeros(n_columns)
+        self.m4 = np.zeros(n_columns)
+        self.min = np.full(n_columns, np.nan)
+        self.max = np.full(n_columns, np.nan)
+
+    @classmethod
+    def from_block(cls, block: np.ndarray) -> 'MomentAccumulator':
+        """ Builds an accumulator from a `(columns, rows)` block with NaN for missing values. """
+        acc = cls(block.shape[0])
+        acc.total = block.shape[1]
+        valid = ~np.isnan(block)
+        acc.count = valid.sum(axis=1)
+        filled = np.where(valid, block, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            acc.mean = np.where(acc.count > 0, filled.sum(axis=1) / acc.count, 0.0)
+
+        adjusted = filled - acc.mean[:, None]
+        adjusted[~valid] = 0.0
+        adjusted2 = adjusted ** 2
+        acc.m2 = adjusted2.sum(axis=1)
+        acc.m3 = (adjusted2 * adjusted).sum(axis=1)
+        acc.m4 = (adjusted2 ** 2).sum(axis=1)
+
+        with np.errstate(invalid='ignore'):
+            has_values = acc.count > 0
+            acc.min = np.where(has_values, np.fmin.reduce(block, axis=1, initial=np.inf), np.nan)
+            acc.max = np.where(has_values, np.fmax.reduce(block, axis=1, initial=-np.inf), np.nan)
+        return acc
+
+    def merge(self, other: 'MomentAccumulator') -> 'MomentAccumulator':
+        """ Folds `other` into this accumulator in place and returns it. """
+        na = self.count.astype(np.float64)
+        nb = other.count.astype(np.float64)
+        n = na + nb
+        delta = other.mean - self.mean
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            safe_n = np.where(n > 0, n, 1.0)
+            mean = self.mean + delta * nb / safe_n
+            m2 = self.m2 + other.m2 + delta ** 2 * na * nb / safe_n
+            m3 = (self.m3 + other.m3
+                  + delta ** 3 * na * nb * (na - nb) / safe_n ** 2
+                  + 3 * delta * (na * other.m2 - nb * self.m2) / safe_n)
+            m4 = (self.m4 + other.m4
+                  + delta ** 4 * na * nb * (na ** 2 - na * nb + nb ** 2) / safe_n ** 3
+                  + 6 * delta ** 2 * (na ** 2 * other.m2 + nb ** 2 * self.m2) / safe_n ** 2
+                  + 4 * delta * (na * other.m3 - nb * self.m3) / safe_n)
+
+        self.mean, self.m2, self.m3, self.m4 = mean, m2, m3, m4
+        self.count = self.count + other.count
+        self.total += other.total
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        return self
+
+    def results(self) -> dict[str, np.ndarray]:
+        count = self.count
+        has_values = count > 0
+        max_abs = np.where(has_values, np.fmax(np.abs(self.min), np.abs(self.max)), 0.0)
+
+        metrics = {
+            'count': count,
+            'missing_count': self.total - count,
+            'mean': np.where(has_values, self.mean, np.nan),
+            'min': self.min,
+            'max': self.max,
+        }
+        with np.errstate(invalid='ignore', divide='ignore'):
+            metrics['missing_pct'] = (metrics['missing_count'] / self.total if self.total
+                                      else np.full(len(count), np.nan))
+        metrics.update(shape_stats(count, self.m2, self.m3, self.m4, max_abs))
+        return metrics
+
+
+class QuantileSketch:
+    """ Mergeable quantile sketch with bounded memory (a deterministic KLL variant).
+
+        Items live in levels; an item on level `h` stands for `2**h` inputs. When
+        a level outgrows its capacity it is sorted and every other item is
+        promoted, alternating the kept offset so compactions stay unbiased while
+        the sketch remains fully reproducible. Memory is `O(k)` items with
+        `k = ceil(4 / error)`, and the normalized rank error of a query stays in
+        the order of `error`. Until the first compaction the sketch is exact.
+
+    """
+
+    def __init__(self, error: float = 0.01):
+        if not 0 < error < 1:
+            raise ValueError("error must be in (0, 1)")
+        self.error = error
+        self.k = max(16, int(np.ceil(4.0 / error)))
+        self.n = 0
+        self._levels: list[np.ndarray] = [np.empty(0)]
+        self._flips: list[int] = [0]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - 1 - level
+        return max(2, int(self.k * (2.0 / 3.0) ** depth))
+
+    def update(self, values: np.ndarray) -> 'QuantileSketch':
+        """ Adds the non-NaN entries of `values`. """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.n += values.size
+            self._levels[0] = np.concatenate([self._levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """ Folds `other` into this sketch in place and returns it. """
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+            self._flips.append(0)
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                    self._flips.append(0)
+                items = np.sort(items)
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(keep)]
+                offset = self._flips[level]
+                self._flips[level] ^= 1
+                self._levels[level] = keep
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], pairs[offset::2]])
+            level += 1
+
+    def weighted_items(self) -> tuple[np.ndarray, np.ndarray]:
+        """ Sorted items and the number of inputs each one stands for. """
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(lvl), 2 ** h, dtype=np.int64)
+                                  for h, lvl in enumerate(self._levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+    def quantile(self, q: float | np.ndarray) -> float | np.ndarray:
+        """ Linear-interpolated quantile(s), exact while no compaction has happened. """
+        items, weights = self.weighted_items()
+        return weighted_quantile(items, weights, q)
+
+    def nbytes(self) -> int:
+        return sum(level.nbytes for level in self._levels)
+
+
+def weighted_quantile(items: np.ndarray, weights: np.ndarray,
+                      q: float | np.ndarray) -> float | np.ndarray:
+    """ Quantile of sorted `items` where each item repeats `weights` times.
+
+        With unit weights this is `np.quantile(items, q)` with linear
+        interpolation.
+
+    """
+    q = np.asarray(q, dtype=np.float64)
+    if items.size == 0:
+        result = np.full(q.shape, np.nan)
+        return result if result.ndim else float(result)
+
+    cumulative = np.cumsum(weights)
+    n = cumulative[-1]
+    position = q * (n - 1)
+    lower = np.floor(position)
+    gamma = position - lower
+    a = items[np.searchsorted(cumulative, lower, side='right')]
+    b = items[np.searchsorted(cumulative, np.minimum(lower + 1, n - 1), side='right')]
+    diff = b - a
+    result = np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+    return result if result.ndim else float(result)
+
+
+class ModeCounter:
+    """ Bounded-memory frequent-value counter (Misra-Gries summary).
+
+        `counts` are the Misra-Gries reduced counts, which decide what is
+        evicted: any value more frequent than `1 / (capacity + 1)` of the
+        column survives. `seen` counts each candidate since it last entered
+        the summary, a lower bound on its true count that is exact for
+        values never evicted. Every update keeps the `capacity` candidates
+        with the highest reduced counts (ties by the larger `seen`, then the
+        smaller value), so a column with values always has one.
+
+        The reported mode is the candidate seen most often, the smallest on a
+        tie as pandas reports it. It is exact as long as the column has no
+        more than `capacity` distinct values.
+
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.values = np.empty(0)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.seen = np.empty(0, dtype=np.int64)
+        self.exact = True
+
+    def update(self, values: np.ndarray) -> 'ModeCounter':
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size:
+            chunk_values, chunk_counts = np.unique(values, return_counts=True)
+            self._absorb(chunk_values, chunk_counts, chunk_counts)
+        return self
+
+    def merge(self, other: 'ModeCounter') -> 'ModeCounter':
+        self.exact = self.exact and other.exact
+        self._absorb(other.values, other.counts, other.seen)
+        return self
+
+    def _absorb(self, values: np.ndarray, counts: np.ndarray, seen: np.ndarray) -> None:
+        values, inverse = np.unique(np.concatenate([self.values, values]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts])).astype(np.int64)
+        seen = np.bincount(inverse, weights=np.concatenate([self.seen, seen])).astype(np.int64)
+
+        if len(values) > self.capacity:
+            self.exact = False
+            threshold = np.partition(counts, len(counts) - self.capacity - 1)[len(counts) - self.capacity - 1]
+            counts = np.maximum(counts - threshold, 0)
+            # values are sorted, so the stable sort breaks the remaining ties by the smallest value
+            keep = np.sort(np.lexsort((-seen, -counts))[:self.capacity])
+            values, counts, seen = values[keep], counts[keep], seen[keep]
+
+        self.values, self.counts, self.seen = values, counts, seen
+
+    def mode(self) -> float:
+        if self.seen.size == 0:
+            return np.nan
+        return float(self.values[self.seen.argmax()])
+
+
+class StreamingStats:
+    """ One-pass, constant-memory version of the StatFrame cached stats.
+
+        Feed it DataFrame chunks with `update()` (or combine partial results
+        with `merge()`), then read the usual `{column: {metric: value}}` layout
+        from `results()`. Counts, missing values, min/max and the moment-based
+        metrics are exact; median, q1, q3, IQR and MAD come from a
+        `QuantileSketch` with the requested rank `error`, and the mode from a
+        `ModeCounter`.
+
+    """
+
+    def __init__(self, columns: list = None, sketch_error: float = 0.01,  # type: ignore
+                 mode_capacity: int = 1024):
+        self.columns = columns
+        self.sketch_error = sketch_error
+        self.mode_capacity = mode_capacity
+        self.moments: MomentAccumulator = None  # type: ignore
+        self.sketches: list[QuantileSketch] = []
+        self.modes: list[ModeCounter] = []
+
+    def _ensure_state(self) -> None:
+        if self.moments is None:
+            self.moments = MomentAccumulator(len(self.columns))
+            self.sketches = [QuantileSketch(self.sketch_error) for _ in self.columns]
+            self.modes = [ModeCounter(self.mode_capacity) for _ in self.columns]
+
+    def update(self, chunk: pd.DataFrame) -> 'StreamingStats':
+        if self.columns is None:
+            self.columns = numeric_columns(chunk)
+        block = np.empty((len(self.columns), len(chunk)), dtype=np.float64)
+        for i, col in enumerate(self.columns):
+            column_values(chunk[col], out=block[i])
+        return self.update_block(block)
+
+    def update_block(self, block: np.ndarray) -> 'StreamingStats':
+        """ Adds a `(columns, rows)` float64 block laid out like `self.columns`. """
+        self._ensure_state()
+        for i in range(block.shape[0]):
+            self.sketches[i].update(block[i])
+            self.modes[i].update(block[i])
+        self.moments.merge(MomentAccumulator.from_block(block))
+        return self
+
+    def merge(self, other: 'StreamingStats') -> 'StreamingStats':
+        if other.moments is None:
+            return self
+        if self.moments is None:
+            self.columns = other.columns
+            self._ensure_state()
+        self.moments.merge(other.moments)
+        for mine, theirs in zip(self.sketches, other.sketches):
+            mine.merge(theirs)
+        for mine, theirs in zip(self.modes, other.modes):
+            mine.merge(theirs)
+        return self
+
+    def results(self) -> dict[str, dict]:
+        if self.moments is None:
+            return {}
+
+        metrics = self.moments.results()
+        quartiles = np.array([sketch.quantile([0.25, 0.5, 0.75]) for sketch in self.sketches]).reshape(-1, 3)
+        metrics['q1'], metrics['median'], metrics['q3'] = quartiles.T
+        metrics['mad'] = np.array([
+            _sketch_mad(sketch, median) for sketch, median in zip(self.sketches, metrics['median'])
+        ])
+        metrics['mode'] = np.array([counter.mode() for counter in self.modes])
+        metrics['range'] = metrics['max'] - metrics['min']
+        metrics['iqr'] = metrics['q3'] - metrics['q1']
+        metrics.update(cv_kernel(None, metrics))
+        metrics.update(sem_kernel(None, metrics))
+        return assemble_stats(self.columns, {key: np.asarray(metrics[key]) for key in STAT_KEYS})
+
+
+def _sketch_mad(sketch: QuantileSketch, median: float) -> float:
+    items, weights = sketch.weighted_items()
+    deviations = np.abs(items - median)
+    order = np.argsort(deviations, kind='stable')
+    return weighted_quantile(deviations[order], weights[order], 0.5)  # type: ignore
+
+
+def stream_stats(chunks: Iterable[pd.DataFrame], sketch_error: float = 0.01,
+                 mode_capacity: int = 1024) -> tuple[StreamingStats, pd.DataFrame]:
+    """ Consumes `chunks` once; returns the accumulated stats and an empty frame with the schema. """
+    stream = StreamingStats(sketch_error=sketch_error, mode_capacity=mode_capacity)
+    schema = None
+    for chunk in chunks:
+        if schema is None:
+            schema = chunk.iloc[:0].copy()
+        stream.update(chunk)
+    return stream, schema if schema is not None else pd.DataFrame()
+
+
+class RollingStats:
+    """ Incrementally maintained stats for a StatFrame that grows through `append()`.
+
+        Every appended batch is summarized once into its own `StreamingStats`,
+        so the cost of an append scales with the batch, not with the history.
+
+        Without a window, batch summaries are folded into one running total.
+        With a window (`max_rows` and/or `max_age` over `time_column`), rows
+        are kept in segments of at most `SEGMENT_ROWS` next to their
+        summaries; expired rows are retracted by dropping whole segments, and
+        a partially expired segment is re-summarized from its surviving rows
+        when the stats are next read. The window's summary is maintained as a
+        two-stack queue: the oldest segments keep merged summaries of
+        themselves and every later segment up to a split point (`_front`),
+        the newer ones a running merge (`_back`), and the stacks are rebuilt
+        only when the front runs out. Appends, expiries and reads therefore
+        cost an amortized constant number of merges plus the batch, whatever
+        the window size, and the stats are cached until the window changes.
+        Rows are expected to arrive in `time_column` order.
+
+    """
+
+    def __init__(self, columns: list, sketch_error: float = 0.01, mode_capacity: int = 1024,
+                 max_rows: int = None, max_age=None, time_column: str = None,  # type: ignore
+                 ignore_index: bool = False):
+        if max_age is not None and time_column is None:
+            raise ValueError("max_age requires a time_column")
+        self.columns = columns
+        self.sketch_error = sketch_error
+        self.mode_capacity = mode_capacity
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.time_column = time_column
+        self.windowed = max_rows is not None or max_age is not None
+        self.ignore_index = ignore_index
+
+        self._segments: list[list] = []  # [rows, stats] per batch, oldest first; stats None once trimmed
+        self._total = StreamingStats(columns, sketch_error, mode_capacity)
+        # window summaries: `_front[-1]` covers the oldest segment up to the split, `_front[-2]` the next one...
+        self._front: list[StreamingStats] = []
+        self._back: StreamingStats = None  # type: ignore
+        self._window: dict[str, dict] = None  # type: ignore
+        self._frame: pd.DataFrame = None  # type: ignore
+
+    def _summarize(self, rows: pd.DataFrame) -> StreamingStats:
+        return StreamingStats(self.columns, self.sketch_error, self.mode_capacity).update(rows)
+
+    def _combine(self, *parts: StreamingStats) -> StreamingStats:
+        """ A new summary merging `parts` (None entries are skipped); the parts are left as they are. """
+        combined = StreamingStats(self.columns, self.sketch_error, self.mode_capacity)
+        for part in parts:
+            if part is not None:
+                combined.merge(part)
+        return combined
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows, _ in self._segments)
+
+    def seed(self, rows: pd.DataFrame, stats: StreamingStats = None) -> int:  # type: ignore
+        """ Starts from existing rows, optionally with an already computed summary of them. """
+        return self.append(rows, stats)
+
+    def append(self, rows: pd.DataFrame, stats: StreamingStats = None) -> int:  # type: ignore
+        """ Adds a batch and returns how many rows expired from the window. """
+        self._frame = None  # type: ignore
+        if not self.windowed:
+            stats = stats if stats is not None else self._summarize(rows)
+            self._segments.append([rows, stats])
+            self._total.merge(stats)
+            return 0
+
+        for start in range(0, len(rows), SEGMENT_ROWS):
+            piece = rows.iloc[start:start + SEGMENT_ROWS]
+            stats = self._summarize(piece)
+            self._segments.append([piece, stats])
+            self._back = self._combine(stats) if self._back is None else self._back.merge(stats)
+        self._window = None  # type: ignore
+        return self._expire()
+
+    def _fill_front(self) -> None:
+        """ Moves every segment to the front stack once it is empty, merging from the newest one back. """
+        if self._front:
+            return
+        merged = None
+        for _, stats in reversed(self._segments):
+            merged = self._combine(stats, merged)
+            self._front.append(merged)
+        self._back = None  # type: ignore
+
+    def _expired_rows(self) -> int:
+        total = len(self)
+        expired = max(0, total - self.max_rows) if self.max_rows is not None else 0
+
+        if self.max_age is not None and total:
+            latest = self._segments[-1][0][self.time_column].iloc[-1]
+            cutoff = latest - self.max_age
+            by_age = 0
+            for rows, _ in self._segments:
+                times = rows[self.time_column].to_numpy()
+                stale = int(np.searchsorted(times, cutoff, side='right'))
+                by_age += stale
+                if stale < len(rows):
+                    break
+            expired = max(expired, by_age)
+        return expired
+
+    def _expire(self) -> int:
+        remaining = expired = self._expired_rows()
+        while remaining:
+            self._fill_front()
+            rows, _ = self._segments[0]
+            if len(rows) <= remaining:
+                self._segments.pop(0)
+                self._front.pop()
+                remaining -= len(rows)
+                continue
+            # re-summarized on the next read
+            self._segments[0] = [rows.iloc[remaining:], None]
+            self._front[-1] = None  # type: ignore
+            remaining = 0
+        if expired:
+            self._window = None  # type: ignore
+        return expired
+
+    def frame(self) -> pd.DataFrame:
+        """ The rows currently covered, concatenated once per change. """
+        if self._frame is None:
+            frames = [rows for rows, _ in self._segments]
+            self._frame = pd.concat(frames, ignore_index=self.ignore_index) if len(frames) > 1 else frames[0]
+            if not self.windowed:
+                # history never expires, so later reads only concatenate new batches
+                self._segments = [[self._frame, None]]
+        return self._frame
+
+    def results(self) -> dict[str, dict]:
+        if not self.windowed:
+            return self._total.results()
+        if self._window is None:
+            if self._front and self._front[-1] is None:
+                head = self._segments[0]
+                head[1] = self._summarize(head[0])
+                self._front[-1] = self._combine(head[1], self._front[-2] if len(self._front) > 1 else None)
+            oldest = self._front[-1] if self._front else None
+            self._window = self._combine(oldest, self._back).results()
+        return self._window
@@ -1,3 +1,14 @@
-from .toolkit import AnalyticalTools
+from typing import TYPE_CHECKING
 
-__all__ = ['AnalyticalTools']
\ No newline at end of file
+from ..lazy import attach
+
+if TYPE_CHECKING:
+    from .toolkit import AnalyticalTools
+
+_LAZY = {
+    'AnalyticalTools': '.toolkit',
+}
+
+__all__ = ['AnalyticalTools']
+
+__getattr__, __dir__ = attach(__name__, _LAZY, globals())
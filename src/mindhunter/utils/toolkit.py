@@ -1,41 +1,106 @@
 from ..mindhunter import StatFrame
+from ..instrumentation import instrument_public_methods
 from typing import Literal
-from scipy import stats 
-from scipy.stats import norm
-from scipy.stats import pearsonr
 from typing import Tuple, Any
+from functools import lru_cache
 
 import pandas as pd
 import numpy as np
 
+@instrument_public_methods
 class AnalyticalTools:
     def __init__(self, sf: StatFrame):
         self.da = sf
     
     def z_to_p_value(self,
-                      z: float,
-                      alternative: Literal['two-sided', 'less', 'greater'] = 'two-sided') -> float:
+                      z: float | np.ndarray | pd.Series,
+                      alternative: Literal['two-sided', 'less', 'greater'] = 'two-sided') -> float | np.ndarray:
+        """ Convert z-statistic(s) to p-value(s).
 
+            Scalars give a float back; arrays and Series give the same type
+            and shape back. Goes straight to `scipy.special.ndtr`, skipping the
+            per-call overhead of `scipy.stats.norm`.
+
+        """
+        from scipy import special
+        z = _as_input(z)
         match alternative:
             case 'less':
-                return stats.norm.cdf(z).item() # type: ignore
+                p_value = special.ndtr(z)
             case 'greater':
-                return stats.norm.sf(z).item() # type: ignore
+                p_value = special.ndtr(-z)
             case 'two-sided':
-                return 2 * stats.norm.sf(abs(z)).item() # type: ignore
+                p_value = 2 * special.ndtr(-np.abs(z))
+            case _:
+                raise ValueError(f"Unknown alternative: {alternative}")
+        return _unwrap(p_value)
 
-    def t_to_p_value(self, t_stat: float, df: int, alternative: str) -> float:
-        """Convert t-statistic to p-value."""
+    def t_to_p_value(self, t_stat: float | np.ndarray | pd.Series, df: int | np.ndarray,
+                     alternative: str) -> float | np.ndarray:
+        """Convert t-statistic(s) to p-value(s); `t_stat` and `df` broadcast together."""
+        from scipy import special
+        t_stat, df = _as_input(t_stat), _as_input(df)
         match alternative.lower():
             case 'less':
-                return stats.t.cdf(t_stat, df).item()
+                p_value = special.stdtr(df, t_stat)
             case 'greater':
-                return stats.t.sf(t_stat, df).item()
+                p_value = special.stdtr(df, -t_stat)
             case 'two-sided':
-                return 2 * stats.t.sf(abs(t_stat), df).item()
+                p_value = 2 * special.stdtr(df, -np.abs(t_stat))
             case _:
                 raise ValueError(f"Unknown alternative: {alternative}")
-    
+        return _unwrap(p_value)
+
+    def critical_value(self, alpha: float, distribution: Literal['norm', 't'] = 'norm',
+                       df: float = None,  # type: ignore
+                       alternative: Literal['two-sided', 'less', 'greater'] = 'two-sided') -> float:
+        """ Critical value of a z or t test at significance `alpha`.
+
+            Two-sided and 'greater' give the positive upper value, 'less' the
+            negative lower one. Values are memoized on (distribution, alpha, df).
+
+        """
+        match alternative:
+            case 'two-sided':
+                return _critical_value(distribution, alpha / 2, df)
+            case 'greater':
+                return _critical_value(distribution, alpha, df)
+            case 'less':
+                return -_critical_value(distribution, alpha, df)
+            case _:
+                raise ValueError(f"Unknown alternative: {alternative}")
+
+    def adjust_p_values(self, p_values: np.ndarray,
+                        method: Literal['bh', 'holm']) -> np.ndarray:
+        """ Multiple-testing adjusted p-values (Benjamini-Hochberg or Holm).
+
+            NaN p-values are left as NaN and do not count towards the number
+            of tests.
+
+        """
+        p_values = np.asarray(p_values, dtype=np.float64)
+        adjusted = np.full(p_values.shape, np.nan)
+        valid = ~np.isnan(p_values)
+        p = p_values[valid]
+        m = len(p)
+        if m == 0:
+            return adjusted
+
+        order = np.argsort(p, kind='stable')
+        ranks = np.arange(1, m + 1)
+        match method:
+            case 'bh':
+                scaled = np.minimum.accumulate((p[order] * m / ranks)[::-1])[::-1]
+            case 'holm':
+                scaled = np.maximum.accumulate(p[order] * (m - ranks + 1))
+            case _:
+                raise ValueError(f"Unknown correction: {method}. Expected 'bh' or 'holm'")
+
+        result = np.empty(m)
+        result[order] = np.minimum(scaled, 1.0)
+        adjusted[valid] = result
+        return adjusted
+
     def cv(self, *columns) -> pd.Series:
         data = self.da._df if not columns else self.da._df[list(columns)]
         return data.std() / data.mean()
@@ -46,33 +111,77 @@ class AnalyticalTools:
         if numeric_data is None:
             return None
         
-        return (numeric_data - numeric_data.mean()) / numeric_data.std()
+        columns = numeric_data.columns.tolist()
+        stats = self.da._cached_stats
+        mean = np.array([stats[col]['mean'] for col in columns], dtype=np.float64)
+        std = np.array([stats[col]['std'] for col in columns], dtype=np.float64)
+        z_scores = self.da._backend.z_scores(columns, len(numeric_data), self.da._fill_block, mean, std)
+        return pd.DataFrame(z_scores, index=numeric_data.index, columns=numeric_data.columns)
     
     def z_score(self, column: str) -> float | None:
         if self.da._df[column].dtype != np.number:
             return None
         return self.da._df[column].std() / self.da._df[column].mean()
     
-    def psd(self, x) -> Tuple[float, Any]:
-        mu=x.mean()
-        sigma=x.std()
+    def psd(self, x, dist: str = 'norm', params: tuple = None) -> Tuple[float, Any]:  # type: ignore
+        """ `(grid, pdf)` of distribution `dist` over the range of `x`.
+
+            The normal uses the mean and std of `x`; other `scipy.stats`
+            distributions use `params` (such as those of
+            `DistributionAnalyzer.fit_distributions`) or are fitted to `x`.
+
+        """
+        from scipy import stats
         minimum=x.min()
         maximum=x.max()
+        if params is None:
+            params = (x.mean(), x.std()) if dist == 'norm' else getattr(stats, dist).fit(x.dropna())
         x = np.linspace(minimum, maximum)
-        pdf = norm.pdf(x, loc=mu, scale=sigma)
+        pdf = getattr(stats, dist).pdf(x, *params)
         return(x,pdf)
     
-    def wilson_score(self, p_hat: float, n: int, 
-                                    alpha: float) -> tuple[float, float]:
+    def wilson_score(self, p_hat: float | np.ndarray | pd.Series, n: int | np.ndarray | pd.Series,
+                     alpha: float) -> tuple[float, float] | tuple[np.ndarray, np.ndarray]:
+        """ Wilson score interval of proportion(s) `p_hat` out of `n` trials.
+
+            `p_hat` and `n` broadcast together; scalars give a tuple of floats.
 
-        z = stats.norm.ppf(1 - alpha/2)
+        """
+        p_hat, n = _as_input(p_hat), _as_input(n)
+        z = self.critical_value(alpha)
         denominator = 1 + z**2/n
         center = (p_hat + z**2/(2*n)) / denominator
         margin = z * np.sqrt(p_hat*(1-p_hat)/n + z**2/(4*n**2)) / denominator
-        
-        return max(0, center - margin), min(1, center + margin) # type: ignore
-    
+
+        return _unwrap(np.maximum(0, center - margin)), _unwrap(np.minimum(1, center + margin))
+
     def pearson_test(self, x: pd.Series, y: pd.Series) -> tuple[float, float]:
         if len(x) != len(y):
             raise ValueError("Series must have equal length")
+        from scipy.stats import pearsonr
         return pearsonr(x, y)
+
+
+def _as_input(values):
+    """ Lists and tuples become arrays; scalars, arrays and Series pass through untouched. """
+    return np.asarray(values, dtype=np.float64) if isinstance(values, (list, tuple)) else values
+
+
+def _unwrap(values: np.ndarray) -> float | np.ndarray:
+    """ Returns 0-d results as plain floats so scalar callers keep getting floats. """
+    return values.item() if np.ndim(values) == 0 else values
+
+
+@lru_cache(maxsize=1024)
+def _critical_value(distribution: str, tail: float, df: float | None) -> float:
+    """ Upper `tail` quantile of the standard normal or of Student's t with `df` degrees of freedom. """
+    from scipy import special
+    match distribution:
+        case 'norm':
+            return float(special.ndtri(1 - tail))
+        case 't':
+            if df is None:
+                raise ValueError("The t distribution needs `df`")
+            return float(special.stdtrit(df, 1 - tail))
+        case _:
+            raise ValueError(f"Unknown distribution: {distribution}")
@@ -1,4 +1,16 @@
-from .stat_plotter import StatPlotter
-from .visualizer import StatVisualizer
+from typing import TYPE_CHECKING
 
-__all__ = ['StatPlotter', 'StatVisualizer']
\ No newline at end of file
+from ..lazy import attach
+
+if TYPE_CHECKING:
+    from .stat_plotter import StatPlotter
+    from .visualizer import StatVisualizer
+
+_LAZY = {
+    'StatPlotter': '.stat_plotter',
+    'StatVisualizer': '.visualizer',
+}
+
+__all__ = ['StatPlotter', 'StatVisualizer']
+
+__getattr__, __dir__ = attach(__name__, _LAZY, globals())
@@ -0,0 +1,116 @@
+"""
+
+mindhunter.visualization.export
+Headless figures and batch rendering of plots to image files.
+
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple
+import os
+import re
+
+from matplotlib.figure import Figure
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from ..parallel import process_context
+
+EXPORT_FORMATS = ('png', 'svg')
+
+
+def new_figure(headless: bool, figsize: tuple, nrows: int = 1, ncols: int = 1) -> tuple[Figure, Any]:
+    """ A figure and its axes; headless figures live outside pyplot's global state. """
+    if headless:
+        fig = Figure(figsize=figsize)
+        return fig, fig.subplots(nrows, ncols)
+    return plt.subplots(nrows, ncols, figsize=figsize)
+
+
+def finish(fig: Figure, headless: bool, show: bool = True) -> Figure | None:
+    """ Returns headless figures to the caller; shows interactive ones. """
+    if headless:
+        return fig
+    if show:
+        plt.show()
+    return None
+
+
+def close(fig: Figure) -> None:
+    """ Releases a figure, whether or not pyplot is tracking it. """
+    plt.close(fig)
+    fig.clear()
+
+
+class FigureJob(NamedTuple):
+    """ One figure to render: `owner(StatFrame(data), **options).method(*args)` saved as `name`.
+
+        `data` only holds the columns the figure needs and `stats` their
+        already cached metrics, so workers neither receive nor recompute more
+        than that.
+
+    """
+    name: str
+    owner: str
+    method: str
+    args: tuple
+    data: pd.DataFrame
+    stats: dict
+    options: dict
+
+
+def file_name(*parts: str) -> str:
+    """ Joins `parts` into a file name safe on every platform. """
+    return re.sub(r'[^\w.-]+', '_', '_'.join(parts)).strip('_')
+
+
+def render_jobs(jobs: list[FigureJob], directory: str | os.PathLike, fmt: str = 'png',
+                n_workers: int = None, dpi: int = 100) -> list[str]:  # type: ignore
+    """ Renders every job to `directory/<name>.<fmt>` and returns the written paths.
+
+        With `n_workers` > 1, jobs are spread over a process pool whose
+        workers use the Agg backend; otherwise they render here, headless.
+        Every figure is closed as soon as it has been saved.
+
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format: {fmt}. Expected one of {EXPORT_FORMATS}")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1 or len(jobs) <= 1:
+        return [path for job in jobs for path in render_job(job, str(directory), fmt, dpi)]
+
+    with ProcessPoolExecutor(min(n_workers, len(jobs)), mp_context=process_context(),
+                             initializer=_use_agg) as pool:
+        futures = [pool.submit(render_job, job, str(directory), fmt, dpi) for job in jobs]
+        return [path for future in futures for path in future.result()]
+
+
+def render_job(job: FigureJob, directory: str, fmt: str, dpi: int) -> list[str]:
+    from ..mindhunter import StatFrame
+    from .stat_plotter import StatPlotter
+    from .visualizer import StatVisualizer
+
+    sf = StatFrame(job.data, copy='never')
+    sf._cached_stats.store(job.stats)
+    owner = {'StatPlotter': StatPlotter, 'StatVisualizer': StatVisualizer}[job.owner]
+    result = getattr(owner(sf, headless=True, **job.options), job.method)(*job.args)
+    figures = result if isinstance(result, list) else [result]
+
+    paths = []
+    for i, fig in enumerate(figures):
+        name = job.name if len(figures) == 1 else f"{job.name}_{i}"
+        path = os.path.join(directory, f"{name}.{fmt}")
+        try:
+            fig.savefig(path, format=fmt, dpi=dpi)
+        finally:
+            close(fig)
+        paths.append(path)
+    return paths
+
+
+def _use_agg() -> None:
+    import matplotlib
+    matplotlib.use('Agg')
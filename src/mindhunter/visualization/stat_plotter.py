@@ -1,34 +1,95 @@
 from ..mindhunter import StatFrame
+from ..instrumentation import instrument_public_methods
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from scipy.stats import norm
 from scipy import stats
 import scipy as sp
+import pandas as pd
+import os
 
+from matplotlib.figure import Figure
+
+from ..statistics.distributions import DistributionAnalyzer
+from .export import FigureJob, file_name, finish, new_figure, render_jobs
+from .summaries import binned_kde, box_stats, histogram, present_values, qq_points, stratified_sample
+
+@instrument_public_methods
 class StatPlotter:
-    def __init__(self, sf: StatFrame):
+    def __init__(self, sf: StatFrame, render_budget: int = None,  # type: ignore
+                 headless: bool = False):
+        """ Plots over a StatFrame.
+
+            With a `render_budget`, columns with more rows than the budget are
+            drawn from fixed-size summaries instead of every row: histograms
+            from pre-binned counts, boxplots from the cached quartiles, KDEs
+            on an FFT-convolved grid and Q-Q plots at a fixed set of quantiles.
+
+            With `headless=True`, plots are drawn on standalone `Figure`s that
+            pyplot never tracks and are returned instead of shown; they go
+            away as soon as the caller drops them.
+
+        """
         self.da = sf
+        self.render_budget = render_budget
+        self.headless = headless
+
+    def _downsample(self, n_rows: int) -> bool:
+        return self.render_budget is not None and n_rows > self.render_budget
     
-    def plot_z_scores(self, *columns: str) -> None:
-        if not columns:
-            numeric_cols = self.da.df.select_dtypes(include=[np.number]).columns
-            z_scores = self.da.df[numeric_cols]
-        else:
-            z_scores = self.da.df[[*columns]]
-        
-        z_scores = (z_scores - z_scores.mean()) / z_scores.std()
-        z_melted = z_scores.melt(var_name='Variable', value_name='Z-score')
-        
-        plt.figure(figsize=(12, 6))
-        sns.boxplot(data=z_melted, x='Variable', y='Z-score')
-        plt.axhline(y=0, color='red', linestyle='--', alpha=0.7)
-        plt.axhline(y=2, color='orange', linestyle='--', alpha=0.5)
-        plt.axhline(y=-2, color='orange', linestyle='--', alpha=0.5)
-        plt.title('Z-scores Across Variables')
-        plt.xticks(rotation=45)
-        plt.show()
+    def export(self, method: str, columns: list[str], directory: str | os.PathLike,
+               fmt: str = 'png', n_workers: int = None, dpi: int = 100) -> list[str]:  # type: ignore
+        """ Renders `method(column)` for every column to `directory` and returns the file paths.
+
+            `method` is one of the single-column plots ('plot_normal_distr',
+            'plot_normality_check' or 'plot_z_scores'). Figures render headless
+            across `n_workers` processes and are saved as PNG or SVG.
+
+        """
+        if method not in ('plot_normal_distr', 'plot_normality_check', 'plot_z_scores'):
+            raise ValueError(f"Unsupported method for export: {method}")
+        options = {'render_budget': self.render_budget}
+        jobs = [
+            FigureJob(file_name(method, col), 'StatPlotter', method, (col,), self.da.df[[col]],
+                      {col: self.da._cached_stats.computed(col)}, options)
+            for col in columns
+        ]
+        return render_jobs(jobs, directory, fmt=fmt, n_workers=n_workers, dpi=dpi)
+
+    def plot_z_scores(self, *columns: str) -> Figure | None:
+        """ Boxplots of the z-scores of `columns` (all numeric columns by default).
+
+            Boxes come from the cached quartiles, standardized, so no z-score
+            copy of the data is built; each column is read once for its
+            whisker ends and fliers.
+
+        """
+        return self._plot_z_score_summaries(list(columns) or self.da._numeric_columns())
+
+    def _z_score_guides(self, ax) -> None:
+        ax.axhline(y=0, color='red', linestyle='--', alpha=0.7)
+        ax.axhline(y=2, color='orange', linestyle='--', alpha=0.5)
+        ax.axhline(y=-2, color='orange', linestyle='--', alpha=0.5)
+        ax.set_title('Z-scores Across Variables')
+        ax.tick_params(axis='x', labelrotation=45)
     
+    def _plot_z_score_summaries(self, columns: list[str]) -> Figure | None:
+        n_rows = self.da._n_rows()
+        max_fliers = self.render_budget if self._downsample(n_rows) else n_rows
+        boxes = []
+        for col in columns:
+            cached = self.da._cached_stats[col]
+            mean, std = cached['mean'], cached['std']
+            standardized = {key: (cached[key] - mean) / std for key in ('median', 'q1', 'q3')}
+            boxes.append(box_stats((present_values(self.da, col) - mean) / std, standardized, label=col,
+                                   max_fliers=max_fliers))
+
+        fig, ax = new_figure(self.headless, (12, 6))
+        ax.bxp(boxes)
+        self._z_score_guides(ax)
+        return finish(fig, self.headless)
+
     #TODO: fix    
     # def plot_coefficient_variation(self, 
     #                                 column_name: str,
@@ -59,22 +120,47 @@ class StatPlotter:
     #     plt.xticks(rotation=rotation, ha=ha)
     #     plt.show()
 
-    def plot_normality_check(self, column_name: str) -> None:
-        basic_stats = self.da._cached_stats
-        data = self.da.df
-        ndev=sns.histplot(data, bins=30, x=column_name, kde=True)
-        xmin, xmax = plt.xlim()
+    def plot_normality_check(self, column_name: str) -> Figure | None:
+        basic_stats = self.da._cached_stats[column_name]
+        fig, ndev = new_figure(self.headless, (6.4, 4.8))
+        if self._downsample(self.da._n_rows()):
+            values = present_values(self.da, column_name)
+            counts, edges = histogram(values, bins=30)
+            ndev.stairs(counts, edges, fill=True, alpha=0.5)
+            grid, density = binned_kde(values)
+            ndev.plot(grid, density * len(values) * (edges[1] - edges[0]))
+        else:
+            data = self.da.df
+            sns.histplot(data, bins=30, x=column_name, kde=True, ax=ndev)
+        xmin, xmax = ndev.get_xlim()
         x = np.linspace(xmin, xmax, 100)
         p = norm.pdf(x, loc=basic_stats['mean'], scale=basic_stats['std'])
-        plt.plot(x, p, 'k', linewidth=2)
+        ndev.plot(x, p, 'k', linewidth=2)
         title = "Fit results: mu = %.2f, std = %.2f" % (basic_stats['mean'], basic_stats['std'])
-        plt.title(title)
+        ndev.set_title(title)
         ndev.axvline(basic_stats['median'], color='red', label='Media')
-        plt.show()
+        return finish(fig, self.headless)
     
-    def plot_normal_distr(self, data_to_test):
-        _, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
-        plt.suptitle(f'Normal distribution validation for: {data_to_test.name}')
+    def plot_normal_distr(self, data_to_test: pd.Series | str) -> Figure | None:
+        """ Histogram, Q-Q, boxplot and KDE of a Series, or of a column given by name.
+
+            Naming a column lets the plots reuse its cached stats.
+
+        """
+        if isinstance(data_to_test, str):
+            if self._downsample(self.da._n_rows()):
+                return self._plot_normal_summaries(data_to_test, present_values(self.da, data_to_test),
+                                                   self.da._cached_stats[data_to_test])
+            data_to_test = self.da.df[data_to_test]
+        elif self._downsample(len(data_to_test)):
+            values = data_to_test.dropna().to_numpy(dtype=np.float64)
+            q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+            summary = {'mean': values.mean(), 'std': values.std(ddof=1), 'min': values.min(),
+                       'max': values.max(), 'median': median, 'q1': q1, 'q3': q3}
+            return self._plot_normal_summaries(data_to_test.name, values, summary)
+
+        fig, ((ax1, ax2), (ax3, ax4)) = new_figure(self.headless, (15, 12), 2, 2)
+        fig.suptitle(f'Normal distribution validation for: {data_to_test.name}')
         
         # histogram with normal
         sns.histplot(data_to_test, kde=True, stat='density', ax=ax1)
@@ -104,21 +190,115 @@ class StatPlotter:
         ax4.axvline(mu, color='orange', linestyle='--', linewidth=2, label='Mean')
         ax4.set_title('KDE vs Normal')
         ax4.legend()
+        return finish(fig, self.headless, show=False)
+
+    def _plot_normal_summaries(self, name: str, values: np.ndarray, summary) -> Figure | None:
+        """ `plot_normal_distr` drawn from binned counts, quartiles and fixed quantiles. """
+        fig, ((ax1, ax2), (ax3, ax4)) = new_figure(self.headless, (15, 12), 2, 2)
+        fig.suptitle(f'Normal distribution validation for: {name}')
+
+        mu, sigma, med = summary['mean'], summary['std'], summary['median']
+        x = np.linspace(summary['min'], summary['max'], 100)
+        grid, density = binned_kde(values)
+
+        # histogram with normal
+        counts, edges = histogram(values, bins='auto' if len(values) < 1_000_000 else 100, density=True)
+        ax1.stairs(counts, edges, fill=True, alpha=0.5)
+        ax1.plot(grid, density)
+        ax1.plot(x, sp.stats.norm.pdf(x, mu, sigma), 'r-', linewidth=2, label='Perfect Normal Curve')
+        ax1.axvline(med, color='green', linestyle='--', linewidth=2, label='Median')
+        ax1.axvline(mu, color='orange', linestyle='--', linewidth=2, label='Mean')
+        ax1.set_title('Data vs Theoretical Distribution')
+        ax1.legend()
+
+        # q-q plot
+        theoretical, sample = qq_points(values, n_points=min(self.render_budget, 1000))
+        slope, intercept = np.polyfit(theoretical, sample, 1)
+        ax2.plot(theoretical, sample, 'o')
+        ax2.plot(theoretical, slope * theoretical + intercept, 'r-')
+        ax2.set_xlabel('Theoretical quantiles')
+        ax2.set_ylabel('Ordered Values')
+        ax2.set_title('Perfect Normal Q-Q Graph')
+
+        # boxplot
+        ax3.bxp([box_stats(values, summary, max_fliers=self.render_budget)])
+        ax3.set_title('Data Spread and Outliers')
+
+        # kde vs normal
+        clipped = grid >= 0
+        ax4.plot(grid[clipped], density[clipped], label='Sample')
+        ax4.plot(x, sp.stats.norm.pdf(x, mu, sigma), 'r-', label='Perfect Bell Curve')
+        ax4.axvline(med, color='green', linestyle='--', linewidth=2, label='Median')
+        ax4.axvline(mu, color='orange', linestyle='--', linewidth=2, label='Mean')
+        ax4.set_title('KDE vs Normal')
+        ax4.legend()
+        return finish(fig, self.headless, show=False)
 
     def plot_column_distribution(self, column: str, dist_type: str = 'binomial', 
-                            **kwargs) -> None:
+                            **kwargs) -> Figure | None:
+        """ Histogram of a column, with the fitted pdf of `dist_type` on top when it's a continuous distribution.
+
+            `dist_type` is a continuous `scipy.stats` distribution name, or
+            'best' for the top-ranked fit of `DistributionAnalyzer.best_fit`;
+            anything else (such as 'binomial') draws the discrete histogram
+            alone. Fits are memoized on the StatFrame, so re-plotting a column
+            doesn't refit it. Extra keyword arguments other than `title` go to
+            `DistributionAnalyzer.fit_distributions`.
+
+        """
         if column not in self.da.df.columns:
             raise ValueError(f"Column '{column}' not found in DataFrame")
-         
-        title = kwargs.get('title', f'{dist_type.title()} Distribution - {column}')
-        data = self.da.df
-        plt.figure(figsize=(10, 6))
-        sns.histplot(data, stat='probability', discrete=True, color='skyblue')
-        plt.title(title)
-        plt.xlabel('Values')
-        plt.ylabel('Probability')
-        plt.show()
-
-    def plot_regression_model(self, x: str, y: str) -> None:
-        current_data = self.da.df
-        sns.regplot(x=x, y=y, data=current_data, scatter_kws={'alpha':0.6}, line_kws={'color': 'red'})
\ No newline at end of file
+
+        options = {key: value for key, value in kwargs.items() if key != 'title'}
+        if dist_type == 'best':
+            fit = DistributionAnalyzer(self.da).best_fit(column, **options)
+        elif isinstance(getattr(stats, dist_type, None), stats.rv_continuous):
+            fit = DistributionAnalyzer(self.da).best_fit(column, (dist_type,), **options)
+        else:
+            fit = None
+
+        label = fit['distribution'] if fit is not None else dist_type
+        title = kwargs.get('title', f'{label.title()} Distribution - {column}')
+        fig, ax = new_figure(self.headless, (10, 6))
+        if fit is None:
+            sns.histplot(self.da.df, x=column, stat='probability', discrete=True, color='skyblue', ax=ax)
+            ax.set_ylabel('Probability')
+        else:
+            values = present_values(self.da, column)
+            counts, edges = histogram(values, bins='auto' if len(values) < 1_000_000 else 100, density=True)
+            ax.stairs(counts, edges, fill=True, color='skyblue', alpha=0.7)
+            x = np.linspace(edges[0], edges[-1], 200)
+            ax.plot(x, fit['frozen'].pdf(x), 'r-', linewidth=2,
+                    label=f"{fit['distribution']} ({fit['rank_by'].upper()} rank 1)" if dist_type == 'best'
+                    else fit['distribution'])
+            ax.legend()
+            ax.set_ylabel('Density')
+        ax.set_title(title)
+        ax.set_xlabel('Values')
+        return finish(fig, self.headless)
+
+    def plot_regression_model(self, x: str, y: str, alpha: float = 0.05) -> Figure | None:
+        """ Scatter of `y` against `x` with the fitted line and its `1 - alpha` confidence band.
+
+            The line comes from `StatFrame.ols(x, [y])`, which is kept on the
+            StatFrame, so re-plotting doesn't refit. With a `render_budget`,
+            only about that many points are drawn (see `stratified_sample`).
+
+        """
+        fit = self.da.ols(x, [y])
+        values = self.da._fill_block([x, y], 0, self.da._n_rows())
+        if self._downsample(values.shape[1]):
+            rows = stratified_sample(values[0], values[1], self.render_budget)
+        else:
+            rows = np.flatnonzero(~np.isnan(values).any(axis=0))
+
+        fig, ax = new_figure(self.headless, (6.4, 4.8))
+        ax.scatter(values[0, rows], values[1, rows], alpha=0.6)
+        grid = np.linspace(self.da._cached_stats[x]['min'], self.da._cached_stats[x]['max'], 100)
+        fitted, lower, upper = fit.mean_interval({x: grid}, y, alpha)
+        ax.plot(grid, fitted, color='red')
+        ax.fill_between(grid, lower, upper, color='red', alpha=0.15)
+        ax.set_xlabel(x)
+        ax.set_ylabel(y)
+        ax.set_title(f"{y} ~ {x}: R² = {fit.r_squared[0]:.3f}")
+        return finish(fig, self.headless, show=False)
@@ -0,0 +1,131 @@
+"""
+
+mindhunter.visualization.summaries
+Pre-binned, fixed-size summaries that plots draw instead of every row.
+
+"""
+import numpy as np
+from scipy import signal, special
+
+
+def present_values(sf, column: str) -> np.ndarray:
+    """ Non-missing float64 values of a StatFrame column, read through pending row removals. """
+    values = sf._fill_block([column], 0, sf._n_rows())[0]
+    return values[~np.isnan(values)]
+
+
+def histogram(values: np.ndarray, bins: int = 30, density: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """ `(counts, edges)` of `bins` equal-width bins, one pass over `values`. """
+    return np.histogram(values, bins=bins, density=density)
+
+
+def box_stats(values: np.ndarray, stats: dict, label: str = None,  # type: ignore
+              max_fliers: int = 1000, whis: float = 1.5) -> dict:
+    """ Boxplot summary for `Axes.bxp` from cached quartiles.
+
+        `stats` holds the cached 'median', 'q1', 'q3' (and 'mean'); only the
+        whisker ends and the fliers need a pass over `values`. At most
+        `max_fliers` fliers are kept, evenly spread over their sorted values so
+        the most extreme ones are always drawn.
+
+    """
+    q1, q3 = stats['q1'], stats['q3']
+    low, high = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+    inside = (values >= low) & (values <= high)
+    fliers = np.sort(values[~inside])
+    if len(fliers) > max_fliers:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, max_fliers).round().astype(np.int64)]
+
+    return {
+        'label': label,
+        'med': stats['median'],
+        'q1': q1,
+        'q3': q3,
+        'mean': stats.get('mean'),
+        'whislo': values[inside].min() if inside.any() else q1,
+        'whishi': values[inside].max() if inside.any() else q3,
+        'fliers': fliers,
+    }
+
+
+def binned_kde(values: np.ndarray, grid_size: int = 512, bandwidth: float = None,  # type: ignore
+               cut: float = 3.0) -> tuple[np.ndarray, np.ndarray]:
+    """ Gaussian KDE evaluated on a `grid_size` grid by FFT convolution of binned counts.
+
+        Values are linearly binned onto the grid and convolved with the
+        kernel, so the cost is one pass plus an FFT of the grid instead of
+        `n * grid_size` kernel evaluations. The default bandwidth is Scott's
+        rule, as in `scipy.stats.gaussian_kde` and seaborn's `kdeplot`.
+
+    """
+    n = len(values)
+    if bandwidth is None:
+        bandwidth = values.std(ddof=1) * n ** (-1 / 5) if n > 1 else 0.0
+    if not np.isfinite(bandwidth) or bandwidth <= 0:
+        return np.empty(0), np.empty(0)
+
+    grid = np.linspace(values.min() - cut * bandwidth, values.max() + cut * bandwidth, grid_size)
+    delta = grid[1] - grid[0]
+    position = (values - grid[0]) / delta
+    left = np.clip(np.floor(position).astype(np.int64), 0, grid_size - 2)
+    weight = position - left
+    counts = (np.bincount(left, weights=1 - weight, minlength=grid_size)
+              + np.bincount(left + 1, weights=weight, minlength=grid_size))
+
+    half_width = min(int(np.ceil(cut * bandwidth / delta)), grid_size - 1)
+    offsets = np.arange(-half_width, half_width + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = signal.fftconvolve(counts, kernel, mode='same') / n
+    return grid, np.clip(density, 0, None)
+
+
+def qq_points(values: np.ndarray, n_points: int = 200) -> tuple[np.ndarray, np.ndarray]:
+    """ `(theoretical, sample)` normal Q-Q coordinates at `n_points` fixed probabilities. """
+    n_points = min(n_points, len(values))
+    probabilities = (np.arange(1, n_points + 1) - 0.5) / n_points
+    return special.ndtri(probabilities), np.quantile(values, probabilities)
+
+
+def stratified_sample(x: np.ndarray, y: np.ndarray, budget: int, bins: int = 50,
+                      seed: int = 0) -> np.ndarray:
+    """ Positions of about `budget` points of `(x, y)`, sampled per cell of a `bins` x `bins` grid.
+
+        Every occupied cell keeps at least one point and dense cells keep a
+        share proportional to their count, so sparse regions and outliers
+        stay visible. Points with a missing coordinate are skipped.
+
+    """
+    valid = np.flatnonzero(~np.isnan(x) & ~np.isnan(y))
+    if len(valid) <= budget:
+        return valid
+
+    cells = _cell(x[valid], bins) * bins + _cell(y[valid], bins)
+    shuffled = np.random.default_rng(seed).permutation(len(valid))
+    order = shuffled[np.argsort(cells[shuffled], kind='stable')]
+    sorted_cells = cells[order]
+
+    counts = np.bincount(sorted_cells, minlength=bins * bins)
+    quota = np.ceil(counts * (budget / len(valid))).astype(np.int64)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(len(order)) - starts[sorted_cells]
+    return np.sort(valid[order[rank < quota[sorted_cells]]])
+
+
+def density_grid(x: np.ndarray, y: np.ndarray, bins: int = 200) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ `(counts, x_edges, y_edges)` of a `bins` x `bins` 2D histogram, with `counts[x, y]`. """
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    x, y = x[valid], y[valid]
+    counts = np.bincount(_cell(x, bins) * bins + _cell(y, bins), minlength=bins * bins)
+    x_edges = np.linspace(x.min(), x.max(), bins + 1) if len(x) else np.linspace(0, 1, bins + 1)
+    y_edges = np.linspace(y.min(), y.max(), bins + 1) if len(y) else np.linspace(0, 1, bins + 1)
+    return counts.reshape(bins, bins), x_edges, y_edges
+
+
+def _cell(values: np.ndarray, bins: int) -> np.ndarray:
+    """ Equal-width bin index of every value over its own range. """
+    if len(values) == 0:
+        return np.empty(0, dtype=np.int64)
+    low, span = values.min(), values.max() - values.min()
+    if span == 0:
+        return np.zeros(len(values), dtype=np.int64)
+    return np.minimum(((values - low) / span * bins).astype(np.int64), bins - 1)
@@ -1,34 +1,106 @@
 from ..mindhunter import StatFrame
-from typing import List
-import matplotlib.pyplot as plt 
+from ..instrumentation import instrument_public_methods
+from typing import List, Literal
+import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
+import os
 from scipy import stats
 
+from matplotlib.figure import Figure
+
+from .export import FigureJob, file_name, finish, new_figure, render_jobs
+from .summaries import box_stats, density_grid, present_values, stratified_sample
+
+@instrument_public_methods
 class StatVisualizer:
-    def __init__(self, sf: StatFrame):
+    def __init__(self, sf: StatFrame, render_budget: int = None,  # type: ignore
+                 scatter_mode: Literal['sample', 'density'] = 'sample',
+                 headless: bool = False):
+        """ Common graphs over a StatFrame.
+
+            With a `render_budget`, frames with more rows than the budget are
+            drawn from summaries: boxplots from the cached quartiles and
+            scatterplots from about `render_budget` points sampled per cell of
+            a 2D grid ('sample') or as a 2D density grid ('density').
+
+            With `headless=True`, every graph is a standalone `Figure` that
+            pyplot never tracks, returned in a list instead of shown.
+
+        """
         self.da = sf
-    
-    def create_scatterplot(self, columns: List[str]) -> None:
+        self.render_budget = render_budget
+        self.scatter_mode = scatter_mode
+        self.headless = headless
+
+    def _downsample(self) -> bool:
+        return self.render_budget is not None and self.da._n_rows() > self.render_budget
+
+    def create_scatterplot(self, columns: List[str]) -> list[Figure] | None:
+        figures = []
         for i in range(len(columns)):
             for j in range(i + 1, len(columns)):
                 col1 = columns[i]
                 col2 = columns[j]
                 if col1 in self.da.df.columns and col2 in self.da.df.columns:
-                    plt.figure(figsize=(8, 6))
-                    sns.scatterplot(data=self.da.df, x=col1, y=col2)
-                    plt.title(f'{col1} vs {col2}')
-                    plt.xlabel(col1)
-                    plt.ylabel(col2)
-                    plt.show()
-    
-    def create_boxplot(self, columns: List[str]) -> None:
+                    fig, ax = new_figure(self.headless, (8, 6))
+                    if self._downsample():
+                        self._draw_scatter_summary(fig, ax, col1, col2)
+                    else:
+                        sns.scatterplot(data=self.da.df, x=col1, y=col2, ax=ax)
+                    ax.set_title(f'{col1} vs {col2}')
+                    ax.set_xlabel(col1)
+                    ax.set_ylabel(col2)
+                    figures.append(finish(fig, self.headless))
+        return figures if self.headless else None
+
+    def _draw_scatter_summary(self, fig: Figure, ax, col1: str, col2: str) -> None:
+        n_rows = self.da._n_rows()
+        x = self.da._fill_block([col1], 0, n_rows)[0]
+        y = self.da._fill_block([col2], 0, n_rows)[0]
+        match self.scatter_mode:
+            case 'sample':
+                rows = stratified_sample(x, y, self.render_budget)
+                sns.scatterplot(x=x[rows], y=y[rows], s=10, ax=ax)
+            case 'density':
+                counts, x_edges, y_edges = density_grid(x, y)
+                mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts, 0).T, cmap='viridis')
+                fig.colorbar(mesh, ax=ax, label='rows')
+            case _:
+                raise ValueError(f"Unknown scatter_mode: {self.scatter_mode}")
+
+    def create_boxplot(self, columns: List[str]) -> list[Figure] | None:
+        figures = []
         for col in columns:
             if col in self.da.df.columns:
-                plt.figure(figsize=(8, 6))
-                sns.boxplot(y=self.da.df[col])
-                plt.title(f'{col} Boxplot')
-                plt.ylabel(col)
-                plt.show()
-                
+                fig, ax = new_figure(self.headless, (8, 6))
+                if self._downsample() and col in self.da._numeric_columns():
+                    ax.bxp([box_stats(present_values(self.da, col), self.da._cached_stats[col],
+                                      max_fliers=self.render_budget)])
+                else:
+                    sns.boxplot(y=self.da.df[col], ax=ax)
+                ax.set_title(f'{col} Boxplot')
+                ax.set_ylabel(col)
+                figures.append(finish(fig, self.headless))
+        return figures if self.headless else None
+
+    def export_boxplots(self, columns: List[str], directory: str | os.PathLike, fmt: str = 'png',
+                        n_workers: int = None, dpi: int = 100) -> list[str]:  # type: ignore
+        """ Saves one boxplot per column to `directory`, rendered across `n_workers` processes. """
+        jobs = [self._job(file_name('boxplot', col), 'create_boxplot', [col])
+                for col in columns if col in self.da.df.columns]
+        return render_jobs(jobs, directory, fmt=fmt, n_workers=n_workers, dpi=dpi)
+
+    def export_scatterplots(self, columns: List[str], directory: str | os.PathLike, fmt: str = 'png',
+                            n_workers: int = None, dpi: int = 100) -> list[str]:  # type: ignore
+        """ Saves the scatterplot of every pair of `columns` to `directory`, rendered across `n_workers` processes. """
+        present = [col for col in columns if col in self.da.df.columns]
+        jobs = [self._job(file_name('scatter', col1, 'vs', col2), 'create_scatterplot', [col1, col2])
+                for i, col1 in enumerate(present) for col2 in present[i + 1:]]
+        return render_jobs(jobs, directory, fmt=fmt, n_workers=n_workers, dpi=dpi)
+
+    def _job(self, name: str, method: str, columns: list) -> FigureJob:
+        stats = {col: self.da._cached_stats.computed(col) for col in columns}
+        options = {'render_budget': self.render_budget, 'scatter_mode': self.scatter_mode}
+        return FigureJob(name, 'StatVisualizer', method, (columns,), self.da.df[columns], stats, options)
@@ -0,0 +1,87 @@
+"""
+
+mindhunter.zeros
+Single-scan zero profile behind `StatFrame.zero_profile()` and the zero-removal methods.
+
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_TOLERANCES = (1e-10,)
+
+
+class ZeroProfile:
+    """ Exact-zero and near-zero counts of a set of numeric columns, from one scan.
+
+        `counts` holds, for every column, how many selected rows have
+        `|value| <= tolerance` at each of the ascending `tolerances` (0.0
+        being exact zeros). `row_level` keeps one byte per selected row: the
+        position of the smallest tolerance that some value of the row is
+        within (`len(tolerances)` if none is), which answers the row mask and
+        the number of rows removed at every tolerance without rescanning.
+
+    """
+
+    def __init__(self, columns: list, tolerances: tuple, counts: np.ndarray, row_level: np.ndarray):
+        self.columns = list(columns)
+        self.tolerances = tuple(tolerances)
+        self.row_level = row_level
+        self.counts = pd.DataFrame(counts, index=pd.Index(self.columns, name='column'),
+                                   columns=pd.Index(self.tolerances, name='tolerance'))
+
+    def __repr__(self) -> str:
+        return f"ZeroProfile(columns={len(self.columns)}, rows={self.n_rows}, tolerances={self.tolerances})"
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.row_level)
+
+    def row_mask(self, tolerance: float = 0.0) -> np.ndarray:
+        """ Selected rows with a value within `tolerance` (one of `tolerances`) of zero in any of the columns. """
+        if tolerance not in self.tolerances:
+            raise ValueError(f"Tolerance {tolerance} was not profiled. Expected one of {self.tolerances}")
+        return self.row_level <= self.tolerances.index(tolerance)
+
+    def rows_removed(self, tolerance: float = 0.0) -> int:
+        return int(self.row_mask(tolerance).sum())
+
+    def what_if(self) -> pd.DataFrame:
+        """ Rows each removal policy would drop: exact zeros, then near zeros at every tolerance.
+
+            Removing by a single column drops exactly that column's count
+            in `counts`.
+
+        """
+        policies = [('exact_zeros', 0.0)] + [('near_zeros', tol) for tol in self.tolerances if tol != 0.0]
+        records = []
+        for method, tolerance in policies:
+            removed = self.rows_removed(tolerance)
+            records.append({
+                'method': method,
+                'tolerance': tolerance,
+                'rows_removed': removed,
+                'rows_removed_pct': removed / self.n_rows * 100 if self.n_rows else 0.0,
+                'new_length': self.n_rows - removed,
+            })
+        return pd.DataFrame(records)
+
+
+def zero_profile_kernel(block: np.ndarray, tolerances: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """ `(counts, row_level)` of a `(columns, rows)` block for ascending `tolerances`; see `ZeroProfile`.
+
+        Works in place: `block` is overwritten with its absolute values.
+
+    """
+    magnitude = np.abs(block, out=block)
+    counts = np.empty((block.shape[0], len(tolerances)), dtype=np.int64)
+    row_level = np.full(block.shape[1], len(tolerances), dtype=np.uint8)
+    level = np.empty(block.shape[1], dtype=np.uint8)
+    with np.errstate(invalid='ignore'):
+        for i, values in enumerate(magnitude):
+            level.fill(len(tolerances))
+            for j, tolerance in enumerate(tolerances):
+                within = values <= tolerance
+                counts[i, j] = np.count_nonzero(within)
+                level -= within.view(np.uint8)
+            np.minimum(row_level, level, out=row_level)
+    return counts, row_level
@@ -36,4 +36,176 @@ def test_clean_sf(sample_statframe: StatFrame):
     
     sample_statframe.clean_df()
     assert sample_statframe.df is not None
-    """ Check if the DF is loaded, and it can be editable. """
\ No newline at end of file
+    """ Check if the DF is loaded, and it can be editable. """
+
+@pytest.mark.parametrize('copy', ['always', 'on_write', 'never'])
+def test_masked_removals(copy: str):
+    """ Removals only record a row selection; stats are computed through it and match the filtered frame. """
+    rng = np.random.default_rng(11)
+    df = pd.DataFrame({
+        'x': rng.integers(0, 4, 500).astype(float),
+        'y': rng.normal(0, 1, 500),
+    })
+    df.loc[::37, 'y'] = np.nan
+    original = df.copy()
+
+    sf = StatFrame(df, copy=copy) # type: ignore
+    sf.remove_exact_zeros()
+    sf.clean_df()
+    assert sf._row_mask is not None
+    stats = sf.get_stats()
+    assert sf._row_mask is not None
+    """ Stats were computed without building the filtered frame. """
+
+    expected = original[(original != 0).all(axis=1)].reset_index(drop=True).dropna().drop_duplicates()
+    pd.testing.assert_frame_equal(sf.df, expected)
+    pd.testing.assert_frame_equal(stats, StatFrame(expected).get_stats())
+    if copy != 'never':
+        pd.testing.assert_frame_equal(df, original)
+
+def test_zero_removal_resets_index():
+    """ Zero removals renumber the rows from 0, as `reset_index(drop=True)` does, even when nothing is removed. """
+    df = pd.DataFrame({'x': [1.0, 2.0, 3.0]}, index=[10, 20, 30])
+    sf = StatFrame(df)
+    assert sf.remove_exact_zeros()['rows_removed'] == 0
+    pd.testing.assert_frame_equal(sf.df, df.reset_index(drop=True))
+
+    sf = StatFrame(df.assign(y=[1.0, None, 1.0]))
+    sf.clean_df()
+    sf.remove_near_zeros(tolerance=1e-10)
+    pd.testing.assert_frame_equal(sf.df, df.assign(y=1.0).iloc[[0, 2]].reset_index(drop=True))
+
+def test_on_write_without_copy_on_write(monkeypatch):
+    """ 'on_write' shares the caller's buffers under pandas copy-on-write and falls back to a deep copy without it. """
+    df = pd.DataFrame({'x': np.arange(10.0)})
+    monkeypatch.setattr('mindhunter.mindhunter.copy_on_write', lambda: True)
+    shared = StatFrame(df, copy='on_write')
+    assert np.shares_memory(shared._data['x'].to_numpy(), df['x'].to_numpy())
+
+    monkeypatch.setattr('mindhunter.mindhunter.copy_on_write', lambda: False)
+    sf = StatFrame(df, copy='on_write')
+    assert sf._copy_mode == 'always'
+    assert not np.shares_memory(sf._data['x'].to_numpy(), df['x'].to_numpy())
+
+@pytest.mark.parametrize('subset', [None, ['group'], ['Group', 'score']])
+def test_clean_df_report_and_subset(subset):
+    """ clean_df matches dropna + drop_duplicates, reports each step and keeps computed stats. """
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        'Group': rng.choice(['a', 'b', None], 400),
+        'score': rng.integers(0, 5, 400).astype(float),
+        'Sign (x)': rng.choice([0.0, -0.0, 1.0], 400),
+    })
+    df.loc[::9, 'score'] = np.nan
+
+    sf = StatFrame(df)
+    sf.get_stats()
+    report = sf.clean_df(subset=subset)
+
+    expected = df.set_axis(['group', 'score', 'sign__x_'], axis=1).dropna()
+    keys = None if subset is None else [col.lower() for col in subset]
+    expected = expected.drop_duplicates(subset=keys)
+    pd.testing.assert_frame_equal(sf.df, expected)
+
+    assert report['columns_renamed'] == 2
+    assert report['rows_with_nan'] == len(df) - len(df.dropna())
+    assert report['rows_removed'] == report['rows_with_nan'] + report['duplicate_rows'] == len(df) - len(expected)
+    assert sf._cached_stats.computed('score')
+    """ Stats cached before cleaning were recomputed for the surviving rows. """
+    pd.testing.assert_frame_equal(sf.get_stats(), StatFrame(expected).get_stats())
+
+    with pytest.raises(ValueError):
+        sf.clean_df(subset=['missing'])
+
+def test_duplicate_rows_hashed(monkeypatch):
+    """ Wide keys are hashed, and hash collisions fall back to exact comparison. """
+    from mindhunter import cleaning
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({f'k{i}': rng.integers(0, 10 ** 6, 3000) for i in range(4)})
+    df = pd.concat([df, df.sample(500, random_state=1)], ignore_index=True)
+
+    incomplete, duplicated = cleaning.clean_masks(df)
+    assert not incomplete.any()
+    np.testing.assert_array_equal(duplicated, df.duplicated().to_numpy())
+
+    monkeypatch.setattr(cleaning, '_mix', lambda values: values * np.uint64(0))
+    incomplete, duplicated = cleaning.clean_masks(df)
+    np.testing.assert_array_equal(duplicated, df.duplicated().to_numpy())
+
+def test_zero_profile_single_scan(monkeypatch):
+    """ One scan profiles zeros at every tolerance and the removals that follow reuse it. """
+    rng = np.random.default_rng(9)
+    df = pd.DataFrame({
+        'a': np.where(rng.random(600) < 0.05, 0.0, rng.normal(0, 1, 600)),
+        'b': np.where(rng.random(600) < 0.05, 1e-12, rng.normal(0, 1, 600)),
+        'c': np.where(rng.random(600) < 0.05, -0.0, rng.normal(0, 1, 600)),
+        'label': 'x',
+    })
+    df.loc[::11, 'b'] = np.nan
+    numeric = df[['a', 'b', 'c']]
+
+    sf = StatFrame(df, backend='threads', n_workers=2, partition_rows=128)
+    scans = []
+    zero_profile = sf._backend.zero_profile
+    monkeypatch.setattr(sf._backend, 'zero_profile', lambda *args: scans.append(args) or zero_profile(*args))
+
+    profile = sf.zero_profile(tolerances=(1e-10, 1e-6))
+    assert profile.tolerances == (0.0, 1e-10, 1e-6)
+    for tolerance in profile.tolerances:
+        within = numeric.abs() <= tolerance
+        np.testing.assert_array_equal(profile.counts[tolerance].to_numpy(), within.sum().to_numpy())
+        np.testing.assert_array_equal(profile.row_mask(tolerance), within.any(axis=1).to_numpy())
+
+    what_if = profile.what_if().set_index('tolerance')['rows_removed']
+    assert sf.analyze_zero_removal()['zero_count'].tolist() == (numeric == 0).sum().tolist()
+    assert len(sf.locate_zero_rows()) == what_if[0.0]
+    assert sf.zero_profile(tolerances=(1e-6,)) is profile
+    report = sf.remove_near_zeros(tolerance=1e-10)
+    assert report['rows_removed'] == what_if[1e-10]
+    assert len(scans) == 1
+
+    sf.remove_exact_zeros()
+    assert len(scans) == 2
+    """ Removing rows invalidates the profile. """
+    with pytest.raises(ValueError):
+        sf.zero_profile(columns=['label'])
+
+@pytest.mark.parametrize('rule', ['zscore', 'iqr', 'modified_z'])
+def test_outlier_masks(rule):
+    """ Outlier masks match a dense pandas check against the cached fences, across chunk boundaries. """
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        'a': rng.standard_t(3, 1001),
+        'b': rng.normal(5, 2, 1001),
+        'flat': np.r_[np.full(1000, 2.0), 9.0],
+        'label': 'x',
+    })
+    df.loc[::7, 'b'] = np.nan
+    numeric = df[['a', 'b', 'flat']]
+
+    sf = StatFrame(df, backend='threads', n_workers=2, partition_rows=101)
+    masks = sf.outliers(rule=rule)
+    stats = sf.get_stats()
+    match rule:
+        case 'zscore':
+            flagged = ((numeric - stats.loc['mean']).abs() > 3 * stats.loc['std'])
+        case 'iqr':
+            iqr = stats.loc['q3'] - stats.loc['q1']
+            flagged = (numeric < stats.loc['q1'] - 1.5 * iqr) | (numeric > stats.loc['q3'] + 1.5 * iqr)
+        case 'modified_z':
+            flagged = (0.6745 * (numeric - stats.loc['median']).abs() / stats.loc['mad']) > 3.5
+    assert masks.counts.tolist() == flagged.sum().tolist()
+    assert masks.summary().loc['flat', 'outliers'] == 1
+    np.testing.assert_array_equal(masks.mask(), flagged.any(axis=1).to_numpy())
+    np.testing.assert_array_equal(masks.indices('a'), np.flatnonzero(flagged['a']))
+    assert masks.nbytes == 3 * 126
+    assert sf.outliers(rule=rule) is masks
+
+    report = sf.remove_outliers(rule=rule)
+    assert report['rows_removed'] == flagged.any(axis=1).sum()
+    assert sf.df.index.equals(pd.RangeIndex(len(df) - report['rows_removed']))
+    assert sf.outliers(rule=rule) is not masks
+    with pytest.raises(ValueError):
+        sf.outliers(columns=['label'])
+    with pytest.raises(ValueError):
+        sf.outliers(rule='grubbs')
@@ -1,7 +1,10 @@
 from mindhunter import StatFrame
+from mindhunter.engine import column_values
 from faker import Faker
 
 import os
+import subprocess
+import sys
 import pytest
 import pandas as pd
 import numpy as np
@@ -78,4 +81,106 @@ def test_heavy_computation(sample_statframe: StatFrame):
     assert da is not None
  
     result = sample_statframe._cached_stats
-    assert result is not None
\ No newline at end of file
+    assert result is not None
+
+
+@pytest.mark.parametrize('copy', ['always', 'on_write', 'never'])
+def test_compact_load(copy: str):
+    """
+    
+    Compact loading narrows dtypes without changing any value or cached stat.
+    
+    """
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        'small': rng.integers(0, 100, 1000),
+        'whole': rng.integers(-5, 5, 1000).astype(float),
+        'halves': rng.integers(0, 8, 1000) / 2,
+        'noise': rng.normal(0, 1, 1000),
+        'nullable': pd.array(np.where(rng.random(1000) < 0.1, None, rng.integers(0, 9, 1000)), dtype='Int64'),
+        'city': rng.choice(['Oslo', 'Lima', 'Pune'], 1000),
+    })
+    df.loc[::7, 'halves'] = np.nan
+    original = df.copy()
+
+    expected = StatFrame(original).get_stats()
+    sf = StatFrame(df, copy=copy, compact=True)  # type: ignore
+    report = sf.memory_report
+
+    assert list(sf.df.dtypes.astype(str)) == ['int8', 'int8', 'float32', 'float64', 'Int8', 'category']
+    assert report.loc['noise', 'bytes_saved'] == 0
+    assert report['bytes_saved'].sum() > report['bytes_after'].sum()
+    pd.testing.assert_frame_equal(sf.df, original, check_dtype=False, check_categorical=False)
+    pd.testing.assert_frame_equal(sf.get_stats(), expected)
+    if copy != 'never':
+        pd.testing.assert_frame_equal(df, original)
+
+    plain = StatFrame(original)
+    plain.get_stats()
+    plain.compact()
+    assert plain._cached_stats.computed('whole')
+    assert plain.df['whole'].dtype == np.int8
+
+
+def test_from_arrow_and_parquet(tmp_path):
+    """
+    
+    Arrow tables are wrapped without copying, and Parquet reads push projection and filters down.
+    
+    """
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({
+        'x': np.where(rng.random(2000) < 0.1, 0.0, rng.normal(0, 1, 2000)),
+        'k': rng.integers(0, 6, 2000),
+        'y': rng.normal(5, 2, 2000),
+        'label': rng.choice(['a', 'b'], 2000),
+    })
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = pa.table({
+        'x': table['x'], 'k': table['k'], 'label': table['label'],
+        'y': pa.array(df['y'], mask=(np.arange(2000) % 9 == 0)),
+    })
+    expected = df[['x', 'k', 'label', 'y']].copy()
+    expected.loc[np.arange(2000) % 9 == 0, 'y'] = np.nan
+
+    sf = StatFrame.from_arrow(table)
+    assert isinstance(sf.df['x'].dtype, pd.ArrowDtype)
+    assert np.shares_memory(column_values(sf.df['x']), table['x'].chunk(0).to_numpy())
+    pd.testing.assert_frame_equal(sf.get_stats(), StatFrame(expected).get_stats())
+    assert len(sf.locate_zero_rows()) == int((expected[['x', 'k', 'y']] == 0).any(axis=1).sum())
+
+    path = tmp_path / 'data.parquet'
+    pq.write_table(table, path, row_group_size=250)
+    subset = StatFrame.read_parquet(path, columns=['x', 'k'], filters=[('k', '>=', 3)])
+    assert subset.df.columns.tolist() == ['x', 'k']
+    assert len(subset.df) == int((df['k'] >= 3).sum())
+    pd.testing.assert_frame_equal(subset.get_stats(),
+                                  StatFrame(df.loc[df['k'] >= 3, ['x', 'k']]).get_stats())
+
+
+def test_import_is_lazy():
+    """
+    
+    Importing the package, StatFrame and AnalyticalTools loads neither SciPy nor the plotting stack.
+    
+    """
+    code = (
+        "import sys, mindhunter\n"
+        "assert 'matplotlib' not in sys.modules\n"
+        "from mindhunter import StatFrame, AnalyticalTools\n"
+        "import pandas as pd\n"
+        "AnalyticalTools(StatFrame(pd.DataFrame({'x': [1.0, 2.0]}))).cv()\n"
+        "print(' '.join(m for m in ('scipy', 'matplotlib', 'seaborn', 'statsmodels') if m in sys.modules))\n"
+        "from mindhunter import StatPlotter\n"
+        "print('matplotlib' in sys.modules, 'StatPlotter' in dir(mindhunter))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    leaked, plotting = result.stdout.splitlines()
+    assert leaked == ''
+    assert plotting == 'True True'
+
+    import mindhunter
+    with pytest.raises(AttributeError):
+        mindhunter.NotAClass
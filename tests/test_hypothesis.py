@@ -0,0 +1,272 @@
+from mindhunter import StatFrame
+from mindhunter.statistics.distributions import DistributionAnalyzer
+from mindhunter.statistics.hypothesis import HypothesisAnalyzer
+from statsmodels.stats.multitest import multipletests
+import statsmodels.api as sm
+from scipy import stats
+
+import warnings
+import pytest
+import pandas as pd
+import numpy as np
+
+
+@pytest.fixture
+def sample_df():
+    """
+    
+    A handful of normal columns with different means, one of them with gaps.
+    
+    """
+    rng = np.random.default_rng(11)
+    size = 500
+    df = pd.DataFrame({f'c{i}': rng.normal(i * 0.05, 1.0, size) for i in range(6)})
+    df.loc[rng.random(size) < 0.1, 'c2'] = np.nan
+    df['label'] = 'x'
+    return df
+
+
+@pytest.mark.parametrize('alternative', ['two-sided', 'less', 'greater'])
+def test_hypothesis_test_many_matches_scipy(sample_df, alternative):
+    """
+    
+    Batched t and z tests agree with scipy's per-column results.
+    
+    """
+    analyzer = HypothesisAnalyzer(StatFrame(sample_df))
+    grid = [-0.1, 0.0, 0.2]
+    numeric = [f'c{i}' for i in range(6)]
+
+    t_tests = analyzer.hypothesis_test_many(None, 'one_sample_t', grid, alternative=alternative)
+    assert len(t_tests) == len(numeric) * len(grid)
+    assert list(t_tests['column'].unique()) == numeric
+
+    for row in t_tests.itertuples():
+        expected = stats.ttest_1samp(sample_df[row.column].dropna(), row.null_value,
+                                     alternative=alternative)
+        assert row.test_statistic == pytest.approx(expected.statistic, rel=1e-9)
+        assert row.p_value == pytest.approx(expected.pvalue, rel=1e-9)
+
+    z_tests = analyzer.hypothesis_test_many(['c1', 'c2'], 'z_test', grid, alternative=alternative)
+    for row in z_tests.itertuples():
+        single = analyzer.hypothesis_test(row.column, 'z_test', row.null_value, alternative=alternative)
+        assert row.p_value == pytest.approx(single['p_value'], rel=1e-9)
+        assert row.sample_size == single['sample_size']
+
+
+@pytest.mark.parametrize('correction, method', [('bh', 'fdr_bh'), ('holm', 'holm')])
+def test_hypothesis_test_many_corrections(sample_df, correction, method):
+    """
+    
+    Adjusted p-values and decisions match statsmodels' multipletests.
+    
+    """
+    analyzer = HypothesisAnalyzer(StatFrame(sample_df))
+    result = analyzer.hypothesis_test_many(
+        null_values={'c0': [0.0, 0.1], 'c3': 0.0, 'c5': [0.0, 0.25, 0.5]},
+        correction=correction,
+    )
+    assert result['column'].tolist() == ['c0', 'c0', 'c3', 'c5', 'c5', 'c5']
+
+    reject, adjusted, _, _ = multipletests(result['p_value'], alpha=0.05, method=method)
+    np.testing.assert_allclose(result['p_adjusted'], adjusted, rtol=1e-12)
+    assert result['reject_null'].tolist() == reject.tolist()
+
+    with pytest.raises(ValueError):
+        analyzer.hypothesis_test_many(['label'], 'one_sample_t', 0.0)
+
+
+def test_vectorized_p_values_and_critical_values(sample_df):
+    """
+    
+    Array and Series inputs agree with scipy.stats, and scalars still give floats.
+    
+    """
+    tools = HypothesisAnalyzer(StatFrame(sample_df)).tools
+    z = pd.Series([-2.5, -0.3, 0.0, 1.7], index=list('abcd'))
+
+    two_sided = tools.z_to_p_value(z)
+    assert isinstance(two_sided, pd.Series) and list(two_sided.index) == list('abcd')
+    np.testing.assert_allclose(two_sided, 2 * stats.norm.sf(np.abs(z)), rtol=1e-12)
+    np.testing.assert_allclose(tools.t_to_p_value(z.to_numpy(), [3, 10, 30, 300], 'greater'),
+                               stats.t.sf(z, [3, 10, 30, 300]), rtol=1e-12)
+    assert isinstance(tools.z_to_p_value(1.2, 'less'), float)
+
+    assert tools.critical_value(0.05) == pytest.approx(stats.norm.ppf(0.975), rel=1e-12)
+    assert tools.critical_value(0.1, 't', 12, 'less') == pytest.approx(stats.t.ppf(0.1, 12), rel=1e-12)
+
+    lower, upper = tools.wilson_score(np.array([0.2, 0.5]), np.array([40, 400]), 0.05)
+    assert (lower[0], upper[0]) == tools.wilson_score(0.2, 40, 0.05)
+    assert np.all(lower < [0.2, 0.5]) and np.all(upper > [0.2, 0.5])
+
+
+@pytest.mark.parametrize('method', ['pearson', 'spearman', 'kendall'])
+def test_correlation_matrix_matches_pandas(sample_df, method):
+    """
+    
+    Blocked correlations agree with pandas, pairwise and listwise, and the
+    top-k pairs are the strongest off-diagonal entries of the full matrix.
+    
+    """
+    df = sample_df.copy()
+    df['c4'] = df['c0'] * 0.5 + df['c4']
+    df.loc[df.index[::7], ['c2', 'c4']] = np.nan
+    df.loc[df.index[1::5], 'c3'] = np.nan
+    df['ties'] = np.where(np.arange(len(df)) % 3 == 0, np.nan, np.arange(len(df)) % 4)
+    analyzer = HypothesisAnalyzer(StatFrame(df))
+    numeric = df.drop(columns='label')
+
+    pairwise = analyzer.correlation_matrix(method=method, block_bytes=3 * 8 * len(df))
+    np.testing.assert_allclose(pairwise['r'], numeric.corr(method=method), rtol=1e-10, atol=1e-12)
+    assert pairwise['n'].loc['c0', 'c4'] == numeric['c4'].notna().sum()
+
+    listwise = analyzer.correlation_matrix(method=method, nan_policy='listwise')
+    np.testing.assert_allclose(listwise['r'], numeric.dropna().corr(method=method), rtol=1e-10, atol=1e-12)
+
+    both = numeric[['c0', 'c4']].dropna()
+    reference = {'pearson': stats.pearsonr, 'spearman': stats.spearmanr, 'kendall': stats.kendalltau}[method]
+    assert pairwise['p_value'].loc['c0', 'c4'] == pytest.approx(reference(both['c0'], both['c4']).pvalue, rel=1e-8)
+
+    top = analyzer.top_correlations(3, method=method, block_bytes=2 * 8 * len(df))
+    r = pairwise['r'].to_numpy()
+    expected = np.sort(np.abs(r[np.triu_indices_from(r, k=1)]))[::-1][:3]
+    np.testing.assert_allclose(np.abs(top['r']), expected, rtol=1e-10)
+    assert top.loc[0, ['column_a', 'column_b']].tolist() == ['c0', 'c4']
+    assert top.loc[0, 'interpretation'] == analyzer._interpret_correlation(top.loc[0, 'r'])
+
+
+def test_normality_report_matches_scipy(sample_df):
+    """
+    
+    Every test agrees with scipy on whole columns; columns past a test's
+    limit are tested on the same seeded sample whichever columns are asked for.
+    
+    """
+    df = sample_df.copy()
+    df['skewed'] = np.random.default_rng(3).exponential(size=len(df))
+    analyzer = DistributionAnalyzer(StatFrame(df))
+
+    report = analyzer.normality_report()
+    assert len(report) == 7 * 5
+    assert not report['subsampled'].any()
+    for column in ['c2', 'skewed']:
+        values = df[column].dropna().to_numpy()
+        rows = report[report['column'] == column].set_index('test')
+        assert (rows['sample_size'] == len(values)).all()
+        reference = {
+            'shapiro': stats.shapiro(values),
+            'dagostino': stats.normaltest(values),
+            'jarque_bera': stats.jarque_bera(values),
+            'ks': stats.kstest(values, stats.norm(values.mean(), values.std(ddof=1)).cdf),
+        }
+        for test, expected in reference.items():
+            assert rows.loc[test, 'statistic'] == pytest.approx(expected.statistic, rel=1e-8)
+            assert rows.loc[test, 'p_value'] == pytest.approx(expected.pvalue, rel=1e-6, abs=1e-300)
+        assert rows.loc['anderson', 'statistic'] == pytest.approx(
+            stats.anderson(values, method='interpolate').statistic, rel=1e-8)
+    assert report.set_index(['column', 'test']).loc[('skewed', 'dagostino'), 'conclusion'] == 'Reject H0'
+
+    limited = analyzer.normality_report(max_samples={'shapiro': 100, 'ks': 200})
+    rows = limited.set_index(['column', 'test'])
+    assert rows.loc[('c0', 'shapiro'), 'sample_size'] == 100
+    assert rows.loc[('c0', 'ks'), 'subsampled']
+    assert rows.loc[('c0', 'jarque_bera'), 'sample_size'] == len(df)
+    again = analyzer.normality_report(['skewed', 'c0'], max_samples={'shapiro': 100, 'ks': 200})
+    pd.testing.assert_frame_equal(again.set_index(['column', 'test']).sort_index(),
+                                  rows.loc[['c0', 'skewed']].sort_index())
+
+    with pytest.raises(ValueError):
+        analyzer.normality_report(['label'])
+
+    flat = DistributionAnalyzer(StatFrame(df.assign(flat=4.5)))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        rows = flat.normality_report(['flat'])
+    assert rows['p_value'].isna().all() and rows['reject_null'].isna().all()
+    assert (rows['conclusion'] == 'Not testable').all()
+
+
+def test_fit_distributions_ranks_and_memoizes():
+    """
+    
+    Fits agree with scipy's own, the generating distribution ranks first on
+    full, binned and sampled data, and fits are reused until a column changes.
+    
+    """
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({'g': rng.gamma(2.0, 3.0, 4000) + 5, 'n': rng.normal(3.0, 2.0, 4000)})
+    sf = StatFrame(df)
+    analyzer = DistributionAnalyzer(sf)
+
+    fits = analyzer.fit_distributions(distributions=('norm', 'gamma', 'expon', 'logistic'))
+    assert len(fits) == 8 and list(fits['rank'][:4]) == [1, 2, 3, 4]
+    best = fits.groupby('column').first()['distribution']
+    assert best['g'] == 'gamma' and best['n'] in ('norm', 'gamma')
+    gamma = fits.set_index(['column', 'distribution']).loc[('g', 'gamma')]
+    np.testing.assert_allclose(gamma['params'], stats.gamma.fit(df['g']), rtol=1e-2)
+    assert gamma['log_likelihood'] == pytest.approx(-stats.gamma.nnlf(gamma['params'], df['g']))
+
+    binned = analyzer.fit_distributions(['g'], ('norm', 'gamma', 'expon'), method='binned', bins=64)
+    assert binned.loc[0, 'distribution'] == 'gamma' and binned.loc[0, 'fit_method'] == 'binned'
+    np.testing.assert_allclose(binned.loc[0, 'params'], gamma['params'], rtol=0.1)
+    sampled = analyzer.fit_distributions(['g'], ('gamma', 'norm'), rank_by='ks', max_samples=1000)
+    assert sampled.loc[0, 'distribution'] == 'gamma' and sampled.loc[0, 'sample_size'] == 1000
+
+    memoized = len(sf._fits)
+    pd.testing.assert_frame_equal(analyzer.fit_distributions(distributions=('norm', 'gamma', 'expon', 'logistic')),
+                                  fits)
+    assert len(sf._fits) == memoized
+    assert analyzer.best_fit('g', ('norm', 'gamma', 'expon', 'logistic'))['frozen'].dist.name == 'gamma'
+    assert len(sf._fits) == memoized
+
+    sf.remove_outliers(['n'], rule='zscore', threshold=2.0)
+    analyzer.fit_distributions(['g'], ('norm',))
+    assert len(sf._fits) == memoized + 1
+
+    with pytest.raises(ValueError):
+        analyzer.fit_distributions(['g'], ('binom',))
+
+
+@pytest.mark.parametrize('solver', ['qr', 'cholesky'])
+@pytest.mark.parametrize('intercept', [True, False])
+def test_ols_matches_statsmodels(solver, intercept, monkeypatch):
+    """
+    
+    Batched fits agree with statsmodels' OLS on the rows without missing
+    values, whether the gaps were cached beforehand or found during the fit,
+    and the design is accumulated over several row chunks and response blocks.
+    
+    """
+    rng = np.random.default_rng(8)
+    size = 600
+    X = rng.normal(size=(size, 2)) * [1.0, 10.0] + [5.0, 300.0]
+    Y = X @ rng.normal(size=(2, 6)) + rng.normal(size=(size, 6)) + 1e3
+    df = pd.DataFrame(np.c_[X, Y], columns=['a', 'b'] + [f'y{i}' for i in range(6)])
+    df.loc[::29, 'y4'] = np.nan
+    df.loc[::41, 'b'] = np.nan
+    monkeypatch.setattr('mindhunter.regression.CHUNK_ROWS', 128)
+    sf = StatFrame(df)
+
+    fit = sf.ols(['a', 'b'], intercept=intercept, solver=solver, block_bytes=2 * 8 * size)
+    assert fit.solver == solver and fit.n_obs == len(df.dropna())
+    assert sf.ols(['a', 'b'], intercept=intercept, solver=solver) is fit
+    summary = fit.summary()
+    assert len(summary) == 6 * len(fit.terms)
+
+    complete = df.dropna()
+    design = sm.add_constant(complete[['a', 'b']]) if intercept else complete[['a', 'b']]
+    for response in ['y0', 'y4']:
+        expected = sm.OLS(complete[response], design).fit()
+        rows = summary[summary['response'] == response]
+        np.testing.assert_allclose(rows['coef'], expected.params, rtol=1e-8)
+        np.testing.assert_allclose(rows['std_error'], expected.bse, rtol=1e-8)
+        np.testing.assert_allclose(rows['p_value'], expected.pvalues, rtol=1e-6, atol=1e-300)
+        assert rows['r_squared'].iloc[0] == pytest.approx(expected.rsquared, rel=1e-10)
+        assert rows['adj_r_squared'].iloc[0] == pytest.approx(expected.rsquared_adj, rel=1e-10)
+
+    cached = StatFrame(df)
+    cached.get_stats()
+    np.testing.assert_allclose(cached.ols(['a', 'b'], intercept=intercept, solver=solver).coef, fit.coef, rtol=1e-9)
+
+    with pytest.raises(ValueError):
+        sf.ols(['a', 'a'], ['y0'])
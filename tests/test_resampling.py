@@ -0,0 +1,73 @@
+from mindhunter import StatFrame, ResamplingAnalyzer
+
+import pytest
+import pandas as pd
+import numpy as np
+
+
+@pytest.fixture
+def two_sample_df():
+    """
+    
+    Two shifted normal columns with a few gaps, and a two-level group column.
+    
+    """
+    rng = np.random.default_rng(5)
+    size = 600
+    df = pd.DataFrame({
+        'x': rng.normal(5.0, 2.0, size),
+        'y': rng.normal(5.6, 2.0, size),
+        'group': rng.choice(['a', 'b'], size),
+    })
+    df.loc[rng.random(size) < 0.05, 'x'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('backend', ['threads', 'processes'])
+def test_resampling_reproducible_across_backends(two_sample_df, backend):
+    """
+    
+    A fixed seed and budget give identical resamples on every backend.
+    
+    """
+    budget = 64 * 1024
+    serial = ResamplingAnalyzer(StatFrame(two_sample_df), memory_budget=budget, seed=3)
+    other = ResamplingAnalyzer(StatFrame(two_sample_df, backend=backend, n_workers=2),
+                               memory_budget=budget, seed=3)
+
+    np.testing.assert_array_equal(serial.bootstrap_distribution('x', 'mad', 300),
+                                  other.bootstrap_distribution('x', 'mad', 300))
+    assert (serial.permutation_test('x', 'y', n_resamples=300)
+            == other.permutation_test('x', 'y', n_resamples=300))
+
+
+def test_bootstrap_ci_and_permutation_test(two_sample_df):
+    """
+    
+    The bootstrap CI of the mean matches the normal theory interval, and the
+    permutation test separates the shifted columns but not the random groups.
+    
+    """
+    sf = StatFrame(two_sample_df)
+    analyzer = ResamplingAnalyzer(sf, memory_budget=256 * 1024, seed=0)
+
+    ci = analyzer.bootstrap_ci('x', 'mean', n_resamples=4000)
+    mean, sem = sf._cached_stats['x']['mean'], sf._cached_stats['x']['sem']
+    assert ci['estimate'] == mean
+    assert ci['ci_lower'] == pytest.approx(mean - 1.96 * sem, abs=0.15 * sem)
+    assert ci['ci_upper'] == pytest.approx(mean + 1.96 * sem, abs=0.15 * sem)
+
+    median_ci = analyzer.bootstrap_ci('x', 'median', n_resamples=500, method='basic')
+    assert median_ci['ci_lower'] < sf._cached_stats['x']['median'] < median_ci['ci_upper']
+
+    shifted = analyzer.permutation_test('x', 'y', n_resamples=2000)
+    assert shifted['observed_difference'] == pytest.approx(
+        sf._cached_stats['x']['mean'] - sf._cached_stats['y']['mean'])
+    assert shifted['reject_null']
+
+    random_groups = analyzer.permutation_test('y', by='group', metric='median', n_resamples=500)
+    assert random_groups['p_value'] > 0.05
+    assert sum(random_groups['sample_sizes']) == len(two_sample_df)
+
+    with pytest.raises(ValueError):
+        analyzer.bootstrap_ci('x', 'unknown')
@@ -0,0 +1,343 @@
+from mindhunter import HypothesisAnalyzer, StatFrame
+from mindhunter.engine import compute_essential_stats
+from mindhunter.instrumentation import JsonLinesSink, capture
+from mindhunter.persistence import StatsStore
+
+import pytest
+import pandas as pd
+import numpy as np
+
+
+def reference_stats(series: pd.Series) -> dict:
+    """ Per-column pandas computation the engine has to agree with. """
+    data = series.dropna()
+    return {
+        'mean': data.mean(),
+        'median': data.median(),
+        'mode': data.mode().iloc[0] if not data.mode().empty else np.nan,
+        'std': data.std(),
+        'variance': data.var(),
+        'range': data.max() - data.min(),
+        'iqr': data.quantile(0.75) - data.quantile(0.25),
+        'mad': (data - data.median()).abs().median(),
+        'skewness': data.skew(),
+        'kurtosis': data.kurtosis(),
+        'count': len(data),
+        'missing_count': series.isna().sum(),
+        'missing_pct': series.isna().mean(),
+        'min': data.min(),
+        'max': data.max(),
+        'q1': data.quantile(0.25),
+        'q3': data.quantile(0.75),
+        'cv': data.std() / data.mean() if data.mean() != 0 else np.inf,
+        'sem': data.std() / np.sqrt(len(data)),
+    }
+
+
+@pytest.fixture
+def mixed_df():
+    """
+    
+    Numeric columns covering NaNs, ties, constants and tiny samples, plus a text column.
+    
+    """
+    rng = np.random.default_rng(7)
+    size = 2000
+    floats = rng.normal(10, 3, size)
+    floats[rng.random(size) < 0.1] = np.nan
+
+    return pd.DataFrame({
+        'floats': floats,
+        'ints': rng.integers(0, 20, size),
+        'zeros': np.where(rng.random(size) < 0.3, 0.0, rng.exponential(2, size)),
+        'constant': np.full(size, 4.5),
+        'sparse': np.r_[[1.0, 2.0], np.full(size - 2, np.nan)],
+        'empty': np.full(size, np.nan),
+        'label': rng.choice(['a', 'b', 'c'], size),
+    })
+
+
+def test_engine_matches_pandas(mixed_df):
+    """
+    
+    Every cached metric matches the per-column pandas result within float tolerance.
+    
+    """
+    expected = pd.DataFrame({col: reference_stats(mixed_df[col])
+                             for col in mixed_df.columns if col != 'label'}).astype(float)
+    actual = StatFrame(mixed_df).get_stats().astype(float).loc[expected.index, expected.columns]
+
+    pd.testing.assert_frame_equal(actual, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_engine_column_blocks(mixed_df):
+    """
+    
+    Splitting the frame into single-column blocks gives the same result as one block.
+    
+    """
+    whole = pd.DataFrame(compute_essential_stats(mixed_df))
+    blocked = pd.DataFrame(compute_essential_stats(mixed_df, block_bytes=1))
+
+    pd.testing.assert_frame_equal(blocked, whole)
+
+
+def test_lazy_cache_matches_batched(mixed_df):
+    """
+    
+    Reading metrics one by one gives the same values as the batched `get_stats()`,
+    and only computes the groups that were actually read.
+    
+    """
+    lazy = StatFrame(mixed_df)
+    assert lazy._cached_stats.computed('floats') == {}
+
+    lazy._cached_stats['floats']['iqr']
+    assert {'q1', 'q3', 'median'} <= set(lazy._cached_stats.computed('floats'))
+    assert 'mean' not in lazy._cached_stats.computed('floats')
+
+    lazy._cached_stats['floats']['sem']
+    assert {'std', 'count'} <= set(lazy._cached_stats.computed('floats'))
+
+    expected = StatFrame(mixed_df, precalc_data=True).get_stats()
+    for col in expected.columns:
+        for metric in expected.index:
+            assert np.isclose(lazy._cached_stats[col][metric], expected.loc[metric, col],
+                              rtol=1e-12, equal_nan=True)
+
+
+def test_cache_invalidation(mixed_df):
+    """
+    
+    Mutations only drop the cache when rows actually change, and `update()` can target columns.
+    
+    """
+    sf = StatFrame(mixed_df[['floats', 'ints', 'zeros']], precalc_data=True)
+    sf.remove_near_zeros(columns=['ints'], tolerance=-1)
+    assert sf._cached_stats.computed('floats')
+
+    sf.remove_exact_zeros()
+    assert sf._cached_stats.computed('floats') == {}
+    assert sf._cached_stats['zeros']['min'] > 0
+
+    sf.df['ints'] = sf.df['ints'] * 2
+    sf.update('ints')
+    assert sf._cached_stats['ints']['max'] == sf.df['ints'].max()
+
+
+def test_from_chunks(mixed_df, tmp_path):
+    """
+    
+    Streaming stats are exact for moments and counts, and within the sketch error for quantiles.
+    
+    """
+    numeric = mixed_df.drop(columns='label')
+    expected = StatFrame(numeric).get_stats()
+    chunks = (numeric.iloc[i:i + 300] for i in range(0, len(numeric), 300))
+    streamed = StatFrame.from_chunks(chunks, sketch_error=0.05).get_stats()
+
+    exact = ['mean', 'std', 'variance', 'skewness', 'kurtosis', 'count',
+             'missing_count', 'missing_pct', 'min', 'max', 'range', 'cv', 'sem']
+    pd.testing.assert_frame_equal(streamed.loc[exact].astype(float), expected.loc[exact].astype(float),
+                                  rtol=1e-9, atol=1e-12)
+
+    values = np.sort(numeric['floats'].dropna().to_numpy())
+    for metric, q in (('q1', 0.25), ('median', 0.5), ('q3', 0.75)):
+        rank = np.searchsorted(values, streamed.loc[metric, 'floats']) / len(values)
+        assert abs(rank - q) <= 0.05
+    assert streamed.loc['mode', 'ints'] == expected.loc['mode', 'ints']
+    # more distinct floats than the mode capacity: every value ties, so the smallest one wins
+    assert streamed.loc['mode', 'floats'] == expected.loc['mode', 'floats'] == values[0]
+
+    path = tmp_path / 'data.csv'
+    numeric.to_csv(path, index=False)
+    from_csv = StatFrame.stream_csv(path, chunksize=500).get_stats()
+    assert from_csv.loc['count', 'floats'] == expected.loc['count', 'floats']
+
+
+@pytest.mark.parametrize('backend, n_workers', [('threads', 1), ('threads', 3), ('processes', 2)])
+@pytest.mark.parametrize('partition_rows', [None, 512])
+def test_backends_reproducible(mixed_df, backend, n_workers, partition_rows):
+    """
+    
+    Every backend and worker count gives bit-for-bit the same result as the serial run.
+    
+    """
+    from mindhunter import AnalyticalTools
+
+    serial = StatFrame(mixed_df, partition_rows=partition_rows)
+    sharded = StatFrame(mixed_df, backend=backend, n_workers=n_workers, partition_rows=partition_rows)
+
+    pd.testing.assert_frame_equal(sharded.get_stats(), serial.get_stats(), check_exact=True)
+    pd.testing.assert_frame_equal(AnalyticalTools(sharded).z_score_all(),
+                                  AnalyticalTools(serial).z_score_all(), check_exact=True)
+    pd.testing.assert_frame_equal(sharded.analyze_zero_removal(), serial.analyze_zero_removal())
+    sharded._backend.close()
+
+
+def test_append_and_sliding_window(mixed_df):
+    """
+    
+    Appended batches keep moment-based stats exact, and a row window retracts expired rows.
+    
+    """
+    numeric = mixed_df[['floats', 'ints', 'zeros']]
+    exact = ['mean', 'std', 'skewness', 'count', 'missing_count', 'min', 'max']
+
+    sf = StatFrame(numeric.iloc[:500])
+    for start in range(500, len(numeric), 250):
+        sf.append(numeric.iloc[start:start + 250])
+    expected = StatFrame(numeric).get_stats()
+    pd.testing.assert_frame_equal(sf.get_stats().loc[exact].astype(float),
+                                  expected.loc[exact].astype(float), rtol=1e-9)
+    assert len(sf.df) == len(numeric)
+
+    window = StatFrame(numeric.iloc[:500])
+    window.sliding_window(max_rows=600)
+    for start in range(500, len(numeric), 250):
+        result = window.append(numeric.iloc[start:start + 250])
+    expected = StatFrame(numeric.iloc[-600:]).get_stats()
+    assert result['new_length'] == 600
+    pd.testing.assert_frame_equal(window.get_stats().loc[exact].astype(float),
+                                  expected.loc[exact].astype(float), rtol=1e-9)
+
+    window.update()
+    pd.testing.assert_frame_equal(window.get_stats(), expected)
+
+    with pytest.raises(ValueError, match='same columns'):
+        sf.append(mixed_df[['floats', 'ints', 'zeros', 'constant']].iloc[:10])
+    with pytest.raises(ValueError, match='same columns'):
+        sf.append(numeric[['floats', 'ints']].iloc[:10])
+    assert len(sf.df) == len(numeric)
+
+
+def test_sliding_window_append_cost(monkeypatch):
+    """ Steady-state appends summarize a bounded number of rows, however large the window. """
+    from mindhunter import streaming
+
+    monkeypatch.setattr(streaming, 'SEGMENT_ROWS', 256)
+    summarized = []
+    summarize = streaming.RollingStats._summarize
+    monkeypatch.setattr(streaming.RollingStats, '_summarize',
+                        lambda self, rows: summarized.append(len(rows)) or summarize(self, rows))
+
+    rng = np.random.default_rng(5)
+    per_append = {}
+    for max_rows in (2_000, 20_000):
+        df = pd.DataFrame({'x': rng.normal(size=max_rows), 'y': rng.normal(size=max_rows)})
+        sf = StatFrame(df)
+        sf.sliding_window(max_rows=max_rows)
+        for _ in range(3):
+            sf.append(df.iloc[:100])
+            sf.get_stats()
+        summarized.clear()
+        sf.append(df.iloc[:100])
+        stats = sf.get_stats()
+        per_append[max_rows] = sum(summarized)
+
+        window = pd.concat([df] + [df.iloc[:100]] * 4, ignore_index=True).iloc[-max_rows:]
+        np.testing.assert_allclose(stats.loc['mean'].astype(float), window.mean(), rtol=1e-9)
+    assert per_append[2_000] == per_append[20_000] <= 100 + 256
+
+
+def test_groupby_matches_per_group_frames(mixed_df):
+    """
+    
+    Grouped stats agree with one StatFrame per group, also after row removals.
+    
+    """
+    sf = StatFrame(mixed_df)
+    sf.remove_exact_zeros()
+    grouped = sf.groupby('label')
+    result = grouped.get_stats()
+
+    assert sf.groupby('label') is grouped
+    assert list(result.index) == ['a', 'b', 'c']
+    assert result.columns.names == ['column', 'metric']
+
+    for label, rows in sf.df.groupby('label'):
+        expected = StatFrame(rows).get_stats()
+        for col in expected.columns:
+            np.testing.assert_allclose(result.loc[label, col][expected.index].to_numpy(dtype=float),
+                                       expected[col].to_numpy(dtype=float), rtol=1e-9, atol=1e-12)
+
+    sf.remove_near_zeros(tolerance=0.5)
+    assert sf.groupby('label') is not grouped
+    assert sf.groupby('label').size().sum() == len(sf.df)
+
+
+def test_stats_cache_on_disk(mixed_df, tmp_path):
+    """
+    
+    Stats persisted by one StatFrame are loaded by the next one on the same data only.
+    
+    """
+    first = StatFrame(mixed_df, stats_cache=tmp_path)
+    expected = first.get_stats()
+    assert len(list(tmp_path.glob('*.json'))) == 1
+
+    second = StatFrame(mixed_df, stats_cache=tmp_path)
+    assert second._cached_stats.computed('floats') == first._cached_stats.computed('floats')
+    pd.testing.assert_frame_equal(second.get_stats(), expected)
+    assert second._cached_stats.misses == 0
+
+    changed = mixed_df.copy()
+    changed.loc[0, 'floats'] = 123.0
+    third = StatFrame(changed, stats_cache=tmp_path)
+    assert third._cached_stats.computed('floats') == {}
+    third.get_stats()
+    assert len(list(tmp_path.glob('*.json'))) == 2
+
+    describe = mixed_df.describe()
+    pd.testing.assert_frame_equal(second.df_stats[describe.columns], describe, rtol=1e-9)
+
+    StatsStore(tmp_path, max_bytes=1).evict()
+    assert list(tmp_path.glob('*.json')) == []
+
+
+def test_profile_spans(mixed_df, tmp_path):
+    """
+    
+    profile() reports timing, rows, cache lookups and peak memory per method; no sink means no spans.
+    
+    """
+    sf = StatFrame(mixed_df[['floats', 'ints', 'zeros', 'label']])
+    with sf.profile() as profile:
+        sf.clean_df()
+        sf.get_stats()
+        sf.get_stats()
+        HypothesisAnalyzer(sf).hypothesis_test('floats', 'one_sample_t', 0.0)
+        with pytest.raises(ValueError):
+            sf.clean_df(subset=['missing'])
+        StatFrame(mixed_df).get_stats()
+
+    summary = profile.summary()
+    assert {'StatFrame.clean_df', 'StatFrame.get_stats', 'HypothesisAnalyzer.hypothesis_test'} <= set(summary.index)
+    assert summary.loc['StatFrame.clean_df', 'calls'] == 2
+    assert summary.loc['StatFrame.clean_df', 'errors'] == 1
+    assert summary.loc['StatFrame.get_stats', 'calls'] == 2
+    assert summary.loc['StatFrame.get_stats', 'rows'] == mixed_df['floats'].notna().sum()
+    assert summary.loc['StatFrame.get_stats', 'cache_misses'] > 0
+    assert summary.loc['StatFrame.get_stats', 'cache_hits'] > 0
+    assert (summary['peak_bytes'] >= 0).all()
+
+    spans = profile.to_frame()
+    assert (spans['frame_id'] == id(sf)).all()
+    assert (spans.loc[spans['name'] == 'StatFrame.save_stats', 'depth'] > 0).all()
+
+    sf.get_stats()
+    assert len(profile.spans) == len(spans)
+
+    path = tmp_path / 'spans.jsonl'
+    with capture(JsonLinesSink(path)):
+        sf.describe_columns()
+    records = pd.read_json(path, lines=True)
+    assert records['name'].iloc[-1] == 'StatFrame.describe_columns'
+    assert records['rows'].iloc[-1] == len(sf.df)
+
+    with capture() as sink:
+        streamed = StatFrame.from_chunks(mixed_df.iloc[i:i + 500] for i in range(0, len(mixed_df), 500))
+    spans = sink.to_frame().set_index('name')
+    assert spans.loc['StatFrame.from_chunks', 'depth'] == 0
+    assert spans.loc['StatFrame.from_chunks', 'frame_id'] == id(streamed)
+    assert spans.loc['StatFrame.__init__', 'depth'] == 1
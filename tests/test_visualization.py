@@ -0,0 +1,85 @@
+from mindhunter import StatFrame, StatPlotter, StatVisualizer
+from mindhunter.visualization.summaries import binned_kde, box_stats, qq_points, stratified_sample
+from matplotlib import cbook
+from matplotlib.figure import Figure
+import matplotlib.pyplot as plt
+from scipy import stats
+
+import pandas as pd
+import numpy as np
+
+
+def test_plot_summaries_match_full_data():
+    """
+    
+    Boxplot, KDE and Q-Q summaries agree with matplotlib and scipy on the full data.
+    
+    """
+    rng = np.random.default_rng(4)
+    values = rng.standard_t(3, 20_000)
+    sf = StatFrame(pd.DataFrame({'v': values}))
+
+    summary = box_stats(values, sf._cached_stats['v'], max_fliers=len(values))
+    reference = cbook.boxplot_stats(values)[0]
+    for key in ('med', 'q1', 'q3', 'whislo', 'whishi'):
+        assert summary[key] == reference[key]
+    np.testing.assert_array_equal(summary['fliers'], np.sort(reference['fliers']))
+    assert len(box_stats(values, sf._cached_stats['v'], max_fliers=10)['fliers']) == 10
+
+    grid, density = binned_kde(values)
+    exact = stats.gaussian_kde(values)(grid)
+    assert np.max(np.abs(density - exact)) < 0.01 * exact.max()
+
+    theoretical, sample = qq_points(values, n_points=101)
+    assert theoretical[50] == 0 and sample[50] == np.median(values)
+
+
+def test_stratified_sample_keeps_sparse_cells():
+    """
+    
+    The scatter sample stays near the budget and keeps isolated outliers.
+    
+    """
+    rng = np.random.default_rng(8)
+    x, y = rng.normal(size=200_000), rng.normal(size=200_000)
+    x[:3] = [40.0, -40.0, 35.0]
+    x[10] = np.nan
+
+    rows = stratified_sample(x, y, budget=5000)
+    assert 5000 <= len(rows) < 5000 + 50 * 50
+    assert {0, 1, 2} <= set(rows.tolist())
+    assert 10 not in rows
+
+
+def test_headless_figures_and_export(tmp_path):
+    """
+    
+    Headless plots come back as untracked Figures, and batch export writes
+    one file per figure, serially or across worker processes.
+    
+    """
+    rng = np.random.default_rng(2)
+    sf = StatFrame(pd.DataFrame({'a b': rng.normal(size=3000), 'c': rng.exponential(size=3000),
+                                 'd': rng.normal(size=3000)}))
+    before = plt.get_fignums()
+
+    figures = StatVisualizer(sf, render_budget=500, headless=True).create_boxplot(['a b', 'c'])
+    assert len(figures) == 2 and all(isinstance(fig, Figure) for fig in figures)
+    assert isinstance(StatPlotter(sf, headless=True).plot_normal_distr('c'), Figure)
+    fitted = StatPlotter(sf, headless=True).plot_column_distribution('c', 'best')
+    assert fitted.axes[0].get_legend().get_texts()[0].get_text().startswith('expon')
+    regression = StatPlotter(sf, render_budget=500, headless=True).plot_regression_model('a b', 'd')
+    assert regression.axes[0].get_title().startswith('d ~ a b')
+    assert list(sf._ols_fits) == [(('a b',), ('d',), True, 'auto')]
+    assert plt.get_fignums() == before
+
+    visualizer = StatVisualizer(sf, render_budget=500)
+    paths = visualizer.export_scatterplots(['a b', 'c', 'd'], tmp_path, n_workers=2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['scatter_a_b_vs_c.png', 'scatter_a_b_vs_d.png',
+                                                          'scatter_c_vs_d.png']
+    assert len(paths) == 3
+
+    svg = StatPlotter(sf, render_budget=500).export('plot_normality_check', ['d'], tmp_path / 'svg',
+                                                    fmt='svg', n_workers=1)
+    assert open(svg[0]).read().lstrip().startswith('<?xml')
+    assert plt.get_fignums() == before